@@ -0,0 +1,56 @@
+"""
+==================================
+Benchmark for bulk child insertion
+==================================
+
+Compares adding positioned children one by one with
+:meth:`electripy.elements.Element.add_child` against a single vectorized
+:meth:`electripy.elements.Element.add_children` call, for grid (relative)
+and scatter (absolute) layouts.
+"""
+import time
+
+import numpy as np
+
+from electripy.elements import Paragraph
+
+N_CHILDREN = (1000, 10000, 50000)
+
+
+def grid_positions(n_children):
+    side = int(np.ceil(np.sqrt(n_children)))
+    cells = np.stack(np.meshgrid(np.linspace(0, 1, side),
+                                 np.linspace(0, 1, side)), -1)
+    return cells.reshape(-1, 2)[:n_children]
+
+
+def scatter_positions(n_children):
+    return np.random.default_rng(0).integers(0, 1000, (n_children, 2))
+
+
+def add_each(parent, children, positions):
+    for child, position in zip(children, positions.tolist()):
+        parent.add_child(child, tuple(position))
+
+
+def add_bulk(parent, children, positions):
+    parent.add_children(children, positions)
+
+
+def timeit(func, positions):
+    children = [Paragraph('') for _ in range(len(positions))]
+    parent = Paragraph('parent')
+    start = time.perf_counter()
+    func(parent, children, positions)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{'layout':>8} {'children':>10} {'add_child (s)':>14} "
+          f"{'add_children (s)':>17}")
+    for layout in (grid_positions, scatter_positions):
+        for n_children in N_CHILDREN:
+            positions = layout(n_children)
+            print(f"{layout.__name__[:-10]:>8} {n_children:>10} "
+                  f"{timeit(add_each, positions):>14.4f} "
+                  f"{timeit(add_bulk, positions):>17.4f}")
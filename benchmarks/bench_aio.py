@@ -0,0 +1,56 @@
+"""
+================================
+Benchmark for coroutine handlers
+================================
+
+Dispatches press events whose handlers wait 50 ms on simulated network
+or database I/O, and reports the time until every handler completed
+with blocking handlers on the thread pool of the event bus and with
+coroutine handlers on the asyncio loop of the UI.
+"""
+import asyncio
+import time
+
+from electripy.aio import AsyncBridge, set_async_bridge
+from electripy.elements import Paragraph
+from electripy.events import EventBus
+
+IO_DELAY = 0.05
+MAX_WORKERS = 8
+
+
+def blocking_handler(event):
+    time.sleep(IO_DELAY)
+
+
+async def coroutine_handler(event):
+    await asyncio.sleep(IO_DELAY)
+
+
+def run(handler, n_events):
+    bus = EventBus(max_workers=MAX_WORKERS)
+    labels = [Paragraph(f'Label {idx}') for idx in range(n_events)]
+    for label in labels:
+        bus.on(label, 'load', handler)
+
+    start = time.perf_counter()
+    futures = bus.dispatch_batch([[label.id, 'load'] for label in labels])
+    for future in futures:
+        future.result()
+    duration = time.perf_counter() - start
+    bus.shutdown()
+    return duration
+
+
+if __name__ == '__main__':
+    with AsyncBridge() as bridge:
+        set_async_bridge(bridge)
+        print(f"{'events':>7} {'thread pool (s)':>16} "
+              f"{'coroutines (s)':>15}")
+        for n_events in (100, 1000, 10000):
+            if n_events <= 1000:
+                pool = f'{run(blocking_handler, n_events):>16.2f}'
+            else:
+                pool = f"{'-':>16}"
+            coroutines = run(coroutine_handler, n_events)
+            print(f'{n_events:>7} {pool} {coroutines:>15.2f}')
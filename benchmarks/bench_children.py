@@ -0,0 +1,41 @@
+"""
+=================================
+Benchmark for children containers
+=================================
+
+Compares a plain ``list`` against :class:`electripy.children.ChildList`
+on a log view workload: rows are appended at the end and removed from
+the front or from the middle, while the list stays at a given size.
+"""
+import random
+import time
+
+from electripy.children import ChildList
+
+N_ROWS = (1000, 10000, 100000)
+N_OPS = 20000
+
+
+def churn(children, n_rows):
+    rng = random.Random(0)
+    children.extend(range(n_rows))
+    for idx in range(N_OPS):
+        if idx % 2:
+            row = children[0]
+        else:
+            row = children[rng.randrange(len(children))]
+        children.remove(row)
+        children.append(n_rows + idx)
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{'rows':>10} {'list (s)':>12} {'ChildList (s)':>14}")
+    for n_rows in N_ROWS:
+        print(f"{n_rows:>10} {timeit(churn, [], n_rows):>12.4f} "
+              f"{timeit(churn, ChildList(), n_rows):>14.4f}")
@@ -0,0 +1,77 @@
+"""
+==============================================
+Benchmark for appending to a console paragraph
+==============================================
+
+Appends lines to a mounted paragraph flushed after every append, either by
+setting the whole text of a :class: `Paragraph` or by appending to a
+:class: `ConsoleParagraph` keeping its last 1000 lines. Reports the mean
+time of an append, flush included, and the mean number of bytes sent per
+append once 1k, 10k and 100k lines were written.
+"""
+import json
+import time
+
+from electripy import diff
+from electripy.elements import ConsoleParagraph, Paragraph
+
+MAX_LINES = 1000
+CHECKPOINTS = (1000, 10000, 100000)
+WINDOW = 200
+
+
+class Sink:
+    """Encode the patches like the websocket would, counting the bytes."""
+
+    def __init__(self):
+        self.size = 0
+
+    def __call__(self, ops):
+        self.size += len(json.dumps(ops))
+
+
+def _line(idx):
+    return f'[{idx:08d}] worker 3 processed request /api/items/{idx}'
+
+
+def _append(element, mode, idx):
+    if mode == 'paragraph':
+        element.text = element.text + '\n' + _line(idx)
+    else:
+        element.append(_line(idx))
+
+
+def run(mode):
+    sink = Sink()
+    tracker = diff.ChangeTracker(send=sink, auto_flush=True)
+    diff.set_change_tracker(tracker)
+    if mode == 'paragraph':
+        element = Paragraph('')
+    else:
+        element = ConsoleParagraph(max_lines=MAX_LINES)
+    diff.mount(element)
+    tracker.flush()
+
+    results = []
+    for checkpoint in CHECKPOINTS:
+        element.text = '\n'.join(
+            _line(idx) for idx in range(checkpoint - WINDOW))
+
+        sink.size = 0
+        start = time.perf_counter()
+        for idx in range(checkpoint - WINDOW, checkpoint):
+            _append(element, mode, idx)
+        elapsed = time.perf_counter() - start
+        results.append((elapsed / WINDOW, sink.size / WINDOW))
+    return results
+
+
+if __name__ == '__main__':
+    header = ' '.join(
+        f'{f"{n // 1000}k (us)":>10} {f"{n // 1000}k (B)":>10}'
+        for n in CHECKPOINTS)
+    print(f"{'mode':>10} {header}")
+    for mode in ('paragraph', 'console'):
+        cells = ' '.join(f'{duration * 1e6:>10.1f} {size:>10.0f}'
+                         for duration, size in run(mode))
+        print(f'{mode:>10} {cells}')
@@ -0,0 +1,96 @@
+"""
+============================
+Benchmark for event dispatch
+============================
+
+A fake frontend client sends press events of random buttons as JSON
+messages, batching up to ``batch`` events per message, to a receiver
+loop standing in for the websocket loop of eel. Reports the throughput
+with the client sending as fast as it can, the mean latency from an
+event being sent to its handler running with the client sending 2000
+events per second, and how long every message blocks the loop, with
+handlers run inline or on the thread pool, and with fast or slow (1 ms)
+handlers.
+"""
+import json
+import queue
+import random
+import threading
+import time
+
+from electripy.elements import Button
+from electripy.events import PRESS, EventBus
+
+N_BUTTONS = 1000
+N_EVENTS = 20000
+N_PACED_EVENTS = 2000
+PACED_RATE = 2000
+SLOW_HANDLER = 0.001
+
+
+def fake_client(messages, buttons, batch, n_events, rate):
+    start = time.perf_counter()
+    for sent in range(0, n_events, batch):
+        if rate:
+            time.sleep(max(start + sent / rate - time.perf_counter(), 0))
+        events = [[random.choice(buttons).id, PRESS, time.perf_counter()]
+                  for _ in range(min(batch, n_events - sent))]
+        messages.put(json.dumps(events))
+    messages.put(None)
+
+
+def run(max_workers, batch, delay, n_events=N_EVENTS, rate=None):
+    latencies = []
+    done = threading.Semaphore(0)
+
+    def handler(event):
+        if delay:
+            time.sleep(delay)
+        latencies.append(time.perf_counter() - event.detail)
+        done.release()
+
+    bus = EventBus(max_workers=max_workers)
+    buttons = [Button(f'Button {idx}') for idx in range(N_BUTTONS)]
+    for button in buttons:
+        bus.on(button, PRESS, handler)
+
+    messages = queue.Queue()
+    client = threading.Thread(target=fake_client,
+                              args=(messages, buttons, batch, n_events,
+                                    rate))
+    start = time.perf_counter()
+    client.start()
+    blocked = 0.0
+    n_messages = 0
+    while True:
+        message = messages.get()
+        if message is None:
+            break
+        received = time.perf_counter()
+        bus.dispatch_batch(json.loads(message))
+        blocked += time.perf_counter() - received
+        n_messages += 1
+    for _ in range(n_events):
+        done.acquire()
+    duration = time.perf_counter() - start
+    client.join()
+    bus.shutdown()
+    return (n_events / duration, sum(latencies) / len(latencies),
+            blocked / n_messages)
+
+
+if __name__ == '__main__':
+    print(f"{'handler':>8} {'workers':>8} {'batch':>6} "
+          f"{'events/s':>10} {'latency (ms)':>13} "
+          f"{'loop blocked (ms)':>18}")
+    for delay, name in ((0, 'fast'), (SLOW_HANDLER, 'slow')):
+        for max_workers in (0, 8):
+            for batch in (1, 16, 256):
+                if delay and not max_workers and batch > 1:
+                    continue
+                throughput, _, blocked = run(max_workers, batch, delay)
+                _, latency, _ = run(max_workers, batch, delay,
+                                    N_PACED_EVENTS, PACED_RATE)
+                print(f'{name:>8} {max_workers:>8} {batch:>6} '
+                      f'{throughput:>10.0f} {latency * 1e3:>13.3f} '
+                      f'{blocked * 1e3:>18.3f}')
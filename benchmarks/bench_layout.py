@@ -0,0 +1,85 @@
+"""
+===============================
+Benchmark for the layout engine
+===============================
+
+Lays out trees of panels nested ten per level, and compares a naive
+recursive pass re-deriving every box from the styles with the layout
+engine: its first vectorized pass, the update after restyling one panel
+of the second level, and a thousand hit tests.
+"""
+import random
+import time
+
+from electripy.elements import Paragraph
+from electripy.layout import parse_length
+
+FANOUT = 10
+N_HITS = 1000
+
+
+def build_tree(n_elements):
+    root = Paragraph('root')
+    root.add_style({'width': '1000px', 'height': '1000px'})
+    parents = [root]
+    count = 1
+    while count < n_elements:
+        next_parents = []
+        for parent in parents:
+            n_children = min(FANOUT, n_elements - count)
+            if n_children <= 0:
+                break
+            children = [Paragraph('panel') for _ in range(n_children)]
+            for child in children:
+                child.add_style({'width': '10%', 'height': '50%'})
+            parent.add_children(children, [(idx / FANOUT, 0.5)
+                                           for idx in range(n_children)])
+            next_parents.extend(children)
+            count += n_children
+        parents = next_parents
+    return root
+
+
+def naive_layout(element, origin=(0.0, 0.0), parent_size=(0.0, 0.0)):
+    boxes = {}
+    stack = [(element, origin, parent_size)]
+    while stack:
+        _element, (x, y), (width, height) = stack.pop()
+        values = []
+        for key, size in (('left', width), ('bottom', height),
+                          ('width', width), ('height', height)):
+            value, percent = parse_length(_element._style.get(key))
+            values.append(value * size if percent else value)
+        box = (x + values[0], y + values[1], values[2], values[3])
+        boxes[_element] = box
+        for child in _element.children:
+            stack.append((child, box[:2], box[2:]))
+    return boxes
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{'elements':>9} {'naive (s)':>10} {'engine (s)':>11} "
+          f"{'update (ms)':>12} {'hit tests (ms)':>15}")
+    for n_elements in (1000, 10000, 100000):
+        root = build_tree(n_elements)
+        _, naive = timed(naive_layout, root)
+        layout, engine = timed(lambda: root.layout)
+        _, first_pass = timed(layout.update)
+
+        panel = root.children[3].children[0]
+        panel.add_style({'width': '20%'})
+        _, update = timed(layout.update)
+
+        points = [(random.uniform(0, 1000), random.uniform(0, 1000))
+                  for _ in range(N_HITS)]
+        _, hits = timed(lambda: [layout.hit_test(*point)
+                                 for point in points])
+        print(f'{n_elements:>9} {naive:>10.3f} '
+              f'{engine + first_pass:>11.3f} {update * 1e3:>12.2f} '
+              f'{hits * 1e3:>15.1f}')
@@ -0,0 +1,113 @@
+"""
+======================================
+Benchmark for element memory footprint
+======================================
+
+Reports the bytes allocated per element, as traced by :mod:`tracemalloc`,
+for trees of paragraphs, images and buttons, next to the footprint of a
+baseline revision measured in a subprocess on an export of its package.
+
+The baseline is the revision given as the first argument, by default the
+parent of the commit adding this benchmark, i.e. the layout it was
+written to improve on::
+
+    python benchmarks/bench_memory.py [REVISION]
+"""
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+from PIL import Image as PILImage
+
+from electripy.elements import Button, Image, Paragraph
+
+N_ELEMENTS = 100000
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_paragraphs(n_elements, _):
+    root = Paragraph('root')
+    root.add_children([Paragraph(f'item {idx}') for idx in range(n_elements)],
+                      [(idx % 100, idx // 100) for idx in range(n_elements)])
+    return root
+
+
+def build_images(n_elements, img_path):
+    return [Image(img_path, size=(24, 24), lazy=True)
+            for _ in range(n_elements)]
+
+
+def build_buttons(n_elements, _):
+    return [Button(f'button {idx}') for idx in range(n_elements)]
+
+
+BUILDS = (('Paragraph', build_paragraphs, N_ELEMENTS),
+          ('Image', build_images, N_ELEMENTS // 10),
+          ('Button', build_buttons, N_ELEMENTS // 10))
+
+
+def bytes_per_element(build, n_elements, img_path):
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    elements = build(n_elements, img_path)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+    return (end - start) / n_elements
+
+
+def measure():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        img_path = os.path.join(tmp_dir, 'icon.png')
+        PILImage.new('RGBA', (24, 24)).save(img_path)
+        return {name: bytes_per_element(build, n_elements, img_path)
+                for name, build, n_elements in BUILDS}
+
+
+def git(*args):
+    return subprocess.run(['git', '-C', REPO_DIR, *args], check=True,
+                          capture_output=True).stdout
+
+
+def default_baseline():
+    added = git('log', '--format=%H', '--diff-filter=A', '--',
+                'benchmarks/bench_memory.py').split()
+    return f'{added[-1].decode()}~1' if added else 'HEAD'
+
+
+def measure_revision(revision):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = git('archive', '--format=tar', revision, 'electripy')
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tmp_dir)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--json'],
+            check=True, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': tmp_dir})
+    return json.loads(result.stdout)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--json']:
+        print(json.dumps(measure()))
+        sys.exit()
+
+    baseline = sys.argv[1] if len(sys.argv) > 1 else default_baseline()
+    before = measure_revision(baseline)
+    after = measure()
+
+    print(f'bytes/element, baseline {baseline}')
+    print(f"{'element':>10} {'count':>8} {'baseline':>10} {'current':>10} "
+          f"{'saved':>8}")
+    for name, _, n_elements in BUILDS:
+        saved = 1 - after[name] / before[name]
+        print(f'{name:>10} {n_elements:>8} {before[name]:>10.0f} '
+              f'{after[name]:>10.0f} {saved:>8.1%}')
@@ -0,0 +1,92 @@
+"""
+================================
+Benchmark for the mutation queue
+================================
+
+Worker threads update the text of mounted labels while the owner thread
+flushes the UI, every flush being encoded to JSON and written to a
+websocket taking 5 ms, either by taking a lock around every change, or by
+posting the changes to a :class: `MutationQueue` drained by the owner
+before every flush. Reports the time the producers spend submitting
+their updates, the time until every update was flushed, and the 99th
+percentile and maximum time a producer waited to submit one update.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from electripy import diff
+from electripy.elements import Paragraph
+from electripy.mutations import MutationQueue
+
+N_LABELS = 100
+N_UPDATES = 200000
+N_WORKERS = 8
+SEND_LATENCY = 0.005
+
+
+def send(ops):
+    json.dumps(ops)
+    time.sleep(SEND_LATENCY)
+
+
+def set_text(label, text):
+    label.text = text
+
+
+def run(mode):
+    tracker = diff.ChangeTracker(send=send)
+    diff.set_change_tracker(tracker)
+    root = Paragraph('root')
+    labels = [Paragraph('label', parent=root) for _ in range(N_LABELS)]
+    diff.mount(root)
+    tracker.flush()
+
+    lock = threading.Lock()
+    queue = MutationQueue(tracker)
+    done = threading.Event()
+
+    def produce(worker):
+        waits = []
+        for idx in range(worker, N_UPDATES, N_WORKERS):
+            label = labels[idx % N_LABELS]
+            start = time.perf_counter()
+            if mode == 'lock':
+                with lock:
+                    label.text = f'value {idx}'
+            else:
+                queue.post(set_text, label, f'value {idx}')
+            waits.append(time.perf_counter() - start)
+        return waits
+
+    def own():
+        while not done.is_set() or len(queue):
+            if mode == 'lock':
+                with lock:
+                    tracker.flush()
+            else:
+                queue.drain()
+                tracker.flush()
+            time.sleep(0.001)
+
+    owner = threading.Thread(target=own)
+    start = time.perf_counter()
+    owner.start()
+    with ThreadPoolExecutor(max_workers=N_WORKERS) as executor:
+        waits = sorted(wait for _waits in executor.map(
+            produce, range(N_WORKERS)) for wait in _waits)
+    produced = time.perf_counter() - start
+    done.set()
+    owner.join()
+    return (produced, time.perf_counter() - start,
+            waits[int(len(waits) * 0.99)], waits[-1])
+
+
+if __name__ == '__main__':
+    print(f"{'mode':>6} {'producers (s)':>14} {'applied (s)':>12} "
+          f"{'p99 wait (us)':>14} {'max wait (ms)':>14}")
+    for mode in ('lock', 'queue'):
+        produced, applied, p99, longest = run(mode)
+        print(f'{mode:>6} {produced:>14.3f} {applied:>12.3f} '
+              f'{p99 * 1e6:>14.1f} {longest * 1e3:>14.2f}')
@@ -0,0 +1,64 @@
+"""
+===============================
+Benchmark for icon prefetching
+===============================
+
+Serves generated icons from a local HTTP stand-in with injected latency
+and compares building images one by one on a cold cache against
+prefetching them on a thread pool first.
+"""
+import functools
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from electripy.cache import AssetCache, set_asset_cache
+from electripy.elements import Image
+from electripy.imaging import VariantCache, prefetch_images, set_variant_cache
+
+N_ICONS = 16
+LATENCY = 0.1
+
+
+class LatencyHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def build(urls, prefetch):
+    set_asset_cache(AssetCache(cache_dir=tempfile.mkdtemp()))
+    set_variant_cache(VariantCache())
+
+    start = time.perf_counter()
+    if prefetch:
+        prefetch_images(urls, size=(24, 24), max_workers=N_ICONS)
+    for url in urls:
+        Image(src=url, size=(24, 24))
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    icon_dir = Path(tempfile.mkdtemp())
+    for idx in range(N_ICONS):
+        PILImage.new('RGBA', (24, 24), (idx, 0, 0, 255)).save(
+            icon_dir / f'icon_{idx}.png')
+
+    httpd = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        functools.partial(LatencyHandler, directory=str(icon_dir)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    urls = [f'http://127.0.0.1:{httpd.server_port}/icon_{idx}.png'
+            for idx in range(N_ICONS)]
+
+    print(f'{N_ICONS} icons, {LATENCY * 1000:.0f} ms latency per request')
+    print(f'sequential: {build(urls, prefetch=False):.3f} s')
+    print(f'prefetched: {build(urls, prefetch=True):.3f} s')
+    httpd.shutdown()
@@ -0,0 +1,51 @@
+"""
+==============================
+Benchmark for selector lookups
+==============================
+
+Compares finding the siblings of an element by class name with a scan of
+the ``children`` lists against the selector index of the tree root.
+"""
+import time
+
+from electripy.elements import Paragraph
+from electripy.utils import iter_tree
+
+N_ELEMENTS = (1000, 10000, 50000)
+N_LOOKUPS = 200
+N_CHILDREN = 50
+
+
+def build_tree(n_elements):
+    root = Paragraph('root')
+    parents = [root]
+    for idx in range(n_elements - 1):
+        child = Paragraph('', class_name=f'group-{idx % 100}')
+        parents[idx // N_CHILDREN].add_child(child, (0, 0))
+        parents.append(child)
+    return root
+
+
+def scan(root, class_name):
+    return [element for element, _ in iter_tree(root)
+            if element.class_name == class_name]
+
+
+def lookup(root, class_name):
+    return root.find_all(class_name=class_name)
+
+
+def timeit(func, root):
+    start = time.perf_counter()
+    for idx in range(N_LOOKUPS):
+        func(root, f'group-{idx % 100}')
+    return (time.perf_counter() - start) / N_LOOKUPS
+
+
+if __name__ == '__main__':
+    print(f"{'elements':>10} {'scan (ms)':>12} {'index (ms)':>12}")
+    for n_elements in N_ELEMENTS:
+        root = build_tree(n_elements)
+        root.index
+        print(f"{n_elements:>10} {timeit(scan, root) * 1e3:>12.4f} "
+              f"{timeit(lookup, root) * 1e3:>12.4f}")
@@ -0,0 +1,65 @@
+"""
+========================================
+Benchmark for element tree serialization
+========================================
+
+Compares dumping every element with the pretty-printed
+``json.dumps(attributes, indent=4)`` of ``Element.__str__`` against the
+single pass tree serializers of :mod:`electripy.serialize`, on a tree of
+50000 elements.
+"""
+import json
+import time
+
+from electripy.elements import Paragraph
+from electripy.serialize import from_bytes, iter_json, to_bytes, to_dict
+from electripy.utils import iter_tree
+
+N_ELEMENTS = 50000
+N_CHILDREN = 50
+
+
+def build_tree(n_elements):
+    root = Paragraph('root', class_name='root')
+    parents = [root]
+    for idx in range(n_elements - 1):
+        child = Paragraph(f'item {idx}', class_name='item')
+        parents[idx // N_CHILDREN].add_child(child, (idx % 100, idx % 50))
+        parents.append(child)
+    return root
+
+
+def dump_legacy(root):
+    return ''.join(str(element) for element, _ in iter_tree(root))
+
+
+def dump_json_chunks(root):
+    return sum(len(chunk) for chunk in iter_json(root))
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    root = build_tree(N_ELEMENTS)
+    print(f"{'serializer':>12} {'time (s)':>10} {'elements/s':>12} "
+          f"{'size (MB)':>10}")
+
+    for name, func, size in (
+            ('legacy', dump_legacy, len),
+            ('to_dict', to_dict, lambda payload: 0),
+            ('iter_json', dump_json_chunks, lambda size: size),
+            ('to_bytes', to_bytes, len)):
+        elapsed, result = timeit(func, root)
+        print(f"{name:>12} {elapsed:>10.4f} "
+              f"{N_ELEMENTS / elapsed:>12.0f} "
+              f"{size(result) / 1e6:>10.2f}")
+
+    data = to_bytes(root)
+    elapsed, payload = timeit(from_bytes, data)
+    print(f"{'from_bytes':>12} {elapsed:>10.4f} "
+          f"{N_ELEMENTS / elapsed:>12.0f} {len(data) / 1e6:>10.2f}")
+    assert payload == json.loads(json.dumps(to_dict(root)))
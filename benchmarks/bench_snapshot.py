@@ -0,0 +1,67 @@
+"""
+===================================================
+Benchmark for restoring a dashboard from a snapshot
+===================================================
+
+Compares the cold start of a dashboard of cards, each with a title, a
+thumbnail decoded from one of 200 local JPEG photos and a console of
+recent lines, built in Python against restored with
+:func:`electripy.snapshot.load_snapshot`. The image caches are cleared
+before every build, the way they are in a new process. Reports the build,
+save and restore times and the size of the snapshot.
+"""
+import os
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image as PILImage
+
+from electripy import imaging
+from electripy.elements import ConsoleParagraph, Image, Paragraph
+from electripy.snapshot import load_snapshot, save_snapshot
+
+N_CARDS = (100, 1000, 5000)
+N_SOURCES = 200
+
+
+def build(directory, n_cards):
+    imaging.get_variant_cache().clear()
+    imaging._digests.clear()
+
+    root = Paragraph('Dashboard', class_name='dashboard')
+    for idx in range(n_cards):
+        card = Paragraph(f'Card {idx}', class_name='card', parent=root)
+        card.add_style({'width': '180px', 'height': '200px'})
+        Image(os.path.join(directory, f'photo_{idx % N_SOURCES}.jpg'),
+              size=(160, 120), parent=card)
+        console = ConsoleParagraph(max_lines=20, parent=card)
+        for line in range(5):
+            console.append(f'[{line}] card {idx} refreshed')
+    return root
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        rng = np.random.default_rng(0)
+        for idx in range(N_SOURCES):
+            pixels = rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)
+            PILImage.fromarray(pixels).save(
+                os.path.join(directory, f'photo_{idx}.jpg'))
+        path = os.path.join(directory, 'dashboard.snapshot')
+
+        print(f"{'cards':>6} {'build (ms)':>11} {'save (ms)':>10} "
+              f"{'restore (ms)':>13} {'size (MB)':>10}")
+        for n_cards in N_CARDS:
+            built, root = timeit(build, directory, n_cards)
+            saved, size = timeit(save_snapshot, root, path)
+            restored, copy = timeit(load_snapshot, path)
+            print(f'{n_cards:>6} {built * 1e3:>11.1f} {saved * 1e3:>10.1f} '
+                  f'{restored * 1e3:>13.1f} {size / 2 ** 20:>10.2f}')
+            del root, copy
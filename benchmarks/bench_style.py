@@ -0,0 +1,61 @@
+"""
+=================================
+Benchmark for element style store
+=================================
+
+Compares the legacy string based ``add_style`` (which re-parsed and
+re-joined the whole style string on every call) against the mapping
+backed style store of :class:`electripy.elements.Element`.
+"""
+import time
+
+from electripy.elements import Paragraph
+
+N_ELEMENTS = (1000, 10000, 20000)
+N_STYLES = 20
+
+
+def legacy_add_style(attributes, style_dict):
+    """Add style the way ``Element.add_style`` used to."""
+    _element_style = {}
+    for style in attributes.get('style', '').split(';'):
+        if not style:
+            continue
+        style = style.split(':')
+        _element_style[style[0].strip()] = style[1].strip()
+
+    _element_style.update(style_dict)
+    attributes['style'] = '; '.join(
+        f'{key}: {value}' for key, value in _element_style.items())
+
+
+def build_legacy(n_elements):
+    for idx in range(n_elements):
+        attributes = {}
+        legacy_add_style(attributes, {'position': 'absolute'})
+        legacy_add_style(attributes, {'left': f'{idx}px'})
+        legacy_add_style(attributes, {'bottom': f'{idx}px'})
+        for style_idx in range(N_STYLES):
+            legacy_add_style(attributes, {f'--var-{style_idx}': idx})
+
+
+def build_current(n_elements):
+    for idx in range(n_elements):
+        para = Paragraph('', position=(idx, idx))
+        for style_idx in range(N_STYLES):
+            para.add_style({f'--var-{style_idx}': idx})
+        para.attributes
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{'elements':>10} {'legacy (s)':>12} {'current (s)':>12}")
+    for n_elements in N_ELEMENTS:
+        print(f"{n_elements:>10} "
+              f"{timeit(build_legacy, n_elements):>12.4f} "
+              f"{timeit(build_current, n_elements):>12.4f}")
@@ -0,0 +1,49 @@
+"""
+====================================
+Benchmark for template instantiation
+====================================
+
+Compares building rows of icon buttons that only differ in text and
+callback by constructing every :class:`electripy.elements.Button` against
+cloning them from a :class:`electripy.templates.Template`.
+"""
+import os
+import tempfile
+import time
+
+from PIL import Image as PILImage
+
+from electripy.elements import Button
+from electripy.templates import Template
+
+N_BUTTONS = (100, 1000, 10000)
+
+
+def build_each(n_buttons):
+    return [Button(f'Action {idx}', press_callback=print, icon_name='add')
+            for idx in range(n_buttons)]
+
+
+def build_template(n_buttons):
+    template = Template(Button('Action', icon_name='add'))
+    return template.instantiate(
+        {'button_text': f'Action {idx}', 'press_callback': print}
+        for idx in range(n_buttons))
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        icon_path = os.path.join(tmp_dir, 'add.png')
+        PILImage.new('RGBA', (24, 24)).save(icon_path)
+        Button.icon_url_dict = {'add': icon_path}
+
+        print(f"{'buttons':>8} {'Button (s)':>12} {'Template (s)':>13}")
+        for n_buttons in N_BUTTONS:
+            print(f"{n_buttons:>8} {timeit(build_each, n_buttons):>12.4f} "
+                  f"{timeit(build_template, n_buttons):>13.4f}")
@@ -0,0 +1,85 @@
+"""
+======================================
+Benchmark for the binary frame channel
+======================================
+
+Streams RGBA frames to a local websocket stand-in (a socket pair with a
+reader thread) and reports throughput and per-frame latency, next to
+sending the same frames as base64 encoded JSON. The websocket rows go
+through :class: `WebSocketSink`, the sink of the served frame route,
+once over the raw socket and once through its per-buffer write fallback.
+"""
+import base64
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from electripy.transport import (FrameChannel, WebSocketSink, read_message,
+                                 socket_pair, websocket_header)
+
+N_FRAMES = 100
+SHAPE = (720, 1280, 4)
+
+
+def run(send_frame, client):
+    received = threading.Semaphore(0)
+
+    def read():
+        for _ in range(N_FRAMES):
+            read_message(client)
+            received.release()
+
+    reader = threading.Thread(target=read)
+    reader.start()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(N_FRAMES):
+        frame_start = time.perf_counter()
+        nbytes = send_frame()
+        received.acquire()
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    reader.join()
+
+    return nbytes * N_FRAMES / elapsed / 1e6, 1000 * np.median(latencies)
+
+
+if __name__ == '__main__':
+    pixels = np.random.randint(0, 255, SHAPE, dtype=np.uint8)
+
+    sink, client = socket_pair()
+    channel = FrameChannel([sink])
+
+    ws_channel = FrameChannel([WebSocketSink(SimpleNamespace(
+        closed=False, handler=SimpleNamespace(socket=sink.sock)))])
+    write_channel = FrameChannel([WebSocketSink(SimpleNamespace(
+        closed=False, raw_write=sink.sock.sendall))])
+
+    def binary_frame(rect=None, channel=channel):
+        channel.send_frame('e1', pixels, rect)
+        return (rect[2] * rect[3] * SHAPE[2]) if rect else pixels.nbytes
+
+    def json_frame():
+        message = json.dumps({
+            'id': 'e1', 'pixels': base64.b64encode(pixels).decode()}).encode()
+        sink.sock.sendall(websocket_header(len(message), opcode=0x1) + message)
+        return pixels.nbytes
+
+    print(f'{N_FRAMES} frames of {SHAPE[1]}x{SHAPE[0]}x{SHAPE[2]}')
+    print(f"{'transport':>22} {'MB/s':>10} {'latency (ms)':>14}")
+    for name, send_frame in (
+            ('binary full frame', binary_frame),
+            ('binary 256x256 rect', lambda: binary_frame((64, 64, 256, 256))),
+            ('websocket full frame', lambda: binary_frame(
+                channel=ws_channel)),
+            ('websocket writes frame', lambda: binary_frame(
+                channel=write_channel)),
+            ('websocket writes rect', lambda: binary_frame(
+                (64, 64, 256, 256), write_channel)),
+            ('base64 json', json_frame)):
+        throughput, latency = run(send_frame, client)
+        print(f'{name:>22} {throughput:>10.1f} {latency:>14.3f}')
@@ -0,0 +1,87 @@
+"""
+===============================
+Benchmark for element tree dump
+===============================
+
+Compares the legacy recursive ``log_element_recursive`` (which built its
+output with repeated string concatenation) against the iterative tree
+walker writing to a stream, on wide and deep trees. The legacy dump
+fails on trees deeper than the recursion limit, reported as ``nan``.
+Deep trees stop at 10000 elements since every line of the dump is
+indented by the depth of its element.
+"""
+import io
+import sys
+import time
+
+from electripy.elements import Paragraph
+from electripy.utils import write_element_tree
+
+N_WIDE = (1000, 10000, 100000)
+N_DEEP = (1000, 10000)
+
+
+def legacy_log_element(element, depth=0, out=""):
+    """Dump a tree the way ``log_element_recursive`` used to."""
+    tree = element._get_element_tree()
+
+    for item in tree.items():
+        name = item[0].name
+        children = item[1]
+
+        out += f"|{'===>' * depth} <{name} "
+        out += f"class={item[0].attributes['class']} "
+        out += f"id={item[0].attributes['id']}>\n"
+
+        if children:
+            for child in children:
+                out = legacy_log_element(child, depth + 1, out)
+
+    return out
+
+
+def build_wide(n_elements):
+    root = Paragraph('root')
+    for _ in range(n_elements - 1):
+        root.add_child(Paragraph(''), (0, 0))
+    return root
+
+
+def build_deep(n_elements):
+    root = node = Paragraph('root')
+    for _ in range(n_elements - 1):
+        child = Paragraph('')
+        node.add_child(child, (0, 0))
+        node = child
+    return root
+
+
+def dump_legacy(root):
+    return legacy_log_element(root)
+
+
+def dump_current(root):
+    stream = io.StringIO()
+    write_element_tree(root, stream)
+    return stream.getvalue()
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    try:
+        func(*args)
+    except RecursionError:
+        return float('nan')
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    print(f"{'tree':>6} {'elements':>10} {'legacy (s)':>12} "
+          f"{'current (s)':>12}")
+    for build, sizes in ((build_wide, N_WIDE), (build_deep, N_DEEP)):
+        for n_elements in sizes:
+            root = build(n_elements)
+            print(f"{build.__name__[6:]:>6} {n_elements:>10} "
+                  f"{timeit(dump_legacy, root):>12.4f} "
+                  f"{timeit(dump_current, root):>12.4f}")
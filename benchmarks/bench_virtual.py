@@ -0,0 +1,89 @@
+"""
+===============================
+Benchmark for virtualized lists
+===============================
+
+Compares building every row of a list of log lines as a paragraph with a
+:class: `VirtualList` only rendering its visible window, and reports the
+traced memory of both along with the mean cost of a scroll of the
+virtual list, which stays constant as the number of lines grows.
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from electripy import diff
+from electripy.elements import Paragraph, VirtualList
+
+N_SCROLLS = 1000
+ROW_HEIGHT = 20
+
+
+class LogLines:
+    """Lines of a log generated on access, like a file-backed source."""
+
+    def __init__(self, n_lines):
+        self.n_lines = n_lines
+
+    def __len__(self):
+        return self.n_lines
+
+    def __getitem__(self, idx):
+        return f'line {idx}'
+
+
+def build_eager(n_lines):
+    lines = LogLines(n_lines)
+    root = Paragraph('log')
+    root.add_children([Paragraph(lines[idx]) for idx in range(n_lines)],
+                      [(0, idx * ROW_HEIGHT) for idx in range(n_lines)])
+    return root
+
+
+def build_virtual(n_lines):
+    return VirtualList(LogLines(n_lines), row_height=ROW_HEIGHT,
+                       size=(600, 800))
+
+
+def traced(build, n_lines):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    element = build(n_lines)
+    duration = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return element, duration, size
+
+
+def mean_scroll(log, n_lines):
+    offsets = [random.randrange(n_lines * ROW_HEIGHT)
+               for _ in range(N_SCROLLS)]
+    offsets += [offset + ROW_HEIGHT * 3 for offset in offsets]
+    start = time.perf_counter()
+    for offset in offsets:
+        log.scroll_to(offset)
+    diff.get_change_tracker().collect()
+    return (time.perf_counter() - start) / len(offsets)
+
+
+if __name__ == '__main__':
+    diff.set_change_tracker(diff.ChangeTracker(send=lambda ops: None))
+    print(f"{'lines':>8} {'eager (s)':>10} {'eager (MB)':>11} "
+          f"{'virtual (s)':>12} {'virtual (MB)':>13} {'scroll (ms)':>12}")
+    for n_lines in (1000, 10000, 100000, 1000000):
+        if n_lines <= 100000:
+            eager, eager_time, eager_size = traced(build_eager, n_lines)
+            del eager
+            eager_cols = f'{eager_time:>10.3f} {eager_size / 1e6:>11.1f}'
+        else:
+            eager_cols = f"{'-':>10} {'-':>11}"
+
+        log, virtual_time, virtual_size = traced(build_virtual, n_lines)
+        diff.mount(log)
+        diff.flush()
+        scroll = mean_scroll(log, n_lines)
+        print(f'{n_lines:>8} {eager_cols} {virtual_time:>12.4f} '
+              f'{virtual_size / 1e6:>13.2f} {scroll * 1e3:>12.3f}')
@@ -0,0 +1,217 @@
+"""Module for driving the UI from asyncio.
+
+Coroutine handlers and the coroutines of the application run on an
+asyncio event loop, either one of its own on a background thread or the
+running loop of the application. Events received by the gevent loop of
+eel are handed to it without blocking, so handlers awaiting network or
+database I/O overlap instead of holding a thread each.
+"""
+import asyncio
+import threading
+
+from electripy.diff import get_change_tracker
+from electripy.mutations import active_mutation_queue
+
+
+class AsyncBridge:
+    """Asyncio event loop running coroutines submitted from any thread.
+
+    Attributes
+    ----------
+    submitted : int
+        The number of coroutines submitted.
+    """
+
+    def __init__(self, loop=None):
+        """Initialize the bridge.
+
+        Parameters
+        ----------
+        loop : :class: `asyncio.AbstractEventLoop`, optional
+            The loop to run the coroutines on, a loop of its own started
+            on a background thread on first use by default.
+        """
+        self.submitted = 0
+
+        self._loop = loop
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Start the loop of the bridge."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the loop of the bridge."""
+        self.stop()
+
+    @property
+    def loop(self):
+        """Get the loop of the bridge, starting it if needed."""
+        if self._loop is None:
+            self.start()
+        return self._loop
+
+    @property
+    def running(self):
+        """Check whether the loop of the bridge is running."""
+        return self._loop is not None and self._loop.is_running()
+
+    def start(self):
+        """Start a loop of its own on a background thread."""
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            loop.call_soon(started.set)
+            self._thread = threading.Thread(
+                target=loop.run_forever, daemon=True,
+                name='electripy-asyncio')
+            self._thread.start()
+            started.wait()
+            self._loop = loop
+
+    def attach(self, loop=None):
+        """Run the coroutines on a loop of the application instead.
+
+        Parameters
+        ----------
+        loop : :class: `asyncio.AbstractEventLoop`, optional
+            The loop, the running loop by default.
+        """
+        self.stop()
+        with self._lock:
+            self._loop = loop or asyncio.get_running_loop()
+
+    def stop(self):
+        """Stop the loop started by the bridge, if any."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop from any thread.
+
+        Parameters
+        ----------
+        coro : coroutine
+            The coroutine.
+
+        Returns
+        -------
+        :class: `concurrent.futures.Future`
+            The future of the result of the coroutine.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self.submitted += 1
+        return future
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and wait for its result.
+
+        Must not be called from the loop itself.
+
+        Parameters
+        ----------
+        coro : coroutine
+            The coroutine.
+        timeout : float, optional
+            The maximum number of seconds to wait.
+        """
+        return self.submit(coro).result(timeout)
+
+
+_async_bridge = None
+
+
+def get_async_bridge():
+    """Get the asyncio bridge of the UI."""
+    global _async_bridge
+    if _async_bridge is None:
+        _async_bridge = AsyncBridge()
+    return _async_bridge
+
+
+def set_async_bridge(async_bridge):
+    """Set the asyncio bridge of the UI.
+
+    Parameters
+    ----------
+    async_bridge : :class: `AsyncBridge`
+        The bridge to use.
+    """
+    global _async_bridge
+    _async_bridge = async_bridge
+
+
+def _assign(element, values, scheduler):
+    """Assign values to an element, getting the future of their flush."""
+    with element.batch():
+        for key, value in values.items():
+            setattr(element, key, value)
+    return scheduler.next_flush() if scheduler is not None else None
+
+
+async def flush(change_tracker=None):
+    """Send the pending changes of the UI without blocking the loop.
+
+    While an :class: `UpdateScheduler` flushes the tracker, this waits for
+    its next tick instead of sending the changes separately, so flushes
+    never reach the frontend out of order.
+
+    Parameters
+    ----------
+    change_tracker : :class: `ChangeTracker`, optional
+        The change tracker to flush, the one of the UI by default.
+
+    Returns
+    -------
+    list
+        The patch operations that were sent.
+    """
+    tracker = change_tracker or get_change_tracker()
+    scheduler = tracker.scheduler
+    if scheduler is not None:
+        return await asyncio.wrap_future(scheduler.next_flush())
+    return await asyncio.get_running_loop().run_in_executor(
+        None, tracker.flush)
+
+
+async def update(element, **values):
+    """Assign attributes or properties of an element and send the changes.
+
+    While another thread owns the mutation queue of the UI, the values are
+    assigned by the owner, and the changes are sent by the next tick of
+    the scheduler, see :func:`flush`.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The element.
+    **values
+        The values of the attributes or properties, e.g. ``text``.
+
+    Returns
+    -------
+    list
+        The patch operations that were sent.
+    """
+    scheduler = get_change_tracker().scheduler
+    queue = active_mutation_queue()
+    if queue is not None:
+        flushed = await asyncio.wrap_future(
+            queue.submit(_assign, element, values, scheduler))
+    else:
+        flushed = _assign(element, values, scheduler)
+
+    if flushed is None:
+        return await flush()
+    return await asyncio.wrap_future(flushed)
@@ -0,0 +1,343 @@
+"""Module for caching remote assets on disk."""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from hashlib import sha256
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+DEFAULT_SAVE_INTERVAL = 5.0
+
+_INDEX_NAME = 'index.json'
+_BLOB_DIR = 'blobs'
+
+_asset_caches = weakref.WeakSet()
+
+
+def default_cache_dir():
+    """Get the default directory of the asset cache.
+
+    Returns
+    -------
+    str
+        ``$ELECTRIPY_CACHE_DIR`` if set, else ``electripy/assets`` inside
+        ``$XDG_CACHE_HOME`` (``~/.cache`` by default).
+    """
+    if os.environ.get('ELECTRIPY_CACHE_DIR'):
+        return os.environ['ELECTRIPY_CACHE_DIR']
+
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'electripy', 'assets')
+
+
+class AssetCache:
+    """Content addressed on-disk cache for remote assets.
+
+    Downloaded files are stored once per content digest in ``blobs`` and
+    an index maps every URL to its digest and HTTP validators
+    (``ETag``/``Last-Modified``). The index is kept in least recently used
+    order and blobs are evicted once ``max_size`` is exceeded.
+
+    New entries are written to the index at most every ``save_interval``
+    seconds, on :meth:`save` and when the interpreter exits, so a burst
+    of misses rewrites it once. The cache is meant to be used by a single
+    process: blobs are written atomically and may be shared, but the
+    index is not locked across processes and the last one to save wins.
+
+    Attributes
+    ----------
+    cache_dir : str
+        The directory holding the cache.
+    max_size : int
+        The maximum size of all blobs in bytes.
+    revalidate : bool
+        Whether cached entries are revalidated with a conditional request.
+    save_interval : float
+        The minimum number of seconds between two saves of the index
+        after a miss.
+    hits : int
+        The number of fetches served from the cache.
+    misses : int
+        The number of fetches that had to download the asset.
+    evictions : int
+        The number of entries evicted to stay below ``max_size``.
+    bytes_fetched : int
+        The number of bytes downloaded.
+    """
+
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE,
+                 revalidate=False, save_interval=DEFAULT_SAVE_INTERVAL):
+        """Initialize the asset cache.
+
+        Parameters
+        ----------
+        cache_dir : str, optional
+            The directory holding the cache, see :func:`default_cache_dir`.
+        max_size : int, optional
+            The maximum size of all blobs in bytes.
+        revalidate : bool, optional
+            Whether cached entries are revalidated with a conditional
+            request instead of being served without any network access.
+        save_interval : float, optional
+            The minimum number of seconds between two saves of the index
+            after a miss, ``0`` saves on every miss.
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_size = max_size
+        self.revalidate = revalidate
+        self.save_interval = save_interval
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_fetched = 0
+
+        self._lock = threading.RLock()
+        self._in_flight = {}
+        self._index_dirty = False
+        self._saved_at = time.monotonic()
+        self._blob_refs = {}
+        self._size = 0
+
+        os.makedirs(os.path.join(self.cache_dir, _BLOB_DIR), exist_ok=True)
+        self._index = self._load_index()
+        for entry in self._index.values():
+            self._add_ref(entry)
+        _asset_caches.add(self)
+
+    @property
+    def size(self):
+        """Get the size of all cached blobs in bytes."""
+        return self._size
+
+    @property
+    def stats(self):
+        """Get the counters of the cache."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes_fetched': self.bytes_fetched,
+            'size': self.size,
+        }
+
+    def fetch(self, url):
+        """Get the local path of the asset behind a URL.
+
+        The asset is downloaded if it is not cached yet. Concurrent fetches
+        of the same URL wait for a single download.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the asset.
+
+        Returns
+        -------
+        str
+            The path of the cached asset.
+        """
+        waited = False
+        while True:
+            with self._lock:
+                entry = self._lookup(url)
+                if entry is not None and (waited or not self.revalidate):
+                    self.hits += 1
+                    self._touch(url)
+                    return self._blob_path(entry)
+
+                event = self._in_flight.get(url)
+                if event is None:
+                    event = self._in_flight[url] = threading.Event()
+                    break
+
+            event.wait()
+            waited = True
+
+        try:
+            return self._download(url, entry)
+        finally:
+            with self._lock:
+                self._in_flight.pop(url).set()
+
+    def contains(self, url):
+        """Check whether the asset behind a URL is cached.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the asset.
+        """
+        with self._lock:
+            return self._lookup(url) is not None
+
+    def clear(self):
+        """Remove all the cached assets."""
+        with self._lock:
+            for url in list(self._index):
+                self._release(url)
+            self.save()
+
+    def save(self):
+        """Write the index of the cache to disk."""
+        with self._lock:
+            _fd, _tmp_path = tempfile.mkstemp(dir=self.cache_dir,
+                                              suffix='.tmp')
+            with os.fdopen(_fd, 'w') as index_file:
+                json.dump(self._index, index_file)
+            os.replace(_tmp_path, os.path.join(self.cache_dir, _INDEX_NAME))
+            self._index_dirty = False
+            self._saved_at = time.monotonic()
+
+    def _load_index(self):
+        """Load the index of the cache from disk."""
+        try:
+            with open(os.path.join(self.cache_dir, _INDEX_NAME)) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+    def _lookup(self, url):
+        """Get the index entry of a URL if its blob is still on disk."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+
+        if not os.path.isfile(self._blob_path(entry)):
+            self._release(url)
+            return None
+
+        return entry
+
+    def _touch(self, url):
+        """Mark a URL as the most recently used one."""
+        self._index[url] = self._index.pop(url)
+        self._index_dirty = True
+
+    def _blob_path(self, entry):
+        """Get the path of the blob of an index entry."""
+        return os.path.join(self.cache_dir, _BLOB_DIR,
+                            f"{entry['digest']}{entry['ext']}")
+
+    def _download(self, url, entry):
+        """Download a URL into the cache."""
+        request = Request(url)
+        if entry is not None:
+            if entry.get('etag'):
+                request.add_header('If-None-Match', entry['etag'])
+            if entry.get('last_modified'):
+                request.add_header('If-Modified-Since', entry['last_modified'])
+
+        try:
+            with urlopen(request) as response:
+                content = response.read()
+                headers = response.headers
+        except HTTPError as error:
+            if error.code != 304 or entry is None:
+                raise
+
+            with self._lock:
+                self.hits += 1
+                self._touch(url)
+                return self._blob_path(entry)
+
+        _ext = os.path.splitext(os.path.basename(url.split('?')[0]))[1]
+        new_entry = {
+            'digest': sha256(content).hexdigest(),
+            'ext': _ext,
+            'size': len(content),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        blob_path = self._blob_path(new_entry)
+
+        if not os.path.isfile(blob_path):
+            _fd, _tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(blob_path), suffix='.tmp')
+            with os.fdopen(_fd, 'wb') as blob_file:
+                blob_file.write(content)
+            os.replace(_tmp_path, blob_path)
+
+        with self._lock:
+            self.misses += 1
+            self.bytes_fetched += len(content)
+
+            self._add_ref(new_entry)
+            if url in self._index:
+                self._release(url)
+            self._index[url] = new_entry
+
+            self._evict()
+            self._index_dirty = True
+            if time.monotonic() - self._saved_at >= self.save_interval:
+                self.save()
+
+        return blob_path
+
+    def _evict(self):
+        """Evict the least recently used entries above ``max_size``."""
+        while self._size > self.max_size and len(self._index) > 1:
+            self._release(next(iter(self._index)))
+            self.evictions += 1
+
+    def _add_ref(self, entry):
+        """Count an entry referencing its blob."""
+        key = (entry['digest'], entry['ext'])
+        refs = self._blob_refs.get(key, 0)
+        if not refs:
+            self._size += entry['size']
+        self._blob_refs[key] = refs + 1
+
+    def _release(self, url):
+        """Remove the entry of a URL, and its blob unless it is shared."""
+        entry = self._index.pop(url)
+        key = (entry['digest'], entry['ext'])
+        refs = self._blob_refs.pop(key) - 1
+        if refs:
+            self._blob_refs[key] = refs
+            return
+
+        self._size -= entry['size']
+        try:
+            os.remove(self._blob_path(entry))
+        except FileNotFoundError:
+            pass
+
+
+_asset_cache = None
+
+
+def get_asset_cache():
+    """Get the asset cache used by the elements.
+
+    The default cache is created on first use in :func:`default_cache_dir`.
+    """
+    if _asset_cache is None:
+        set_asset_cache(AssetCache())
+    return _asset_cache
+
+
+def set_asset_cache(asset_cache):
+    """Set the asset cache used by the elements.
+
+    Parameters
+    ----------
+    asset_cache : :class: `AssetCache`
+        The asset cache to use.
+    """
+    global _asset_cache
+    _asset_cache = asset_cache
+
+
+@atexit.register
+def _save_asset_caches():
+    """Persist the pending index changes when the interpreter exits."""
+    for asset_cache in list(_asset_caches):
+        if asset_cache._index_dirty:
+            asset_cache.save()
@@ -0,0 +1,383 @@
+"""Module for the ordered children container of the elements."""
+import random
+from collections.abc import MutableSequence
+
+
+class _Node:
+    """Node of the implicit treap of a :class: `ChildList`."""
+
+    __slots__ = ('item', 'priority', 'size', 'left', 'right', 'parent')
+
+    def __init__(self, item):
+        self.item = item
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+        self.parent = None
+
+
+def _size(node):
+    """Get the size of a subtree."""
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    """Update the size and the parent links of a node from its children."""
+    node.size = 1
+    if node.left is not None:
+        node.size += node.left.size
+        node.left.parent = node
+    if node.right is not None:
+        node.size += node.right.size
+        node.right.parent = node
+
+
+def _split(node, count):
+    """Split a subtree into its first ``count`` items and the rest."""
+    if node is None:
+        return None, None
+
+    if _size(node.left) >= count:
+        left, node.left = _split(node.left, count)
+        _update(node)
+        if left is not None:
+            left.parent = None
+        return left, node
+
+    node.right, right = _split(node.right, count - _size(node.left) - 1)
+    _update(node)
+    if right is not None:
+        right.parent = None
+    return node, right
+
+
+def _merge(left, right):
+    """Merge two subtrees, the items of ``left`` coming first."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _build(nodes):
+    """Build a balanced subtree of nodes in linear time, keeping their order.
+
+    Nodes are laid out breadth first and given decreasing priorities, so
+    the subtree is a valid treap.
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return None
+
+    priorities = sorted((node.priority for node in nodes), reverse=True)
+    order = [(0, len(nodes), None, False)]
+    for priority, (low, high, parent, is_left) in zip(priorities, order):
+        middle = (low + high) // 2
+        node = nodes[middle]
+        node.priority = priority
+        node.size = high - low
+        node.parent = parent
+        node.left = node.right = None
+        if parent is not None:
+            if is_left:
+                parent.left = node
+            else:
+                parent.right = node
+
+        if low < middle:
+            order.append((low, middle, node, True))
+        if middle + 1 < high:
+            order.append((middle + 1, high, node, False))
+
+    return nodes[len(nodes) // 2]
+
+
+class ChildList(MutableSequence):
+    """Ordered list of the children of an element.
+
+    Children are kept in an implicit treap: membership tests are O(1) and
+    positional access, insertion, removal by element, lookups of the index
+    of an element and moves are O(log n). An element can only appear once
+    in the list.
+    """
+
+    __slots__ = ('_root', '_nodes')
+
+    def __init__(self, items=()):
+        """Initialize the child list.
+
+        Parameters
+        ----------
+        items : iterable, optional
+            The initial children.
+        """
+        self._root = None
+        self._nodes = {}
+        if items:
+            self.extend(items)
+
+    def __len__(self):
+        """Get the number of children."""
+        return _size(self._root)
+
+    def __contains__(self, item):
+        """Check whether an element is a child, in O(1)."""
+        return item in self._nodes
+
+    def __iter__(self):
+        """Iterate over the children in order."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.item
+            node = node.right
+
+    def __reversed__(self):
+        """Iterate over the children in reverse order."""
+        stack = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield node.item
+            node = node.left
+
+    def __eq__(self, other):
+        """Compare the children with another sequence, in order."""
+        if not isinstance(other, (ChildList, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            item is _item or item == _item
+            for item, _item in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return the representation of the child list."""
+        return f'ChildList({list(self)!r})'
+
+    def _set_root(self, root):
+        """Set the root node of the treap."""
+        if root is not None:
+            root.parent = None
+        self._root = root
+
+    def _index(self, idx):
+        """Normalize an index, raising IndexError when out of range."""
+        length = len(self)
+        if idx < 0:
+            idx += length
+        if not 0 <= idx < length:
+            raise IndexError('ChildList index out of range')
+        return idx
+
+    def _node_at(self, idx):
+        """Get the node at a valid index."""
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if idx < left:
+                node = node.left
+            elif idx == left:
+                return node
+            else:
+                idx -= left + 1
+                node = node.right
+
+    def __getitem__(self, idx):
+        """Get the child at an index, or a list of children for a slice."""
+        if isinstance(idx, slice):
+            return list(self)[idx]
+        return self._node_at(self._index(idx)).item
+
+    def __setitem__(self, idx, item):
+        """Replace the child at an index."""
+        if isinstance(idx, slice):
+            items = list(self)
+            items[idx] = item
+            self.clear()
+            self.extend(items)
+            return
+
+        node = self._node_at(self._index(idx))
+        if node.item is item:
+            return
+        if item in self._nodes:
+            raise ValueError(f'{item!r} is already in the list.')
+        del self._nodes[node.item]
+        node.item = item
+        self._nodes[item] = node
+
+    def __delitem__(self, idx):
+        """Remove the child at an index, or the children of a slice."""
+        if isinstance(idx, slice):
+            items = list(self)
+            del items[idx]
+            self.clear()
+            self.extend(items)
+            return
+
+        idx = self._index(idx)
+        left, right = _split(self._root, idx)
+        node, right = _split(right, 1)
+        del self._nodes[node.item]
+        self._set_root(_merge(left, right))
+
+    def insert(self, idx, item):
+        """Insert a child before an index.
+
+        Parameters
+        ----------
+        idx : int
+            The index, clamped to the bounds of the list like
+            :meth:`list.insert`.
+        item : :class: `Element`
+            The child.
+        """
+        if item in self._nodes:
+            raise ValueError(f'{item!r} is already in the list.')
+
+        length = len(self)
+        if idx < 0:
+            idx = max(idx + length, 0)
+        idx = min(idx, length)
+
+        node = self._nodes[item] = _Node(item)
+        left, right = _split(self._root, idx)
+        self._set_root(_merge(_merge(left, node), right))
+
+    def append(self, item):
+        """Append a child.
+
+        Parameters
+        ----------
+        item : :class: `Element`
+            The child.
+        """
+        self.insert(len(self), item)
+
+    def extend(self, items):
+        """Append several children, building their subtree in linear time.
+
+        Parameters
+        ----------
+        items : iterable
+            The children.
+        """
+        nodes = {}
+        for item in items:
+            if item in self._nodes or item in nodes:
+                raise ValueError(f'{item!r} is already in the list.')
+            nodes[item] = _Node(item)
+
+        self._nodes.update(nodes)
+        self._set_root(_merge(self._root, _build(nodes.values())))
+
+    def index(self, item, start=0, stop=None):
+        """Get the index of a child in O(log n).
+
+        Parameters
+        ----------
+        item : :class: `Element`
+            The child.
+        """
+        node = self._nodes.get(item)
+        if node is None:
+            raise ValueError(f'{item!r} is not in the list.')
+
+        idx = _size(node.left)
+        while node.parent is not None:
+            if node is node.parent.right:
+                idx += _size(node.parent.left) + 1
+            node = node.parent
+
+        stop = len(self) if stop is None else stop
+        if not self._index_in(idx, start, stop):
+            raise ValueError(f'{item!r} is not in the list.')
+        return idx
+
+    def _index_in(self, idx, start, stop):
+        """Check whether an index is within list-like start/stop bounds."""
+        length = len(self)
+        start = max(start + length, 0) if start < 0 else start
+        stop = max(stop + length, 0) if stop < 0 else stop
+        return start <= idx < stop
+
+    def remove(self, item):
+        """Remove a child in O(log n).
+
+        Parameters
+        ----------
+        item : :class: `Element`
+            The child.
+        """
+        del self[self.index(item)]
+
+    def move(self, item, idx):
+        """Move a child to an index.
+
+        Parameters
+        ----------
+        item : :class: `Element`
+            The child.
+        idx : int
+            The index of the child once moved.
+        """
+        self.remove(item)
+        self.insert(idx, item)
+
+    def reverse(self):
+        """Reverse the order of the children in place."""
+        items = list(reversed(self))
+        self.clear()
+        self.extend(items)
+
+    def count(self, item):
+        """Count the occurrences of a child, either 0 or 1."""
+        return int(item in self._nodes)
+
+    def clear(self):
+        """Remove all the children."""
+        self._root = None
+        self._nodes = {}
+
+
+class _EmptyChildList(ChildList):
+    """Empty child list shared by all the elements without children.
+
+    Elements replace it with a :class: `ChildList` of their own before
+    adding a child, adding to it directly raises a `TypeError`.
+    """
+
+    __slots__ = ()
+
+    def insert(self, idx, item):
+        """Refuse to add a child to the shared empty list."""
+        raise TypeError('The shared empty child list cannot be changed.')
+
+    def extend(self, items):
+        """Refuse to add children to the shared empty list."""
+        for _ in items:
+            raise TypeError('The shared empty child list cannot be changed.')
+
+    def clear(self):
+        """Keep the shared empty list empty."""
+
+
+EMPTY_CHILDREN = _EmptyChildList()
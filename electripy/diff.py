@@ -0,0 +1,536 @@
+"""Module for tracking changes of mounted elements and patching the UI."""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+import eel
+
+from electripy.serialize import to_dict
+
+SET_ATTR = 'set-attr'
+SET_STYLE = 'set-style'
+SET_TEXT = 'set-text'
+APPEND_TEXT = 'append-text'
+INSERT = 'insert'
+REMOVE = 'remove'
+MOVE = 'move'
+
+
+class ElementChanges:
+    """Pending changes of a mounted element.
+
+    Attributes
+    ----------
+    attributes : dict
+        The keys of the changed attributes, in the order they changed.
+    styles : dict
+        The keys of the changed styles, in the order they changed.
+    text : bool
+        Whether the text of the element changed.
+    appended : deque
+        The lines appended to the text since it was last sent, or None if
+        no line was appended.
+    children : list
+        The children of the element as known by the frontend, or None if
+        the children did not change.
+    """
+
+    __slots__ = ('attributes', 'styles', 'text', 'appended', 'children')
+
+    def __init__(self):
+        """Initialize the changes."""
+        self.attributes = {}
+        self.styles = {}
+        self.text = False
+        self.appended = None
+        self.children = None
+
+
+def _set_mounted(element, mounted):
+    """Mark a subtree as (un)mounted and drop its pending changes."""
+    stack = [element]
+    while stack:
+        _element = stack.pop()
+        _element._mounted = mounted
+        _element._changes = None
+        stack.extend(_element.children)
+
+
+def _stable_children(positions):
+    """Get the indices of a longest increasing subsequence of positions."""
+    tails = []
+    tail_indices = []
+    previous = [-1] * len(positions)
+    for idx, position in enumerate(positions):
+        insert_at = bisect_left(tails, position)
+        if insert_at:
+            previous[idx] = tail_indices[insert_at - 1]
+        if insert_at == len(tails):
+            tails.append(position)
+            tail_indices.append(idx)
+        else:
+            tails[insert_at] = position
+            tail_indices[insert_at] = idx
+
+    stable = set()
+    idx = tail_indices[-1] if tail_indices else -1
+    while idx != -1:
+        stable.add(idx)
+        idx = previous[idx]
+    return stable
+
+
+def diff_children(element, old_children):
+    """Get the patch operations turning the old children into the current.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The parent element.
+    old_children : list
+        The children as known by the frontend.
+
+    Returns
+    -------
+    tuple
+        The remove operations, the insert and move operations, the
+        removed children and the inserted children.
+    """
+    new_children = list(element.children)
+    new_index = {child: idx for idx, child in enumerate(new_children)}
+    old_set = set(old_children)
+
+    removed = [child for child in old_children if child not in new_index]
+    kept = [child for child in old_children if child in new_index]
+    stable = {kept[idx] for idx in _stable_children(
+        [new_index[child] for child in kept])}
+
+    removals = [[REMOVE, element.id, child.id] for child in removed]
+    placements = []
+    inserted = []
+    before_id = None
+    for child in reversed(new_children):
+        if child not in old_set:
+            placements.append([INSERT, element.id, before_id, child])
+            inserted.append(child)
+        elif child not in stable:
+            placements.append([MOVE, element.id, child.id, before_id])
+        before_id = child.id
+
+    return removals, placements, removed, inserted
+
+
+def _send_to_frontend(ops):
+    """Send patch operations to the ``apply_patches`` function of the UI."""
+    getattr(eel, 'apply_patches')(ops)
+
+
+class ChangeTracker:
+    """Collects the changes of mounted elements and flushes them as patches.
+
+    Elements are mounted with :meth:`mount`, after which every attribute,
+    style, text and children change marks them dirty. :meth:`flush` turns
+    the dirty elements into a minimal list of patch operations keyed by
+    element id:
+
+    * ``[SET_ATTR, id, {key: value}]``
+    * ``[SET_STYLE, id, {key: value}]``
+    * ``[SET_TEXT, id, text]``
+    * ``[INSERT, parent_id, before_id, payload]``
+    * ``[REMOVE, parent_id, id]``
+    * ``[MOVE, parent_id, id, before_id]``
+
+    A ``before_id`` of None appends to the parent and a ``parent_id`` of
+    None targets the root of the UI. Operations sent while no client is
+    connected are lost, so a client fetches the whole UI with
+    :meth:`resync` when it connects.
+
+    With ``auto_flush`` every change is sent right away, unless it happens
+    inside a :meth:`batch` or an :meth:`Element.batch` block.
+
+    Attributes
+    ----------
+    send : callable
+        The function receiving the list of operations of every flush.
+    auto_flush : bool
+        Whether every change is flushed right away.
+    flushes : int
+        The number of flushes that sent operations.
+    ops_sent : int
+        The number of operations sent.
+    updates : int
+        The number of changes recorded.
+    coalesced : int
+        The number of changes merged into an already pending element.
+    dropped : int
+        The number of changes overwriting a pending value of the same
+        key, whose intermediate value is never sent.
+    owner : int
+        The ident of the only thread allowed to change mounted elements,
+        any thread if None. Used to catch unsynchronized changes, see
+        :class: `MutationQueue`.
+    delegate : int
+        The ident of a thread the owner lends its ownership to, see
+        :meth:`MutationQueue.lend`.
+    scheduler : :class: `UpdateScheduler`
+        The running scheduler flushing the tracker, if any.
+    """
+
+    def __init__(self, send=None, auto_flush=False):
+        """Initialize the change tracker.
+
+        Parameters
+        ----------
+        send : callable, optional
+            The function receiving the list of operations of every flush,
+            defaults to the ``apply_patches`` function exposed by the UI.
+        auto_flush : bool, optional
+            Whether every change is flushed right away.
+        """
+        self.send = send or _send_to_frontend
+        self.auto_flush = auto_flush
+        self.flushes = 0
+        self.ops_sent = 0
+        self.updates = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.owner = None
+        self.delegate = None
+        self.scheduler = None
+
+        self._roots = []
+        self._dirty = {}
+        self._pending_since = None
+        self._pending = []
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self):
+        """Get the reentrant lock of the pending changes.
+
+        Changes are collected under this lock, possibly by the thread of
+        the scheduler, so a mounted element records a change and writes
+        its new value without releasing it in between. Otherwise a flush
+        in the gap would send the old value and drop the pending change.
+        """
+        return self._lock
+
+    @property
+    def dirty(self):
+        """Get the number of elements with pending changes."""
+        return len(self._dirty)
+
+    @property
+    def pending_since(self):
+        """Get the monotonic time of the oldest pending change, if any."""
+        with self._lock:
+            if not self._dirty and not self._pending:
+                return None
+            return self._pending_since
+
+    def record_attribute(self, element, key):
+        """Record an attribute change of a mounted element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The changed element.
+        key : str
+            The name of the attribute.
+        """
+        with self._lock:
+            attributes = self._changes_of(element).attributes
+            self._count(key in attributes)
+            attributes[key] = None
+
+    def record_styles(self, element, keys):
+        """Record style changes of a mounted element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The changed element.
+        keys : iterable
+            The names of the changed styles.
+        """
+        with self._lock:
+            styles = self._changes_of(element).styles
+            for key in keys:
+                self._count(key in styles)
+                styles[key] = None
+
+    def record_text(self, element):
+        """Record a text change of a mounted element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The changed element.
+        """
+        with self._lock:
+            changes = self._changes_of(element)
+            self._count(changes.text or changes.appended is not None)
+            changes.text = True
+            changes.appended = None
+
+    def record_append(self, element, lines, max_lines):
+        """Record lines appended to the text of a mounted element.
+
+        Only the last `max_lines` appended lines are kept, the frontend
+        drops the lines beyond them the same way.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The changed element.
+        lines : iterable
+            The appended lines.
+        max_lines : int
+            The maximum number of lines of the element.
+        """
+        with self._lock:
+            changes = self._changes_of(element)
+            self._count(changes.text)
+            if changes.text:
+                return
+            if changes.appended is None:
+                changes.appended = deque(maxlen=max_lines)
+            changes.appended.extend(lines)
+
+    def record_children(self, element):
+        """Record a children change of a mounted element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The element whose children are about to change.
+        """
+        with self._lock:
+            changes = self._changes_of(element)
+            self._count(False)
+            if changes.children is None:
+                changes.children = list(element.children)
+
+    def _changes_of(self, element):
+        """Get the pending changes of an element, marking it dirty."""
+        if self.owner is not None and \
+                threading.get_ident() not in (self.owner, self.delegate):
+            raise RuntimeError(
+                f'{element.name} {element.id} is mounted and can only be '
+                'changed from the thread owning the UI, submit the change '
+                'to the mutation queue instead.')
+
+        changes = element._changes
+        if changes is None:
+            if not self._dirty:
+                self._pending_since = time.monotonic()
+            changes = element._changes = ElementChanges()
+            self._dirty[element] = None
+        else:
+            self.coalesced += 1
+        return changes
+
+    def _count(self, dropped):
+        """Count an update and whether it dropped a pending value."""
+        self.updates += 1
+        self.dropped += dropped
+
+    def changed(self):
+        """Notify the tracker that a mounted element changed."""
+        if self.auto_flush and not self._batch_depth:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Postpone notifications of all the elements until the block exits.
+
+        The changes made inside the block are sent as one update.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+            self.changed()
+
+    def mount(self, element):
+        """Mount an element as a root of the UI.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root element.
+        """
+        with self._lock:
+            self._pending_since = time.monotonic()
+            self._pending.append([INSERT, None, None, to_dict(element)])
+            self._roots.append(element)
+            _set_mounted(element, True)
+
+    def unmount(self, element):
+        """Unmount a root element from the UI.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root element.
+        """
+        with self._lock:
+            self._pending_since = time.monotonic()
+            self._pending.append([REMOVE, None, element.id])
+            if element in self._roots:
+                self._roots.remove(element)
+            _set_mounted(element, False)
+
+    def resync(self):
+        """Get the payloads of the mounted roots for a connecting client.
+
+        The pending changes are collected and dropped, the payloads
+        already hold them.
+
+        Returns
+        -------
+        list
+            The payloads of the roots, in the order they were mounted.
+        """
+        with self._lock:
+            self.collect()
+            return [to_dict(root) for root in self._roots]
+
+    def collect(self):
+        """Turn the pending changes into patch operations.
+
+        Returns
+        -------
+        list
+            The patch operations, removals first.
+        """
+        with self._lock:
+            dirty, self._dirty = list(self._dirty), {}
+            ops, self._pending = self._pending, []
+
+            removals = []
+            placements = {}
+            for element in dirty:
+                changes = element._changes
+                if changes is None or changes.children is None:
+                    continue
+                if not element._mounted:
+                    continue
+
+                _removals, _placements, removed, _ = diff_children(
+                    element, changes.children)
+                removals.extend(_removals)
+                placements[element] = _placements
+                for child in removed:
+                    _set_mounted(child, False)
+
+            ops.extend(removals)
+            for element in dirty:
+                changes = element._changes
+                if changes is None or not element._mounted:
+                    continue
+
+                ops.extend(self._element_ops(element, changes))
+                for op in placements.get(element, ()):
+                    if op[0] == INSERT:
+                        child, op[3] = op[3], to_dict(op[3])
+                        _set_mounted(child, True)
+                    ops.append(op)
+                element._changes = None
+
+            return ops
+
+    def flush(self):
+        """Send the pending changes to the frontend.
+
+        Returns
+        -------
+        list
+            The patch operations that were sent.
+        """
+        ops = self.collect()
+        if ops:
+            self.send(ops)
+            self.flushes += 1
+            self.ops_sent += len(ops)
+        return ops
+
+    def _element_ops(self, element, changes):
+        """Get the attribute, style and text operations of an element."""
+        ops = []
+        if changes.attributes:
+            _attributes = element._attributes
+            ops.append([SET_ATTR, element.id,
+                        {key: _attributes.get(key)
+                         for key in changes.attributes}])
+        if changes.styles:
+            _style = element._style
+            ops.append([SET_STYLE, element.id,
+                        {key: _style.get(key) for key in changes.styles}])
+        if changes.text:
+            ops.append([SET_TEXT, element.id, element.text])
+        elif changes.appended:
+            ops.append([APPEND_TEXT, element.id, list(changes.appended)])
+        return ops
+
+
+_change_tracker = None
+
+
+def get_change_tracker():
+    """Get the change tracker of the UI."""
+    global _change_tracker
+    if _change_tracker is None:
+        _change_tracker = ChangeTracker()
+    return _change_tracker
+
+
+def set_change_tracker(change_tracker):
+    """Set the change tracker of the UI.
+
+    Parameters
+    ----------
+    change_tracker : :class: `ChangeTracker`
+        The change tracker to use.
+    """
+    global _change_tracker
+    _change_tracker = change_tracker
+
+
+def mount(element):
+    """Mount an element as a root of the UI, see :meth:`ChangeTracker.mount`.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root element.
+    """
+    get_change_tracker().mount(element)
+
+
+@eel.expose
+def resync_ui():
+    """Get the mounted roots of the UI, see :meth:`ChangeTracker.resync`."""
+    return get_change_tracker().resync()
+
+
+def batch():
+    """Batch the changes of the whole UI, see :meth:`ChangeTracker.batch`."""
+    return get_change_tracker().batch()
+
+
+def flush():
+    """Send the pending changes to the frontend.
+
+    Returns
+    -------
+    list
+        The patch operations that were sent.
+    """
+    return get_change_tracker().flush()
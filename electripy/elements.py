@@ -1,16 +1,130 @@
 """Module for the creation of the elements."""
+import functools
+import inspect
 import json
-import os
+import operator
 from abc import ABC, abstractmethod
-from hashlib import md5
-from urllib.request import urlretrieve
+from collections import deque
+from contextlib import contextmanager, nullcontext
 
 import eel
 import numpy as np
-from PIL import Image as PILImage
 
+from electripy.children import EMPTY_CHILDREN, ChildList
+from electripy.diff import get_change_tracker
+from electripy.events import PRESS, get_event_bus, wait_for_event
+from electripy.imaging import (convert_frame, fit_size, get_variant_cache,
+                               is_url, prefetch_images, read_size,
+                               resolve_source)
+from electripy.layout import LAYOUT_STYLES, LayoutEngine
+from electripy.mutations import active_mutation_queue, lending_queue
+from electripy.registry import allocate_id, get_element, register
+from electripy.selectors import SelectorIndex, is_descendant
+from electripy.serialize import to_bytes, to_dict, to_json
+from electripy.streaming import LATEST, FrameStream
+from electripy.transport import get_frame_channel
 from electripy.utils import __all_ui__ as all_ui
-from electripy.utils import log_element_recursive
+from electripy.utils import (PRE_ORDER, iter_tree, log_element_recursive,
+                             paused_gc, write_element_tree)
+
+ICON_URLS = {
+    'add': 'https://img.icons8.com/material-outlined/24/000000/add.png',
+    'delete': 'https://img.icons8.com/material-outlined/24/000000/delete-forever.png',
+    'edit': 'https://img.icons8.com/material-outlined/24/000000/edit.png',
+    'save': 'https://img.icons8.com/material-outlined/24/000000/save.png',
+    'cancel': 'https://img.icons8.com/material-outlined/24/000000/cancel.png',
+    'play': 'https://img.icons8.com/material-outlined/24/000000/play.png',
+    'pause': 'https://img.icons8.com/material-outlined/24/000000/pause.png',
+    'stop': 'https://img.icons8.com/material-outlined/24/000000/stop.png',
+    'next': 'https://img.icons8.com/material-outlined/24/000000/next.png',
+    'previous': 'https://img.icons8.com/material-outlined/24/000000/previous.png',
+    'up': 'https://img.icons8.com/material-outlined/24/000000/up-arrow.png',
+    'down': 'https://img.icons8.com/material-outlined/24/000000/down-arrow.png',
+    'left': 'https://img.icons8.com/material-outlined/24/000000/left-arrow.png',
+    'right': 'https://img.icons8.com/material-outlined/24/000000/right-arrow.png',
+    'check': 'https://img.icons8.com/material-outlined/24/000000/checkmark.png',
+    'uncheck': 'https://img.icons8.com/material-outlined/24/000000/cancel.png',
+}
+
+
+_LAYOUT_STYLES = frozenset(LAYOUT_STYLES)
+_UNLOCKED = nullcontext()
+_EMPTY_STYLE = {}
+_STYLE_TABLE_SIZE = 4096
+_style_table = {}
+_RUNTIME_SLOTS = frozenset(('parent', 'children', '_mounted', '_changes',
+                            '_batch_depth', '_index', '_layout'))
+_slot_names_cache = {}
+
+
+@functools.lru_cache(maxsize=4096, typed=True)
+def _length(value, unit):
+    """Get a CSS length, the same string for the same value and unit."""
+    return f'{value}{unit}'
+
+
+def _interned_style(style):
+    """Get the shared mapping equal to `style`, or None if the table is full.
+
+    Unmounted elements built with the same styles hold the same mapping
+    until they write a style of their own, like :func: `_length` does for
+    the lengths inside them.
+    """
+    key = tuple(style.items())
+    try:
+        shared = _style_table.get(key)
+        if shared is None and len(_style_table) < _STYLE_TABLE_SIZE:
+            shared = _style_table[key] = style
+    except TypeError:
+        return None
+    return shared
+
+
+def _slot_names(cls, stop=None):
+    """Get the names of the slots of a class and its bases below `stop`."""
+    names = _slot_names_cache.get((cls, stop))
+    if names is None:
+        mro = cls.__mro__
+        if stop is not None:
+            mro = mro[:mro.index(stop)]
+        names = _slot_names_cache[cls, stop] = tuple(
+            slot for klass in mro
+            for slot in getattr(klass, '__slots__', ())
+            if slot not in ('__weakref__', '__dict__'))
+    return names
+
+
+def _check_position(position):
+    """Validate the position of a child before it is added.
+
+    Parameters
+    ----------
+    position : tuple
+        The absolute or normalized ``(x, y)`` position.
+
+    Returns
+    -------
+    tuple
+        The position to assign, marked ``'relative'`` when normalized.
+
+    Raises
+    ------
+    ValueError
+        If the position is not a pair of numbers or its normalized
+        coordinates are outside of [0, 1].
+    """
+    _position = np.asarray(position)
+    if _position.shape != (2,) or \
+            not np.issubdtype(_position.dtype, np.number):
+        raise ValueError(
+            f'Position must be a pair of numbers, got {position}.')
+
+    if np.issubdtype(_position.dtype, np.floating):
+        if np.any((_position < 0) | (_position > 1)):
+            raise ValueError("Normalized coordinates must be in [0,1].")
+
+        return (*position, 'relative')
+    return position
 
 
 class Element(ABC):
@@ -28,6 +142,11 @@ class Element(ABC):
         The attributes of the element.
     """
 
+    __slots__ = ('name', 'parent', 'children', '_attributes', '_style',
+                 '_style_string', '_style_shared', '_class_name', '_mounted',
+                 '_changes', '_batch_depth', '_index', '_layout',
+                 '__weakref__')
+
     def __init__(self, name, position=(0, 0), parent=None, class_name=None):
         """Initialize the element.
 
@@ -42,8 +161,17 @@ class Element(ABC):
         class_name : str, optional
             The class name of the element.
         """
-        self.children = []
-        self.attributes = {}
+        self.parent = None
+        self.children = EMPTY_CHILDREN
+        self._attributes = {}
+        self._style = _EMPTY_STYLE
+        self._style_string = None
+        self._style_shared = True
+        self._mounted = False
+        self._changes = None
+        self._batch_depth = 0
+        self._index = None
+        self._layout = None
 
         self.name = name
         if self.name not in all_ui:
@@ -52,17 +180,156 @@ class Element(ABC):
 
         self._class_name = str
         self.class_name = class_name or ''
+        self._process_attributes()
 
-        self.parent = parent
-        if self.parent:
-            self.parent.add_child(self, position)
+        if parent:
+            parent.add_child(self, position)
 
-        self._position = tuple()
         self.position = position
 
-        self._process_attributes()
         self._setup()
 
+    def clone(self, **overrides):
+        """Clone the element and its descendants.
+
+        The clones skip `_setup` and share the style mappings and image
+        data of the originals copy-on-write, only the attributes holding
+        the unique ids of the clones are copied up front.
+
+        Parameters
+        ----------
+        **overrides
+            Values assigned to the attributes or properties of the cloned
+            root, e.g. ``text`` or ``class_name``.
+
+        Returns
+        -------
+        :class: `Element`
+            The detached clone.
+        """
+        for key in overrides:
+            if not hasattr(type(self), key):
+                raise AttributeError(
+                    f'{type(self).__name__} has no attribute {key!r}.')
+
+        copies = {}
+        for element, _ in iter_tree(self):
+            copy = copies[element] = element._copy()
+            if element is not self:
+                copy.parent = copies[element.parent]
+                copy.parent._own_children().append(copy)
+
+        for element, copy in copies.items():
+            for slot in _slot_names(type(copy), Element):
+                value = getattr(copy, slot, None)
+                if isinstance(value, Element) and value in copies:
+                    setattr(copy, slot, copies[value])
+            copy._cloned(element)
+
+        clone = copies[self]
+        for key, value in overrides.items():
+            setattr(clone, key, value)
+        return clone
+
+    def _copy(self):
+        """Copy the element alone, sharing its style copy-on-write."""
+        cls = type(self)
+        copy = cls.__new__(cls)
+        for slot in _slot_names(cls):
+            try:
+                setattr(copy, slot, getattr(self, slot))
+            except AttributeError:
+                pass
+        if hasattr(self, '__dict__'):
+            copy.__dict__.update(self.__dict__)
+
+        copy.parent = None
+        copy.children = EMPTY_CHILDREN
+        copy._mounted = False
+        copy._changes = None
+        copy._batch_depth = 0
+        copy._index = None
+        copy._layout = None
+        copy._style_shared = self._style_shared = True
+        copy._attributes = dict(self._attributes)
+        copy._attributes['id'] = allocate_id()
+        register(copy)
+        return copy
+
+    def _cloned(self, source):
+        """Finish cloning the element from its source element."""
+
+    def _get_state(self):
+        """Get the state of the element alone, without its tree links."""
+        state = {}
+        for slot in _slot_names(type(self)):
+            if slot not in _RUNTIME_SLOTS and hasattr(self, slot):
+                state[slot] = getattr(self, slot)
+        if hasattr(self, '__dict__'):
+            state.update(self.__dict__)
+        return state
+
+    def _set_state(self, state):
+        """Restore the element alone from its state, skipping `_setup`."""
+        for key, value in state.items():
+            setattr(self, key, value)
+
+        self.parent = None
+        self.children = EMPTY_CHILDREN
+        self._mounted = False
+        self._changes = None
+        self._batch_depth = 0
+        self._index = None
+        self._layout = None
+        self._attributes['id'] = allocate_id()
+        register(self)
+
+    def on(self, event_type, handler):
+        """Register a handler of the events of the element.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the events, e.g. ``press``.
+        handler : callable
+            Function called with every :class: `Event`, on the thread pool
+            of the event bus.
+        """
+        get_event_bus().on(self, event_type, handler)
+
+    def off(self, event_type=None, handler=None):
+        """Unregister handlers of the events of the element.
+
+        Parameters
+        ----------
+        event_type : str, optional
+            The type of the events, all types by default.
+        handler : callable, optional
+            The handler to unregister, all of them by default.
+        """
+        get_event_bus().off(self, event_type, handler)
+
+    async def wait_for(self, event_type, timeout=None):
+        """Wait for the next event of the element.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the event, e.g. ``press``.
+        timeout : float, optional
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        :class: `Event`
+            The event.
+        """
+        return await wait_for_event(self, event_type, timeout)
+
+    def _event_handler(self, event_type):
+        """Get the handler of the element itself for a type of events."""
+        return None
+
     def __str__(self):
         """Return the string representation of the element."""
         return json.dumps(self.attributes, indent=4)
@@ -71,6 +338,39 @@ class Element(ABC):
         """Return the representation of the element."""
         return log_element_recursive(self)
 
+    def iter_tree(self, order=PRE_ORDER):
+        """Iterate over the element and its descendants with their depth.
+
+        Parameters
+        ----------
+        order : str, optional
+            Either ``pre`` to yield parents before their children, or
+            ``post`` to yield them after.
+        """
+        return iter_tree(self, order)
+
+    def write_tree(self, stream=None):
+        """Write the tree of the element to a stream.
+
+        Parameters
+        ----------
+        stream : file-like, optional
+            The stream to write to, standard output by default.
+        """
+        write_element_tree(self, stream)
+
+    def to_dict(self):
+        """Serialize the element and its children into a nested payload."""
+        return to_dict(self)
+
+    def to_json(self):
+        """Serialize the element and its children into compact JSON."""
+        return to_json(self)
+
+    def to_bytes(self):
+        """Serialize the element and its children into compact bytes."""
+        return to_bytes(self)
+
     @abstractmethod
     def _setup(self):
         """Setup the element."""
@@ -79,14 +379,38 @@ class Element(ABC):
 
     def _process_attributes(self):
         """Process the attributes of the element."""
-        self.attributes['id'] = md5(
-            f"{self.name}{self.class_name}".encode()).hexdigest()[:5]
-        self.attributes['class'] = self.class_name
+        self._attributes['id'] = allocate_id()
+        self._attributes['class'] = self.class_name
+        register(self)
+
+    @property
+    def id(self):
+        """Get the unique id of the element."""
+        return self._attributes['id']
+
+    @property
+    def attributes(self):
+        """Get the attributes of the element.
+
+        The ``style`` attribute is derived from the style mapping of the
+        element and is only rebuilt when the styles have changed.
+        """
+        self._attributes['style'] = self.style
+        return self._attributes
+
+    @property
+    def style(self):
+        """Get the CSS style string of the element."""
+        if self._style_string is None:
+            self._style_string = '; '.join(
+                f'{key}: {value}' for key, value in self._style.items())
+
+        return self._style_string
 
     @property
     def position(self):
         """Get the position of the element."""
-        return self.attributes['position']
+        return self._attributes['position']
 
     @position.setter
     def position(self, position):
@@ -96,20 +420,22 @@ class Element(ABC):
             if self.parent:
                 self.parent.add_style({'position': 'relative'})
 
-            self.add_style({'position': 'absolute'})
-            self.add_style({'left': f'{int(position[0]*100)}%'})
-            self.add_style({'bottom': f'{int(position[1]*100)}%'})
+            self.add_style({'position': 'absolute',
+                            'left': _length(int(position[0]*100), '%'),
+                            'bottom': _length(int(position[1]*100), '%')})
         else:
-            self.add_style({'position': 'absolute'})
-            self.add_style({'left': f'{position[0]}px'})
-            self.add_style({'bottom': f'{position[1]}px'})
+            self.add_style({'position': 'absolute',
+                            'left': _length(position[0], 'px'),
+                            'bottom': _length(position[1], 'px')})
 
-        self.attributes['position'] = position
-        self._position = position
+        self.set_attribute('position', position)
 
-    def add_child(self, child, position=(0, 0)):
+    def add_child(self, child, position=(0, 0), index=None):
         """Add a child to this element.
 
+        A child of another element is detached from it first, so an
+        element never appears in two children lists.
+
         Parameters
         ----------
         child : :class: `Element`
@@ -118,16 +444,126 @@ class Element(ABC):
             The position of the child.
             If float, the child will be placed relative the parent,
             else position is assumed to be absolute.
+        index : int, optional
+            The index to insert the child at, appended by default.
         """
-        if np.issubdtype(np.array(position).dtype, np.floating):
-            if np.any(np.array(position) < 0) or np.any(np.array(position) > 1):
-                raise ValueError("Normalized coordinates must be in [0,1].")
+        self._check_child(child)
+        position = _check_position(position)
+        if index is not None:
+            index = operator.index(index)
+
+        if child.parent is not None:
+            child.parent.remove_child(child)
+
+        with self._change_lock():
+            self._track_children()
+            child.parent = self
+            child.position = position
+            if index is None:
+                self._own_children().append(child)
+            else:
+                self._own_children().insert(index, child)
+
+        child._index = None
+        child._layout = None
+        tree_index = self._tree_index()
+        if tree_index is not None:
+            tree_index.add(child)
+        layout = self._tree_layout()
+        if layout is not None:
+            layout.add(child)
+        self._changed()
+
+    def add_children(self, children, positions, relative=None):
+        """Add several children to this element at once.
 
-            position = (*position, 'relative')
+        All the positions are validated and classified in one vectorized
+        pass before any child is added, and the styles of children that
+        are not mounted yet are assigned directly.
+
+        Parameters
+        ----------
+        children : sequence
+            The children to add.
+        positions : array_like
+            The ``(N, 2)`` positions of the children. Floating point
+            positions are relative to the parent, other positions are
+            absolute, see :meth:`add_child`.
+        relative : array_like, optional
+            The ``(N,)`` boolean mask of the relative positions, overriding
+            the classification by dtype.
+        """
+        children = list(children)
+        positions = np.asarray(positions)
+        if positions.ndim != 2 or positions.shape != (len(children), 2):
+            raise ValueError(
+                f'Expected ({len(children)}, 2) positions, '
+                f'got {positions.shape}.')
 
-        child.parent = self
-        child.position = position
-        self.children.append(child)
+        if relative is None:
+            relative = np.full(len(children),
+                               np.issubdtype(positions.dtype, np.floating))
+        else:
+            relative = np.asarray(relative, dtype=bool)
+
+        _relative = positions[relative]
+        if np.any((_relative < 0) | (_relative > 1)):
+            raise ValueError("Normalized coordinates must be in [0,1].")
+        if len({*children}) != len(children):
+            raise ValueError('Children can only be added once.')
+        for child in children:
+            self._check_child(child)
+
+        with paused_gc():
+            percents = (positions * 100).astype(int).tolist()
+            rows = zip(children, positions.tolist(), percents,
+                       relative.tolist())
+
+            for child in children:
+                if child.parent is not None:
+                    child.parent.remove_child(child)
+
+            if relative.any():
+                self.add_style({'position': 'relative'})
+
+            with self._change_lock():
+                self._track_children()
+                for child, position, percent, is_relative in rows:
+                    child.parent = self
+                    child._index = None
+                    child._layout = None
+                    if is_relative:
+                        style_dict = {'position': 'absolute',
+                                      'left': _length(percent[0], '%'),
+                                      'bottom': _length(percent[1], '%')}
+                    else:
+                        style_dict = {'position': 'absolute',
+                                      'left': _length(position[0], 'px'),
+                                      'bottom': _length(position[1], 'px')}
+                    position = tuple(position)
+                    if child._mounted:
+                        child.add_style(style_dict)
+                        child.set_attribute('position', position)
+                    else:
+                        child._update_style(style_dict)
+                        child._attributes['position'] = position
+                self._own_children().extend(children)
+
+            tree_index = self._tree_index()
+            if tree_index is not None:
+                for child in children:
+                    tree_index.add(child)
+            layout = self._tree_layout()
+            if layout is not None:
+                for child in children:
+                    layout.add(child)
+            self._changed()
+
+    def _check_child(self, child):
+        """Check that an element can be added as a child of this element."""
+        if child is self or is_descendant(self, child):
+            raise ValueError(
+                'An element cannot be added to its own subtree.')
 
     def remove_child(self, child):
         """Remove a child from this element.
@@ -137,8 +573,163 @@ class Element(ABC):
         child : :class: `Element`
             The child to remove.
         """
-        self.children.remove(child)
-        child.parent = None
+        if child not in self.children:
+            raise ValueError(f'{child.name} is not a child of {self.name}.')
+
+        tree_index = self._tree_index()
+        if tree_index is not None:
+            tree_index.remove(child)
+        layout = self._tree_layout()
+        if layout is not None:
+            layout.remove(child)
+
+        with self._change_lock():
+            self._track_children()
+            self.children.remove(child)
+            child.parent = None
+        self._changed()
+
+    def move_child(self, child, index):
+        """Move a child of this element to another index.
+
+        Parameters
+        ----------
+        child : :class: `Element`
+            The child to move.
+        index : int
+            The index of the child once moved.
+        """
+        if child not in self.children:
+            raise ValueError(f'{child.name} is not a child of {self.name}.')
+
+        with self._change_lock():
+            self._track_children()
+            self.children.move(child, index)
+        self._changed()
+
+    def clear_children(self):
+        """Remove all the children of this element."""
+        children = list(self.children)
+        tree_index = self._tree_index()
+        if tree_index is not None:
+            for child in children:
+                tree_index.remove(child)
+        layout = self._tree_layout()
+        if layout is not None:
+            for child in children:
+                layout.remove(child)
+
+        with self._change_lock():
+            self._track_children()
+            self.children.clear()
+            for child in children:
+                child.parent = None
+        self._changed()
+
+    @property
+    def root(self):
+        """Get the root of the tree of the element."""
+        element = self
+        while element.parent is not None:
+            element = element.parent
+        return element
+
+    @property
+    def index(self):
+        """Get the selector index of the tree, built on first access."""
+        root = self.root
+        if root._index is None:
+            root._index = SelectorIndex(root)
+        return root._index
+
+    def _tree_index(self):
+        """Get the selector index of the tree if it was built."""
+        return self.root._index
+
+    @property
+    def layout(self):
+        """Get the layout engine of the tree, built on first access."""
+        root = self.root
+        if root._layout is None:
+            root._layout = LayoutEngine(root)
+        return root._layout
+
+    def _tree_layout(self):
+        """Get the layout engine of the tree if it was built."""
+        return self.root._layout
+
+    @property
+    def box(self):
+        """Get the absolute ``(x, y, width, height)`` box of the element.
+
+        See :mod:`electripy.layout`.
+        """
+        return self.layout.box(self)
+
+    def find_by_id(self, element_id):
+        """Find the element with the given id in this subtree.
+
+        Parameters
+        ----------
+        element_id : str
+            The id of the element.
+
+        Returns
+        -------
+        :class: `Element`
+            The element, None if it is not part of this subtree.
+        """
+        element = self.index.find_by_id(element_id)
+        if element is None or element is self or self.parent is None:
+            return element
+        return element if is_descendant(element, self) else None
+
+    def find_all(self, element_type=None, class_name=None):
+        """Find the elements of this subtree by type and class name.
+
+        Parameters
+        ----------
+        element_type : type or str, optional
+            The class of the elements, subclasses included, or their name.
+        class_name : str, optional
+            The class name the elements must have.
+
+        Returns
+        -------
+        list
+            The matching elements of this element and its descendants.
+        """
+        elements = self.index.find_all(element_type, class_name)
+        if self.parent is None:
+            return elements
+        return [element for element in elements
+                if element is self or is_descendant(element, self)]
+
+    def select(self, selector):
+        """Find the elements of this subtree matching a CSS-like selector.
+
+        Parameters
+        ----------
+        selector : str
+            The selector, see :mod:`electripy.selectors`.
+
+        Returns
+        -------
+        list
+            The matching elements of this element and its descendants.
+        """
+        return self.index.select(selector, scope=self)
+
+    def select_one(self, selector):
+        """Find the first element of this subtree matching a selector.
+
+        Parameters
+        ----------
+        selector : str
+            The selector, see :mod:`electripy.selectors`.
+        """
+        elements = self.select(selector)
+        return elements[0] if elements else None
 
     @abstractmethod
     def _get_element_tree(self):
@@ -160,25 +751,119 @@ class Element(ABC):
         style_dict : dict
             The key value pair to add the styling.
         """
-        _element_style = self._parse_style()
-        _element_style.update(style_dict)
-        self.attributes['style'] = '; '.join(
-            f'{key}: {value}' for key, value in _element_style.items())
+        with self._change_lock():
+            if self._mounted:
+                _style = self._style
+                style_dict = {key: value for key, value in style_dict.items()
+                              if key not in _style or _style[key] != value}
+                if not style_dict:
+                    return
+                get_change_tracker().record_styles(self, style_dict)
+
+            self._update_style(style_dict)
+        if not _LAYOUT_STYLES.isdisjoint(style_dict):
+            layout = self._tree_layout()
+            if layout is not None:
+                layout.invalidate(self)
+        self._changed()
 
     def _parse_style(self):
-        """Parse the style of the element."""
-        style_dict = {}
-
-        if 'style' not in self.attributes:
-            self.attributes['style'] = ''
-
-        for style in self.attributes['style'].split(';'):
-            if not style:
-                continue
-            style = style.split(':')
-            style_dict[style[0].strip()] = style[1].strip()
+        """Get a copy of the style mapping of the element."""
+        return dict(self._style)
+
+    def _own_children(self):
+        """Get the child list of the element, replacing the shared one."""
+        if self.children is EMPTY_CHILDREN:
+            self.children = ChildList()
+        return self.children
+
+    def _update_style(self, style_dict):
+        """Update the style mapping, shared while the element is unmounted."""
+        if self._style_shared and not self._mounted:
+            style = _interned_style({**self._style, **style_dict})
+            if style is not None:
+                self._style = style
+                self._style_string = None
+                return
+        self._own_style().update(style_dict)
+        self._style_string = None
+
+    def _own_style(self):
+        """Get the style mapping of the element, copying it if shared."""
+        if self._style_shared:
+            self._style = dict(self._style)
+            self._style_shared = False
+        return self._style
+
+    def set_attribute(self, key, value):
+        """Set an attribute of the element.
 
-        return style_dict
+        Parameters
+        ----------
+        key : str
+            The name of the attribute.
+        value : object
+            The value of the attribute.
+        """
+        with self._change_lock():
+            if self._mounted:
+                if key in self._attributes and \
+                        self._attributes[key] == value:
+                    return
+                get_change_tracker().record_attribute(self, key)
+
+            self._attributes[key] = value
+        self._changed()
+
+    def _change_lock(self):
+        """Get the lock to hold while recording and writing a change.
+
+        Mounted elements hold the lock of the change tracker, see
+        :attr:`ChangeTracker.lock`, or borrow the ownership of the UI for
+        the change inside :meth:`MutationQueue.lending`. Other elements do
+        not lock at all.
+        """
+        if not self._mounted:
+            return _UNLOCKED
+        queue = lending_queue()
+        if queue is not None:
+            return queue.lend()
+        return get_change_tracker().lock
+
+    def _changed(self):
+        """Notify the change tracker that this mounted element changed."""
+        if self._mounted and not self._batch_depth:
+            get_change_tracker().changed()
+
+    @contextmanager
+    def batch(self):
+        """Postpone the notifications of this element until the block exits.
+
+        Position, style, class and attribute changes made inside the block
+        are sent to the frontend as one update. A mounted element also
+        batches the change tracker, see :meth:`ChangeTracker.batch`, so
+        changes of its children, e.g. the text of the paragraph of a
+        :class: `Button`, are part of the same update.
+        """
+        tracker = get_change_tracker() if self._mounted else None
+        with tracker.batch() if tracker is not None else nullcontext():
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._changes is not None:
+                    self._changed()
+
+    def _track_children(self):
+        """Remember the children known by the frontend before changing them."""
+        if self._mounted:
+            get_change_tracker().record_children(self)
+
+    def _get_payload(self):
+        """Get the payload of the element sent to the frontend."""
+        return {'name': self.name, 'id': self.id,
+                'attributes': dict(self.attributes)}
 
     @property
     def class_name(self):
@@ -186,13 +871,23 @@ class Element(ABC):
 
     @class_name.setter
     def class_name(self, class_name):
-        self.attributes['class'] = class_name
+        index = self._tree_index()
+        if index is not None:
+            index.rename(self, self._class_name, class_name)
+
+        self.set_attribute('class', class_name)
         self._class_name = class_name
 
 
 class Button(Element):
     """Class to represent a Button."""
 
+    __slots__ = ('_button_text', 'press_callback', 'font_size', 'size',
+                 'icon_name', 'paragraph', 'icon')
+
+    icon_size = (100, 50)
+    icon_url_dict = ICON_URLS
+
     def __init__(self, button_text, press_callback=None,
                  position=(0, 0), parent=None, font_size=10,
                  size=(100, 50), class_name=None, icon_name=None):
@@ -204,6 +899,7 @@ class Button(Element):
             Text to display inside the button
         press_callback: function, optional
             Callback function to execute when the button is pressed.
+            Coroutine functions are run on the asyncio loop of the UI.
         position: tuple, optional
             The position of the button.
         parent: :class: `Element`, optional
@@ -238,7 +934,6 @@ class Button(Element):
         ----
         You can add custom icon by using the `add_icon` method.
         """
-        self.name = 'Button'
         self.button_text = button_text
         self.press_callback = press_callback
 
@@ -246,24 +941,6 @@ class Button(Element):
         self.size = size
         self.icon_name = icon_name or ''
 
-        self.icon_url_dict = {
-            'add': 'https://img.icons8.com/material-outlined/24/000000/add.png',
-            'delete': 'https://img.icons8.com/material-outlined/24/000000/delete-forever.png',
-            'edit': 'https://img.icons8.com/material-outlined/24/000000/edit.png',
-            'save': 'https://img.icons8.com/material-outlined/24/000000/save.png',
-            'cancel': 'https://img.icons8.com/material-outlined/24/000000/cancel.png',
-            'play': 'https://img.icons8.com/material-outlined/24/000000/play.png',
-            'pause': 'https://img.icons8.com/material-outlined/24/000000/pause.png',
-            'stop': 'https://img.icons8.com/material-outlined/24/000000/stop.png',
-            'next': 'https://img.icons8.com/material-outlined/24/000000/next.png',
-            'previous': 'https://img.icons8.com/material-outlined/24/000000/previous.png',
-            'up': 'https://img.icons8.com/material-outlined/24/000000/up-arrow.png',
-            'down': 'https://img.icons8.com/material-outlined/24/000000/down-arrow.png',
-            'left': 'https://img.icons8.com/material-outlined/24/000000/left-arrow.png',
-            'right': 'https://img.icons8.com/material-outlined/24/000000/right-arrow.png',
-            'check': 'https://img.icons8.com/material-outlined/24/000000/checkmark.png',
-            'uncheck': 'https://img.icons8.com/material-outlined/24/000000/cancel.png',
-        }
         super(Button, self).__init__('Button', position, parent, class_name)
 
     def _setup(self):
@@ -275,7 +952,7 @@ class Button(Element):
         if self.icon_name:
             self.icon = Image(src=self.icon_url_dict[self.icon_name],
                               class_name='btn_icon', maintain_aspect=True,
-                              alt_text=self.icon_name)
+                              size=self.icon_size, alt_text=self.icon_name)
 
             self.add_child(self.icon, position=(0.9, 0.5))
 
@@ -292,9 +969,63 @@ class Button(Element):
         """Add the element and its children to the app."""
         app.add_button(self)
 
-    @eel.expose
-    def on_press(self):
-        """Callback function to execute when the button is pressed."""
+    @property
+    def button_text(self):
+        """Get the text displayed inside the button."""
+        return self._button_text
+
+    @button_text.setter
+    def button_text(self, button_text):
+        """Set the text displayed inside the button."""
+        self._button_text = button_text
+        if hasattr(self, 'paragraph'):
+            self.paragraph.text = button_text
+
+    @classmethod
+    def prefetch_icons(cls, icon_names=None, **kwargs):
+        """Download and decode button icons concurrently.
+
+        Buttons created afterwards pick up the prefetched icons from the
+        asset and variant caches.
+
+        Parameters
+        ----------
+        icon_names: iterable, optional
+            The names of the icons to prefetch, all the icons by default.
+        **kwargs
+            Keyword arguments passed to
+            :func:`electripy.imaging.prefetch_images`.
+
+        Returns
+        -------
+        dict
+            The result of :func:`electripy.imaging.prefetch_images`.
+        """
+        icon_names = ICON_URLS if icon_names is None else icon_names
+        return prefetch_images([ICON_URLS[name] for name in icon_names],
+                               size=cls.icon_size, maintain_aspect=True,
+                               **kwargs)
+
+    def _event_handler(self, event_type):
+        """Get the handler of the button for a type of events."""
+        if event_type == PRESS and self.press_callback:
+            if inspect.iscoroutinefunction(self.press_callback):
+                return self._on_press_async
+            return self.on_press
+        return None
+
+    async def _on_press_async(self, event=None):
+        """Await the coroutine callback of the button."""
+        await self.press_callback()
+
+    def on_press(self, event=None):
+        """Callback function to execute when the button is pressed.
+
+        Parameters
+        ----------
+        event: :class: `Event`, optional
+            The press event dispatched by the event bus.
+        """
         if self.press_callback:
             self.press_callback()
 
@@ -302,6 +1033,8 @@ class Button(Element):
 class Paragraph(Element):
     """Class to represent a paragraph."""
 
+    __slots__ = ('_text', 'font_size')
+
     def __init__(self, text, font_size=10, position=(0, 0), parent=None, class_name=None):
         """Initialize the paragraph class.
 
@@ -318,9 +1051,7 @@ class Paragraph(Element):
         class_name: str, optional
             The class name of the paragraph.
         """
-        self._text = str()
-        self.text = text
-
+        self._text = text
         self.font_size = font_size
 
         super(Paragraph, self).__init__(
@@ -344,15 +1075,126 @@ class Paragraph(Element):
 
     @text.setter
     def text(self, text):
-        self._text = text
+        with self._change_lock():
+            if self._mounted:
+                if text == self._text:
+                    return
+                get_change_tracker().record_text(self)
+
+            self._text = text
+        self._changed()
+
+    def _get_payload(self):
+        """Get the payload of the paragraph sent to the frontend."""
+        payload = super(Paragraph, self)._get_payload()
+        payload['text'] = self.text
+        return payload
+
+
+def _split_lines(text):
+    """Split a text into its lines, none for an empty text."""
+    return text.split('\n') if text else []
+
+
+class ConsoleParagraph(Paragraph):
+    """Class to represent a paragraph of lines appended to, like a console.
+
+    The lines are kept in a ring buffer of `max_lines` lines, the oldest
+    lines dropping off as new ones are appended. Appending sends only the
+    appended lines to the frontend, so memory and the cost of an append do
+    not depend on how long the paragraph has been written to.
+    """
+
+    __slots__ = ('_lines', 'max_lines')
+
+    def __init__(self, text='', max_lines=1000, font_size=10,
+                 position=(0, 0), parent=None, class_name=None):
+        """Initialize the console paragraph class.
+
+        Parameters
+        ----------
+        text: str, optional
+            Initial text to display, split into lines.
+        max_lines: int, optional
+            The maximum number of lines kept and displayed.
+        font_size: int, optional
+            Size of the text in pixels
+        position: tuple, optional
+            The position of the paragraph.
+        parent: :class: `Element`, optional
+            The parent element.
+        class_name: str, optional
+            The class name of the paragraph.
+        """
+        if max_lines < 1:
+            raise ValueError('max_lines must be at least 1.')
+
+        self.max_lines = max_lines
+        self._lines = deque(_split_lines(text), maxlen=max_lines)
+        self.font_size = font_size
+
+        super(Paragraph, self).__init__(
+            'ConsoleParagraph', position, parent, class_name)
+
+    def _setup(self):
+        """Setup this UI element."""
+        super(ConsoleParagraph, self)._setup()
+        self.add_style({'white-space': 'pre-wrap'})
+        self.set_attribute('data-max-lines', self.max_lines)
+
+    @property
+    def lines(self):
+        """Get a copy of the lines of the paragraph, oldest first."""
+        return list(self._lines)
+
+    @property
+    def text(self):
+        return '\n'.join(self._lines)
+
+    @text.setter
+    def text(self, text):
+        lines = _split_lines(text)[-self.max_lines:]
+        with self._change_lock():
+            if self._mounted:
+                if lines == list(self._lines):
+                    return
+                get_change_tracker().record_text(self)
+
+            self._lines.clear()
+            self._lines.extend(lines)
+        self._changed()
+
+    def append(self, text):
+        """Append lines to the paragraph, only sending them to the frontend.
+
+        Parameters
+        ----------
+        text: str
+            The appended text, one line per line of the text.
+        """
+        lines = text.split('\n')[-self.max_lines:]
+        with self._change_lock():
+            if self._mounted:
+                get_change_tracker().record_append(self, lines,
+                                                   self.max_lines)
+
+            self._lines.extend(lines)
+        self._changed()
+
+    def _cloned(self, source):
+        """Give the clone a ring buffer of its own."""
+        self._lines = deque(source._lines, maxlen=source.max_lines)
 
 
 class Image(Element):
     """Class to represent an image."""
 
+    __slots__ = ('src', 'is_url', 'maintain_aspect', 'size', 'lazy',
+                 'alt_text', '_img_data', '_img_path')
+
     def __init__(self, src, maintain_aspect=True, size=(100, 50),
                  alt_text=None, position=(0, 0), parent=None,
-                 class_name=None):
+                 class_name=None, lazy=False):
         """Initialize the image class.
 
         Parameters
@@ -371,14 +1213,20 @@ class Image(Element):
             The parent element.
         class_name: str, optional
             The class name of the image.
+        lazy: bool, optional
+            Whether to defer decoding the image until `img_data` is
+            first accessed. Only the header of the image is read on
+            construction.
         """
         self._img_data = None
+        self._img_path = None
 
         self.src = src
-        self.is_url = 'http' in self.src.lower() or 'https' in self.src.lower()
+        self.is_url = is_url(self.src)
 
         self.maintain_aspect = maintain_aspect
         self.size = size
+        self.lazy = lazy
 
         self.alt_text = alt_text or ''
 
@@ -386,41 +1234,335 @@ class Image(Element):
 
     def _setup(self):
         """Setup the Image UI element."""
-        if self.is_url:
-            img_path = os.path.join(
-                os.getcwd(),
-                f"{self.attributes['id']}.{os.path.basename(self.src).split('.')[-1]}")
+        self._img_path = resolve_source(self.src)
+        self.size = fit_size(read_size(self._img_path), self.size,
+                             self.maintain_aspect)
+        self.add_style({'width': f'{self.size[0]}px',
+                        'height': f'{self.size[1]}px'})
 
-            urlretrieve(self.src, img_path)
-            self.img_data = PILImage.open(img_path)
-        else:
-            self.img_data = PILImage.open(self.src)
+        if not self.lazy:
+            self.img_data = self._load_img_data()
+
+        self._attributes['alt'] = self.alt_text
+        self._attributes['src'] = self.src
+
+    def _get_element_tree(self):
+        """Get the element tree."""
+        return {self: self.children}
+
+    def _add_to_app(self, app):
+        """Add the element and its children to the app."""
+        app.add_image(self)
+
+    def _load_img_data(self):
+        """Get the resized image from the shared variant cache."""
+        return get_variant_cache().get(self._img_path, self.size,
+                                       self.maintain_aspect)
+
+    def send_pixels(self, pixels=None, rect=None, channel=None):
+        """Send raw pixel data of the image over the binary frame channel.
+
+        Parameters
+        ----------
+        pixels: array_like, optional
+            The ``(height, width[, channels])`` uint8 pixels of the image,
+            `img_data` by default. NumPy arrays and memoryviews are sent
+            without being copied.
+        rect: tuple, optional
+            The ``(x, y, width, height)`` rectangle to update, the whole
+            image by default.
+        channel: :class: `FrameChannel`, optional
+            The channel to send the frame over, the one of the UI by default.
+
+        Returns
+        -------
+        int
+            The sequence number of the frame.
+        """
+        channel = channel or get_frame_channel()
+        return channel.send_frame(
+            self, self.img_data if pixels is None else pixels, rect)
+
+    @property
+    def img_data(self):
+        if self._img_data is None and self._img_path is not None:
+            self._img_data = self._load_img_data()
+        return self._img_data
+
+    @img_data.setter
+    def img_data(self, img_data):
+        self._img_data = img_data
+
+
+class StreamImage(Image):
+    """Class to represent an image fed by a stream of frames.
+
+    Frames are NumPy arrays pushed from any thread without blocking. They
+    are queued in a bounded queue, converted and resized on a worker
+    thread, and sent to the UI over the binary frame channel. The worker
+    is started by the first frame and stopped by :meth:`close` or once
+    the image is garbage collected.
+    """
+
+    __slots__ = ('channel', 'stream', '_requested_size', '_frame_shape')
+
+    def __init__(self, source=None, maintain_aspect=True, size=(100, 50),
+                 alt_text=None, position=(0, 0), parent=None,
+                 class_name=None, max_frames=2, drop_policy=LATEST,
+                 channel=None, on_error=None):
+        """Initialize the stream image class.
+
+        Parameters
+        ----------
+        source: array_like or iterable, optional
+            A frame, or an iterator or asynchronous iterator of frames fed
+            into the stream, see :meth:`feed`.
+        maintain_aspect: bool, optional
+            Whether to maintain the aspect ratio of the frames.
+        size: tuple, optional
+            The size of the image.
+        alt_text: str, optional
+            The alt text of the image.
+        position: tuple, optional
+            The position of the image.
+        parent: :class: `Element`, optional
+            The parent element.
+        class_name: str, optional
+            The class name of the image.
+        max_frames: int, optional
+            The maximum number of frames waiting to be converted.
+        drop_policy: str, optional
+            Either ``latest`` to only keep the most recent frame, or
+            ``drop-oldest`` to drop the oldest frame when the queue is full.
+        channel: :class: `FrameChannel`, optional
+            The channel to send the frames over, the one of the UI by
+            default.
+        on_error: callable, optional
+            Function called with the frame and the exception of every
+            frame that failed to be converted or sent.
+        """
+        self._img_data = None
+        self._img_path = None
+
+        self.src = ''
+        self.is_url = False
 
-        if self.maintain_aspect:
-            _width, _height = self.img_data.size
-            _ratio = _width / _height
+        self.maintain_aspect = maintain_aspect
+        self.size = tuple(size)
+        self.lazy = False
+
+        self.alt_text = alt_text or ''
+        self.channel = channel
+
+        self._requested_size = self.size
+        self._frame_shape = None
+        self.stream = FrameStream(self._convert_frame, self._show_frame,
+                                  max_frames, drop_policy, on_error)
+
+        super(Image, self).__init__('StreamImage', position, parent,
+                                    class_name)
+
+        if source is not None:
+            self.feed(source)
+
+    def _setup(self):
+        """Setup the StreamImage UI element."""
+        self.add_style({'width': f'{self.size[0]}px',
+                        'height': f'{self.size[1]}px'})
+        self._attributes['alt'] = self.alt_text
 
-            _new_width = self.size[0]
-            _new_height = self.size[1]
+    def push(self, frame):
+        """Queue a frame without blocking.
 
-            if _ratio > 1:
-                _new_height = int(_new_width / _ratio)
+        Parameters
+        ----------
+        frame: array_like
+            The ``(height, width[, channels])`` frame. Floating point
+            frames are expected in the ``[0, 1]`` range.
+        """
+        self.stream.push(frame)
+
+    def feed(self, source):
+        """Feed a frame or the frames of an iterator into the stream.
+
+        Iterators are consumed on a feeder thread and asynchronous
+        iterators on an event loop of their own, use :meth:`feed_async`
+        to consume them on a running loop instead.
+
+        Parameters
+        ----------
+        source: array_like or iterable
+            A frame, or an iterator or asynchronous iterator of frames.
+
+        Returns
+        -------
+        :class: `threading.Thread`
+            The feeder thread, None for a single frame.
+        """
+        if isinstance(source, np.ndarray):
+            self.push(source)
+            return None
+        if hasattr(source, '__aiter__'):
+            return self.stream.feed_async_in_thread(source)
+        return self.stream.feed(source)
+
+    async def feed_async(self, frames):
+        """Feed the frames of an asynchronous iterator into the stream.
+
+        Parameters
+        ----------
+        frames: async iterable
+            The frames.
+        """
+        await self.stream.feed_async(frames)
+
+    def wait(self, timeout=None):
+        """Wait until every queued frame is shown.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The maximum number of seconds to wait.
+        """
+        return self.stream.wait(timeout)
+
+    def close(self):
+        """Stop the worker thread of the stream."""
+        self.stream.close()
+
+    def _convert_frame(self, frame):
+        """Convert a frame, fitting the size on the first frame only."""
+        frame = np.asarray(frame)
+        if frame.shape[:2] != self._frame_shape:
+            self._frame_shape = frame.shape[:2]
+            self.size = fit_size(self._frame_shape[::-1],
+                                 self._requested_size, self.maintain_aspect)
+            style_dict = {'width': f'{self.size[0]}px',
+                          'height': f'{self.size[1]}px'}
+            queue = active_mutation_queue()
+            if queue is not None:
+                queue.post(self.add_style, style_dict)
             else:
-                _new_width = int(_new_height * _ratio)
+                self.add_style(style_dict)
+
+        return convert_frame(frame, self.size)
+
+    def _get_state(self):
+        """Get the state of the image, without its stream and channel."""
+        state = super(StreamImage, self)._get_state()
+        stream = state.pop('stream')
+        state['stream'] = (stream.queue.maxsize, stream.queue.drop_policy,
+                           stream.on_error)
+        state['channel'] = None
+        return state
+
+    def _set_state(self, state):
+        """Restore the image from its state, with a frame stream of its own."""
+        max_frames, drop_policy, on_error = state.pop('stream')
+        super(StreamImage, self)._set_state(state)
+        self.stream = FrameStream(self._convert_frame, self._show_frame,
+                                  max_frames, drop_policy, on_error)
+
+    def _cloned(self, source):
+        """Give the clone a frame stream of its own."""
+        self.stream = FrameStream(self._convert_frame, self._show_frame,
+                                  source.stream.queue.maxsize,
+                                  source.stream.queue.drop_policy,
+                                  source.stream.on_error)
+
+    def _show_frame(self, pixels):
+        """Keep a converted frame and send it to the UI."""
+        self.img_data = pixels
+        self.send_pixels(pixels, channel=self.channel)
+
+
+def _create_text_row(item):
+    """Create the default row of a virtual container, a paragraph."""
+    return Paragraph(text=str(item))
+
+
+def _update_text_row(row, item):
+    """Recycle the default row of a virtual container for another item."""
+    row.text = str(item)
+
+
+class VirtualList(Element):
+    """Class to represent a scrollable list only rendering its visible rows.
+
+    Items are read from a data source, either a sequence or a callable
+    taking the index of an item. Only the rows of the visible window,
+    extended by `overscan` rows on both sides, exist as elements: rows
+    scrolled out of the window are recycled for the rows scrolled into it,
+    so memory and the cost of a scroll do not depend on the number of
+    items.
+    """
 
-            self.img_data = self.img_data.resize((_new_width, _new_height))
+    __slots__ = ('data', 'length', 'create_row', 'update_row', 'size',
+                 'item_size', 'columns', 'overscan', 'offset', '_rows',
+                 '_content_height')
 
-            self.size = (_new_width, _new_height)
-            self.add_style({'width': f'{_new_width}px',
-                            'height': f'{_new_height}px'})
-        else:
-            self.add_style({'width': f'{self.size[0]}px',
-                            'height': f'{self.size[1]}px'})
+    def __init__(self, data, create_row=None, update_row=None,
+                 row_height=20, size=(300, 400), overscan=5, length=None,
+                 position=(0, 0), parent=None, class_name=None):
+        """Initialize the virtual list class.
 
-            self.img_data = self.img_data.resize(self.size)
+        Parameters
+        ----------
+        data: sequence or callable
+            The items, or a function returning the item at an index.
+        create_row: callable, optional
+            Function creating the row element of an item, a paragraph
+            showing the item by default.
+        update_row: callable, optional
+            Function called with a recycled row element and the item it
+            now shows. Required along with a custom `create_row`.
+        row_height: int, optional
+            The height of every row in pixels.
+        size: tuple, optional
+            The size of the visible area of the list.
+        overscan: int, optional
+            The number of rows rendered above and below the visible area.
+        length: int, optional
+            The number of items of a callable data source.
+        position: tuple, optional
+            The position of the list.
+        parent: :class: `Element`, optional
+            The parent element.
+        class_name: str, optional
+            The class name of the list.
+        """
+        self._init_window(data, length, create_row, update_row, size,
+                          (size[0], row_height), 1, overscan)
+        super(VirtualList, self).__init__('VirtualList', position, parent,
+                                          class_name)
+
+    def _init_window(self, data, length, create_row, update_row, size,
+                     item_size, columns, overscan):
+        """Set the data source and the geometry of the container."""
+        if create_row is not None and update_row is None:
+            raise ValueError('update_row is required to recycle the rows '
+                             'of a custom create_row.')
+        if callable(data) and length is None:
+            raise ValueError('length is required for a callable data source.')
+
+        self.data = data
+        self.length = length
+        self.create_row = create_row or _create_text_row
+        self.update_row = update_row or _update_text_row
+        self.size = tuple(size)
+        self.item_size = tuple(int(value) for value in item_size)
+        self.columns = max(int(columns), 1)
+        self.overscan = overscan
+        self.offset = 0
+        self._rows = {}
+        self._content_height = 0
 
-        self.attributes['alt'] = self.alt_text
-        self.attributes['src'] = self.src
+    def _setup(self):
+        """Setup the VirtualList UI element."""
+        self.add_style({'width': f'{self.size[0]}px',
+                        'height': f'{self.size[1]}px',
+                        'overflow-y': 'auto'})
+        self.scroll_to(0)
 
     def _get_element_tree(self):
         """Get the element tree."""
@@ -428,12 +1570,198 @@ class Image(Element):
 
     def _add_to_app(self, app):
         """Add the element and its children to the app."""
-        app.add_image(self)
+        app.add_virtual_list(self)
 
     @property
-    def img_data(self):
-        return self._img_data
+    def item_count(self):
+        """Get the number of items of the data source."""
+        if self.length is not None:
+            return self.length
+        return len(self.data)
+
+    def _item(self, idx):
+        """Get the item at an index of the data source."""
+        if callable(self.data):
+            return self.data(idx)
+        return self.data[idx]
 
-    @img_data.setter
-    def img_data(self, img_data):
-        self._img_data = img_data
+    @property
+    def visible_range(self):
+        """Get the range of the indices of the rendered items."""
+        length = self.item_count
+        columns = self.columns
+        item_height = self.item_size[1]
+        first = max(self.offset // item_height - self.overscan, 0)
+        last = -(-(self.offset + self.size[1]) // item_height) + self.overscan
+        return range(min(first * columns, length),
+                     min(last * columns, length))
+
+    @property
+    def rows(self):
+        """Get the rendered row elements keyed on the index of their item."""
+        return dict(self._rows)
+
+    def _place(self, idx, content_height):
+        """Get the position of the row of an item in the content area."""
+        item_width, item_height = self.item_size
+        row, column = divmod(idx, self.columns)
+        return (column * item_width, content_height - (row + 1) * item_height)
+
+    def scroll_to(self, offset):
+        """Scroll the container, rendering the items of the new window.
+
+        Rows of the items leaving the window are recycled for the items
+        entering it, so only the rows of the window are ever created.
+
+        Parameters
+        ----------
+        offset: int
+            The scroll offset from the top of the content in pixels.
+        """
+        self._render(offset)
+
+    def _render(self, offset, refresh=False):
+        """Render the window at an offset, updating every row if refresh."""
+        item_height = self.item_size[1]
+        content_height = -(-self.item_count // self.columns) * item_height
+        self.offset = min(max(int(offset), 0),
+                          max(content_height - self.size[1], 0))
+        window = self.visible_range
+
+        moved = content_height != self._content_height
+        self._content_height = content_height
+
+        with get_change_tracker().batch():
+            self.set_attribute('data-content-height', content_height)
+
+            rows = {}
+            free = []
+            for idx, row in self._rows.items():
+                if idx in window and not refresh:
+                    rows[idx] = row
+                    if moved:
+                        row.position = self._place(idx, content_height)
+                else:
+                    free.append(row)
+
+            created = []
+            positions = []
+            for idx in window:
+                if idx in rows:
+                    continue
+                item = self._item(idx)
+                position = self._place(idx, content_height)
+                if free:
+                    row = free.pop()
+                    self.update_row(row, item)
+                    row.position = position
+                else:
+                    row = self.create_row(item)
+                    created.append(row)
+                    positions.append(position)
+                rows[idx] = row
+
+            for row in free:
+                self.remove_child(row)
+            if created:
+                self.add_children(created, np.array(positions, dtype=int))
+            self._rows = rows
+
+    def scroll_to_index(self, idx):
+        """Scroll the container so an item is at the top of the window.
+
+        Parameters
+        ----------
+        idx: int
+            The index of the item.
+        """
+        self.scroll_to(idx // self.columns * self.item_size[1])
+
+    def refresh(self):
+        """Render the window again after the data source changed."""
+        self._render(self.offset, refresh=True)
+
+    def _cloned(self, source):
+        """Map the rendered rows of the source to their copies."""
+        copies = dict(zip(source.children, self.children))
+        self._rows = {idx: copies[row] for idx, row in source._rows.items()}
+
+
+class VirtualGrid(VirtualList):
+    """Class to represent a scrollable grid only rendering its visible rows.
+
+    Items are laid out left to right in rows of `columns` cells, see
+    :class: `VirtualList`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, data, create_cell=None, update_cell=None,
+                 cell_size=(100, 100), columns=None, size=(400, 400),
+                 overscan=2, length=None, position=(0, 0), parent=None,
+                 class_name=None):
+        """Initialize the virtual grid class.
+
+        Parameters
+        ----------
+        data: sequence or callable
+            The items, or a function returning the item at an index.
+        create_cell: callable, optional
+            Function creating the cell element of an item, a paragraph
+            showing the item by default.
+        update_cell: callable, optional
+            Function called with a recycled cell element and the item it
+            now shows. Required along with a custom `create_cell`.
+        cell_size: tuple, optional
+            The size of every cell in pixels.
+        columns: int, optional
+            The number of cells of every row, as many as fit in the width
+            of the grid by default.
+        size: tuple, optional
+            The size of the visible area of the grid.
+        overscan: int, optional
+            The number of rows rendered above and below the visible area.
+        length: int, optional
+            The number of items of a callable data source.
+        position: tuple, optional
+            The position of the grid.
+        parent: :class: `Element`, optional
+            The parent element.
+        class_name: str, optional
+            The class name of the grid.
+        """
+        if columns is None:
+            columns = size[0] // cell_size[0]
+        self._init_window(data, length, create_cell, update_cell, size,
+                          cell_size, columns, overscan)
+        super(VirtualList, self).__init__('VirtualGrid', position, parent,
+                                          class_name)
+
+    def _add_to_app(self, app):
+        """Add the element and its children to the app."""
+        app.add_virtual_grid(self)
+
+
+@eel.expose
+def scroll_virtual(element_id, offset):
+    """Scroll a virtual list or grid from the UI.
+
+    While another thread owns the mutation queue of the UI, the scroll is
+    posted to it and applied by the owner.
+
+    Parameters
+    ----------
+    element_id: str
+        The id of the container.
+    offset: int
+        The scroll offset from the top of the content in pixels.
+    """
+    element = get_element(element_id)
+    if not isinstance(element, VirtualList):
+        return
+
+    queue = active_mutation_queue()
+    if queue is not None:
+        queue.post(element.scroll_to, offset)
+    else:
+        element.scroll_to(offset)
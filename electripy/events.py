@@ -0,0 +1,390 @@
+"""Module for routing the events of the UI to the handlers of the elements.
+
+The UI sends events as ``[element_id, event_type, detail]`` lists, batched
+into one message per frame, to the exposed ``dispatch_events`` function.
+Every event is resolved to its element through the registry and handed to
+the handlers registered for its type, on a thread pool so slow handlers
+never stall the loop receiving the messages. Coroutine handlers run on
+the asyncio loop of the UI instead, see :mod:`electripy.aio`.
+"""
+import asyncio
+import inspect
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import eel
+
+from electripy.aio import get_async_bridge
+from electripy.mutations import active_mutation_queue, lending_queue
+from electripy.registry import get_element
+
+PRESS = 'press'
+DEFAULT_WORKERS = 4
+
+
+class Event:
+    """Event of the UI targeting an element.
+
+    Attributes
+    ----------
+    element : :class: `Element`
+        The target element.
+    type : str
+        The type of the event, e.g. ``press``.
+    detail : object
+        The JSON payload sent along with the event, if any.
+    timestamp : float
+        The monotonic time the event was received at.
+    """
+
+    __slots__ = ('element', 'type', 'detail', 'timestamp')
+
+    def __init__(self, element, event_type, detail=None, timestamp=None):
+        """Initialize the event.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The target element.
+        event_type : str
+            The type of the event.
+        detail : object, optional
+            The payload of the event.
+        timestamp : float, optional
+            The monotonic time the event was received at, now by default.
+        """
+        self.element = element
+        self.type = event_type
+        self.detail = detail
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+
+    def __repr__(self):
+        """Return the representation of the event."""
+        return f'Event({self.element.id!r}, {self.type!r}, {self.detail!r})'
+
+
+def _run_handler(handler, event):
+    """Run a handler, changing the UI through the owner of its queue."""
+    queue = active_mutation_queue()
+    if queue is None or lending_queue() is queue:
+        return handler(event)
+    with queue.lending():
+        return handler(event)
+
+
+def _run_inline(func, *args):
+    """Run a function right away, wrapping its outcome into a future."""
+    future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+class EventBus:
+    """Routes the events of the UI to the handlers of their elements.
+
+    Handlers registered with :meth:`on` are called with the
+    :class: `Event`, after the handler the element itself returns from
+    ``_event_handler``, so subclasses such as `Button` handle their own
+    events. Handlers are only weakly tied to their elements and are
+    dropped along with them. Coroutine functions are run on the asyncio
+    loop of the UI, where any number of them can await I/O concurrently.
+    While a thread owns the mutation queue of the UI, see
+    :func:`active_mutation_queue`, other handlers run on that thread too.
+
+    Attributes
+    ----------
+    max_workers : int
+        The number of threads running the handlers, 0 to run them on the
+        dispatching thread.
+    on_error : callable
+        Function called with the event and the exception of every failed
+        handler.
+    dispatched : int
+        The number of events dispatched to at least one handler.
+    unhandled : int
+        The number of events without a live element or a handler.
+    errors : int
+        The number of handlers that raised an exception.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, on_error=None):
+        """Initialize the event bus.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            The number of threads running the handlers, 0 to run them on
+            the dispatching thread.
+        on_error : callable, optional
+            Function called with the event and the exception of every
+            failed handler.
+        """
+        self.max_workers = max_workers
+        self.on_error = on_error
+
+        self.dispatched = 0
+        self.unhandled = 0
+        self.errors = 0
+
+        self._handlers = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __enter__(self):
+        """Use the event bus as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Wait for the running handlers and stop the thread pool."""
+        self.shutdown()
+
+    def on(self, element, event_type, handler):
+        """Register a handler of the events of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The target element.
+        event_type : str
+            The type of the events.
+        handler : callable
+            Function called with every :class: `Event`.
+        """
+        with self._lock:
+            handlers = self._handlers.setdefault(element, {})
+            handlers[event_type] = (*handlers.get(event_type, ()), handler)
+
+    def off(self, element, event_type=None, handler=None):
+        """Unregister the handlers of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The target element.
+        event_type : str, optional
+            The type of the events, all types by default.
+        handler : callable, optional
+            The handler to unregister, all of them by default.
+        """
+        with self._lock:
+            handlers = self._handlers.get(element)
+            if handlers is None:
+                return
+
+            for _type in ([event_type] if event_type is not None
+                          else list(handlers)):
+                kept = tuple(_handler for _handler in handlers.get(_type, ())
+                             if handler is not None and _handler != handler)
+                if kept:
+                    handlers[_type] = kept
+                else:
+                    handlers.pop(_type, None)
+
+    def handlers(self, element, event_type):
+        """Get the handlers of the events of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The target element.
+        event_type : str
+            The type of the events.
+        """
+        handlers = self._handlers.get(element)
+        return handlers.get(event_type, ()) if handlers else ()
+
+    def _submit(self, handler, event):
+        """Run a handler on the asyncio loop, the thread pool or inline.
+
+        While another thread owns the mutation queue of the UI, handlers
+        borrow its ownership for every change they make, see
+        :meth:`MutationQueue.lending`, and coroutine handlers for every
+        step. They never run on the owner, so slow handlers do not hold
+        off its updates.
+        """
+        if inspect.iscoroutinefunction(handler):
+            coro = handler(event)
+            queue = active_mutation_queue()
+            if queue is not None:
+                coro = queue.as_owner(coro)
+            future = get_async_bridge().submit(coro)
+        elif not self.max_workers:
+            future = _run_inline(_run_handler, handler, event)
+        else:
+            if self._executor is None:
+                with self._lock:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix='electripy-events')
+            future = self._executor.submit(_run_handler, handler, event)
+
+        future.add_done_callback(
+            lambda _future: self._handled(event, _future))
+        return future
+
+    def _handled(self, event, future):
+        """Count and report the exception of a handler, if any."""
+        error = future.exception()
+        if error is not None:
+            with self._lock:
+                self.errors += 1
+            if self.on_error is not None:
+                self.on_error(event, error)
+
+    def dispatch(self, element_id, event_type, detail=None, timestamp=None):
+        """Dispatch an event of the UI to the handlers of its element.
+
+        Parameters
+        ----------
+        element_id : str
+            The id of the target element.
+        event_type : str
+            The type of the event.
+        detail : object, optional
+            The payload of the event.
+        timestamp : float, optional
+            The monotonic time the event was received at, now by default.
+
+        Returns
+        -------
+        list
+            The :class: `concurrent.futures.Future` of every handler.
+        """
+        element = get_element(element_id)
+        if element is None:
+            self.unhandled += 1
+            return []
+
+        handlers = self.handlers(element, event_type)
+        own_handler = element._event_handler(event_type)
+        if own_handler is not None:
+            handlers = (own_handler, *handlers)
+        if not handlers:
+            self.unhandled += 1
+            return []
+
+        event = Event(element, event_type, detail, timestamp)
+        self.dispatched += 1
+        return [self._submit(handler, event) for handler in handlers]
+
+    def dispatch_batch(self, events):
+        """Dispatch a batch of events received in one message.
+
+        Parameters
+        ----------
+        events : iterable
+            The ``[element_id, event_type]`` or ``[element_id, event_type,
+            detail]`` lists of the events, in the order they happened.
+
+        Returns
+        -------
+        list
+            The futures of the handlers of all the events.
+        """
+        timestamp = time.monotonic()
+        futures = []
+        for event in events:
+            futures.extend(self.dispatch(*event[:3], timestamp=timestamp))
+        return futures
+
+    async def wait_for(self, element, event_type, timeout=None):
+        """Wait for the next event of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The target element.
+        event_type : str
+            The type of the event.
+        timeout : float, optional
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        :class: `Event`
+            The event.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        def _resolve(event):
+            if not waiter.done():
+                waiter.set_result(event)
+
+        def _handler(event):
+            loop.call_soon_threadsafe(_resolve, event)
+
+        self.on(element, event_type, _handler)
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        finally:
+            self.off(element, event_type, _handler)
+
+    def shutdown(self, wait=True):
+        """Stop the thread pool, it is started again on the next dispatch.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait for the running handlers.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_event_bus = None
+
+
+def get_event_bus():
+    """Get the event bus of the UI."""
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = EventBus()
+    return _event_bus
+
+
+def set_event_bus(event_bus):
+    """Set the event bus of the UI.
+
+    Parameters
+    ----------
+    event_bus : :class: `EventBus`
+        The event bus to use.
+    """
+    global _event_bus
+    _event_bus = event_bus
+
+
+async def wait_for_event(element, event_type, timeout=None):
+    """Wait for the next event of an element, see :meth:`EventBus.wait_for`.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The target element.
+    event_type : str
+        The type of the event.
+    timeout : float, optional
+        The maximum number of seconds to wait.
+    """
+    return await get_event_bus().wait_for(element, event_type, timeout)
+
+
+@eel.expose
+def dispatch_events(events):
+    """Dispatch a batch of events sent by the UI.
+
+    Parameters
+    ----------
+    events : list
+        The ``[element_id, event_type, detail]`` lists of the events.
+    """
+    get_event_bus().dispatch_batch(events)
@@ -0,0 +1,376 @@
+"""Module for decoding and resizing the image data of the elements."""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+
+import numpy as np
+from PIL import Image as PILImage
+
+from electripy.cache import get_asset_cache
+
+REDUCING_GAP = 2.0
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+DEFAULT_PREFETCH_WORKERS = 8
+MAX_DIGESTS = 4096
+
+_digests = OrderedDict()
+_digests_lock = threading.Lock()
+
+
+def is_url(src):
+    """Check whether an image source is a URL.
+
+    Parameters
+    ----------
+    src : str
+        The source of the image.
+    """
+    return 'http' in src.lower() or 'https' in src.lower()
+
+
+def resolve_source(src):
+    """Get the local path of an image source.
+
+    URLs are fetched through the asset cache.
+
+    Parameters
+    ----------
+    src : str
+        The source of the image.
+    """
+    if is_url(src):
+        return get_asset_cache().fetch(src)
+    return src
+
+
+def fit_size(source_size, size, maintain_aspect=True):
+    """Get the size an image is displayed at.
+
+    Parameters
+    ----------
+    source_size : tuple
+        The size of the source image.
+    size : tuple
+        The requested size.
+    maintain_aspect : bool, optional
+        Whether to maintain the aspect ratio of the source image.
+
+    Returns
+    -------
+    tuple
+        The target size of the image.
+    """
+    if not maintain_aspect:
+        return tuple(size)
+
+    _width, _height = source_size
+    _ratio = _width / _height
+
+    _new_width = size[0]
+    _new_height = size[1]
+
+    if _ratio > 1:
+        _new_height = int(_new_width / _ratio)
+    else:
+        _new_width = int(_new_height * _ratio)
+
+    return _new_width, _new_height
+
+
+def read_size(path):
+    """Get the size of an image by only reading its header.
+
+    Parameters
+    ----------
+    path : str
+        The path of the image.
+    """
+    with PILImage.open(path) as img:
+        return img.size
+
+
+def decode_image(path, size):
+    """Decode an image at the given size.
+
+    JPEG images are decoded at a reduced scale through
+    :meth:`PIL.Image.Image.draft` and other formats are shrunk by an integer
+    factor with :meth:`PIL.Image.Image.reduce` before resampling, whenever
+    the target size is much smaller than the source.
+
+    Parameters
+    ----------
+    path : str
+        The path of the image.
+    size : tuple
+        The target size of the image.
+
+    Returns
+    -------
+    :class: `PIL.Image.Image`
+        The decoded and resized image.
+    """
+    with PILImage.open(path) as img:
+        img.draft(None, (int(size[0] * REDUCING_GAP),
+                         int(size[1] * REDUCING_GAP)))
+        return img.resize(tuple(size), reducing_gap=REDUCING_GAP)
+
+
+def source_digest(path):
+    """Get the digest of the content of an image file.
+
+    Digests are memoized per path, modification time and file size, so
+    the file is only hashed again after it has changed. The memo keeps
+    the ``MAX_DIGESTS`` most recently used digests.
+
+    Parameters
+    ----------
+    path : str
+        The path of the image.
+    """
+    _stat = os.stat(path)
+    _memo_key = (os.path.realpath(path), _stat.st_mtime_ns, _stat.st_size)
+
+    with _digests_lock:
+        digest = _digests.get(_memo_key)
+        if digest is not None:
+            _digests.move_to_end(_memo_key)
+    if digest is None:
+        with open(path, 'rb') as img_file:
+            digest = sha256(img_file.read()).hexdigest()
+        with _digests_lock:
+            _digests[_memo_key] = digest
+            while len(_digests) > MAX_DIGESTS:
+                _digests.popitem(last=False)
+
+    return digest
+
+
+def image_nbytes(img):
+    """Get the approximate size of the pixel buffer of an image in bytes.
+
+    Parameters
+    ----------
+    img : :class: `PIL.Image.Image`
+        The image.
+    """
+    return img.width * img.height * len(img.getbands())
+
+
+def convert_frame(frame, size):
+    """Convert a frame into uint8 pixels of the given size.
+
+    Floating point frames are expected in the ``[0, 1]`` range, other
+    frames are clipped to ``[0, 255]``. Frames already at the target size
+    are not resampled.
+
+    Parameters
+    ----------
+    frame : array_like
+        The ``(height, width[, channels])`` frame.
+    size : tuple
+        The ``(width, height)`` target size.
+
+    Returns
+    -------
+    :class: `numpy.ndarray`
+        The ``(height, width[, channels])`` uint8 pixels.
+    """
+    pixels = np.asarray(frame)
+    if pixels.dtype != np.uint8:
+        if np.issubdtype(pixels.dtype, np.floating):
+            pixels = pixels * 255
+        pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+
+    if pixels.ndim == 3 and pixels.shape[2] == 1:
+        pixels = pixels[:, :, 0]
+
+    if pixels.shape[1::-1] != tuple(size):
+        pixels = np.asarray(PILImage.fromarray(pixels).resize(
+            tuple(size), reducing_gap=REDUCING_GAP))
+    return pixels
+
+
+class VariantCache:
+    """In-memory LRU cache of decoded and resized images.
+
+    Variants are keyed on the digest of the source file, the target size
+    and whether the aspect ratio is maintained, so every element showing
+    the same image at the same size shares one pixel buffer. Shared
+    images must not be modified in place, use ``img.copy()`` first.
+
+    Attributes
+    ----------
+    max_bytes : int
+        The memory budget of the cached pixel buffers in bytes.
+    hits : int
+        The number of lookups served from the cache.
+    misses : int
+        The number of lookups that decoded the image.
+    evictions : int
+        The number of variants evicted to stay within ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_BUDGET):
+        """Initialize the variant cache.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            The memory budget of the cached pixel buffers in bytes.
+        """
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+        self._variants = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of cached variants."""
+        return len(self._variants)
+
+    @property
+    def stats(self):
+        """Get the counters of the cache."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'nbytes': self.nbytes,
+            'variants': len(self),
+        }
+
+    def get(self, path, size, maintain_aspect=True):
+        """Get an image decoded and resized to the given size.
+
+        Concurrent lookups of the same variant wait for a single decode.
+
+        Parameters
+        ----------
+        path : str
+            The path of the source image.
+        size : tuple
+            The target size of the image.
+        maintain_aspect : bool, optional
+            Whether the target size maintains the aspect ratio.
+
+        Returns
+        -------
+        :class: `PIL.Image.Image`
+            The shared image.
+        """
+        key = (source_digest(path), tuple(size), maintain_aspect)
+
+        while True:
+            with self._lock:
+                img = self._variants.get(key)
+                if img is not None:
+                    self.hits += 1
+                    self._variants.move_to_end(key)
+                    return img
+
+                event = self._in_flight.get(key)
+                if event is None:
+                    event = self._in_flight[key] = threading.Event()
+                    break
+
+            event.wait()
+
+        try:
+            img = decode_image(path, size)
+            with self._lock:
+                self.misses += 1
+                self._variants[key] = img
+                self.nbytes += image_nbytes(img)
+                self._evict()
+            return img
+        finally:
+            with self._lock:
+                self._in_flight.pop(key).set()
+
+    def clear(self):
+        """Remove all the cached variants."""
+        with self._lock:
+            self._variants.clear()
+            self.nbytes = 0
+
+    def _evict(self):
+        """Evict the least recently used variants above ``max_bytes``."""
+        while self.nbytes > self.max_bytes and len(self._variants) > 1:
+            _, img = self._variants.popitem(last=False)
+            self.nbytes -= image_nbytes(img)
+            self.evictions += 1
+
+
+_variant_cache = None
+
+
+def get_variant_cache():
+    """Get the variant cache shared by the elements."""
+    global _variant_cache
+    if _variant_cache is None:
+        _variant_cache = VariantCache()
+    return _variant_cache
+
+
+def set_variant_cache(variant_cache):
+    """Set the variant cache shared by the elements.
+
+    Parameters
+    ----------
+    variant_cache : :class: `VariantCache`
+        The variant cache to use.
+    """
+    global _variant_cache
+    _variant_cache = variant_cache
+
+
+def prefetch_images(sources, size=(100, 50), maintain_aspect=True,
+                    max_workers=DEFAULT_PREFETCH_WORKERS, wait=True):
+    """Download and decode images concurrently before building a tree.
+
+    Every source is fetched into the asset cache and decoded into the
+    variant cache on a bounded thread pool, so `Image` elements created
+    later with the same source and size find their data ready.
+
+    Parameters
+    ----------
+    sources : iterable
+        The sources (paths or URLs) of the images.
+    size : tuple, optional
+        The size the images are requested at.
+    maintain_aspect : bool, optional
+        Whether the images maintain their aspect ratio.
+    max_workers : int, optional
+        The maximum number of concurrent fetches.
+    wait : bool, optional
+        Whether to block until all the images are ready.
+
+    Returns
+    -------
+    dict
+        The decoded images by source if `wait` is True, else the
+        :class: `concurrent.futures.Future` of every source.
+    """
+    def _prefetch(src):
+        path = resolve_source(src)
+        return get_variant_cache().get(
+            path, fit_size(read_size(path), size, maintain_aspect),
+            maintain_aspect)
+
+    sources = list(dict.fromkeys(sources))
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(sources))),
+        thread_name_prefix='electripy-prefetch')
+    futures = {src: executor.submit(_prefetch, src) for src in sources}
+    executor.shutdown(wait=False)
+
+    if not wait:
+        return futures
+    return {src: future.result() for src, future in futures.items()}
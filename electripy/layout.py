@@ -0,0 +1,347 @@
+"""Module for computing the absolute boxes of the elements of a tree.
+
+Boxes are derived from the ``left``, ``bottom``, ``width`` and ``height``
+styles of the elements, either in pixels or in percentages of the box of
+the parent, the way the browser lays them out. They are ``(x, y, width,
+height)`` tuples in pixels, ``(x, y)`` being the bottom left corner of the
+element relative to the bottom left corner of the viewport.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from electripy.utils import iter_tree
+
+LAYOUT_STYLES = ('left', 'bottom', 'width', 'height')
+
+_VIEWPORT = 0
+_INITIAL_CAPACITY = 64
+
+
+@lru_cache(maxsize=4096)
+def parse_length(value):
+    """Parse a CSS length into its value and whether it is a percentage.
+
+    Parameters
+    ----------
+    value : str
+        The length, e.g. ``10px`` or ``50%``. Other units and missing
+        values are laid out as 0.
+
+    Returns
+    -------
+    tuple
+        The value, in pixels or as a fraction of the parent, and whether
+        it is a percentage.
+    """
+    if not isinstance(value, str):
+        return 0.0, False
+    try:
+        if value.endswith('%'):
+            return float(value[:-1]) / 100, True
+        if value.endswith('px'):
+            return float(value[:-2]), False
+    except ValueError:
+        pass
+    return 0.0, False
+
+
+class LayoutEngine:
+    """Cache of the absolute boxes of the elements of a tree.
+
+    The engine is held by the root of a tree and kept up to date as
+    elements are added, removed or restyled. Every element owns a slot of
+    flat arrays holding its parsed styles and its box; changes only mark
+    slots dirty, and boxes are recomputed on the next query for the dirty
+    subtrees alone, one vectorized step per depth of the tree.
+
+    Attributes
+    ----------
+    root : :class: `Element`
+        The root of the tree.
+    viewport : tuple
+        The ``(width, height)`` the percentages of the root resolve
+        against.
+    """
+
+    def __init__(self, root, viewport=(0, 0)):
+        """Initialize the layout engine with the elements of a tree.
+
+        Parameters
+        ----------
+        root : :class: `Element`
+            The root of the tree.
+        viewport : tuple, optional
+            The ``(width, height)`` the percentages of the root resolve
+            against.
+        """
+        self.root = root
+        self._slots = {}
+        self._elements = [None]
+        self._free = []
+
+        self._parent = np.zeros(_INITIAL_CAPACITY, dtype=np.intp)
+        self._depth = np.zeros(_INITIAL_CAPACITY, dtype=np.intp)
+        self._local = np.zeros((_INITIAL_CAPACITY, 4))
+        self._percent = np.zeros((_INITIAL_CAPACITY, 4), dtype=bool)
+        self._box = np.zeros((_INITIAL_CAPACITY, 4))
+        self._dirty = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+
+        self._levels = None
+        self._ordered = None
+        self._stale = True
+        self.viewport = viewport
+        self.add(root)
+
+    def __len__(self):
+        """Get the number of elements laid out."""
+        return len(self._slots)
+
+    @property
+    def viewport(self):
+        """Get the size the percentages of the root resolve against."""
+        return tuple(self._box[_VIEWPORT, 2:])
+
+    @viewport.setter
+    def viewport(self, viewport):
+        """Set the size the percentages of the root resolve against."""
+        self._box[_VIEWPORT] = (0, 0, *viewport)
+        self._dirty[_VIEWPORT] = True
+        self._stale = True
+
+    def _allocate(self, count):
+        """Get free slots, growing the arrays if needed."""
+        slots = self._free[-count:] if count else []
+        del self._free[len(self._free) - len(slots):]
+
+        start = len(self._elements)
+        end = start + count - len(slots)
+        self._elements.extend([None] * (end - start))
+        slots.extend(range(start, end))
+        if end > len(self._parent):
+            capacity = max(2 * len(self._parent), end)
+            for name in ('_parent', '_depth', '_local', '_percent', '_box',
+                         '_dirty'):
+                array = getattr(self, name)
+                grown = np.zeros((capacity, *array.shape[1:]),
+                                 dtype=array.dtype)
+                grown[:start] = array[:start]
+                setattr(self, name, grown)
+        return slots
+
+    def _parse(self, slots, elements):
+        """Parse the layout styles of elements into their slots."""
+        lengths = [parse_length(_element._style.get(key))
+                   for _element in elements for key in LAYOUT_STYLES]
+        self._local[slots] = np.reshape([value for value, _ in lengths],
+                                        (len(slots), 4))
+        self._percent[slots] = np.reshape([percent for _, percent in lengths],
+                                          (len(slots), 4))
+
+    def add(self, element):
+        """Lay out an element and its descendants.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root of the added subtree, whose parent is laid out.
+        """
+        parent = self._slots.get(element.parent, _VIEWPORT)
+        depth = int(self._depth[parent]) + 1 if parent != _VIEWPORT else 0
+        elements, depths = zip(*iter_tree(element, depth=depth))
+        slots = self._allocate(len(elements))
+
+        _slots = self._slots
+        _elements = self._elements
+        for _element, slot in zip(elements, slots):
+            _slots[_element] = slot
+            _elements[slot] = _element
+        self._parent[slots] = [_slots.get(_element.parent, _VIEWPORT)
+                               for _element in elements]
+        self._depth[slots] = depths
+        self._dirty[slots] = True
+        self._parse(slots, elements)
+
+        self._levels = None
+        self._stale = True
+
+    def remove(self, element):
+        """Stop laying out an element and its descendants.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root of the removed subtree.
+        """
+        for _element, _ in iter_tree(element):
+            slot = self._slots.pop(_element, None)
+            if slot is not None:
+                self._elements[slot] = None
+                self._free.append(slot)
+        self._levels = None
+        self._ordered = None
+
+    def invalidate(self, element):
+        """Parse the styles of an element again and mark its subtree dirty.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The restyled element, ignored if it is not laid out.
+        """
+        slot = self._slots.get(element)
+        if slot is not None:
+            self._parse([slot], [element])
+            self._dirty[slot] = True
+            self._stale = True
+
+    def _sorted_levels(self):
+        """Get the slots of every depth of the tree, root first."""
+        if self._levels is None:
+            slots = np.fromiter(self._slots.values(), dtype=np.intp,
+                                count=len(self._slots))
+            slots = slots[np.argsort(self._depth[slots], kind='stable')]
+            bounds = np.flatnonzero(np.diff(self._depth[slots])) + 1
+            self._levels = np.split(slots, bounds)
+        return self._levels
+
+    def update(self):
+        """Recompute the boxes of the dirty subtrees."""
+        if not self._stale:
+            return
+
+        parent = self._parent
+        dirty = self._dirty
+        box = self._box
+        for slots in self._sorted_levels():
+            dirty[slots] = dirty[slots] | dirty[parent[slots]]
+            slots = slots[dirty[slots]]
+            if not len(slots):
+                continue
+
+            parents = parent[slots]
+            parent_size = box[parents, 2:]
+            scale = np.where(self._percent[slots],
+                             np.concatenate([parent_size, parent_size], 1),
+                             1.0)
+            local = self._local[slots] * scale
+            box[slots, :2] = box[parents, :2] + local[:, :2]
+            box[slots, 2:] = local[:, 2:]
+
+        dirty[:] = False
+        self._ordered = None
+        self._stale = False
+
+    def box(self, element):
+        """Get the absolute box of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The element.
+
+        Returns
+        -------
+        tuple
+            The ``(x, y, width, height)`` box in pixels.
+        """
+        slot = self._slots.get(element)
+        if slot is None:
+            raise ValueError(f'{element.name} is not part of the layout.')
+        self.update()
+        return tuple(self._box[slot].tolist())
+
+    def boxes(self):
+        """Get the absolute boxes of all the elements, keyed on their id."""
+        self.update()
+        slots = list(self._slots.values())
+        return {self._elements[slot].id: tuple(box) for slot, box in
+                zip(slots, self._box[slots].tolist())}
+
+    def _laid_out(self):
+        """Get the slots of all the elements by depth and their edges."""
+        self.update()
+        if self._ordered is None:
+            slots = np.concatenate(self._sorted_levels())
+            box = self._box[slots]
+            self._ordered = (slots, box[:, 0].copy(), box[:, 1].copy(),
+                             box[:, 0] + box[:, 2], box[:, 1] + box[:, 3])
+        return self._ordered
+
+    def _intersecting(self, rect):
+        """Get the slots of the boxes intersecting a rectangle, by depth."""
+        slots, left, bottom, right, top = self._laid_out()
+        x, y, width, height = rect
+        inside = ((left < x + width) & (x < right) &
+                  (bottom < y + height) & (y < top) &
+                  (left < right) & (bottom < top))
+        return slots[inside]
+
+    def query(self, rect):
+        """Get the elements whose boxes intersect a rectangle.
+
+        Parameters
+        ----------
+        rect : tuple
+            The ``(x, y, width, height)`` rectangle in pixels.
+
+        Returns
+        -------
+        list
+            The elements, shallowest first.
+        """
+        return [self._elements[slot] for slot in self._intersecting(rect)]
+
+    def hit_test(self, x, y):
+        """Get the deepest element whose box contains a point.
+
+        Parameters
+        ----------
+        x : float
+            The abscissa of the point from the left of the viewport.
+        y : float
+            The ordinate of the point from the bottom of the viewport.
+
+        Returns
+        -------
+        :class: `Element`
+            The element, None if no box contains the point.
+        """
+        slots, left, bottom, right, top = self._laid_out()
+        slots = slots[(left <= x) & (x < right) & (bottom <= y) & (y < top)]
+        return self._elements[slots[-1]] if len(slots) else None
+
+    def overlaps(self, element):
+        """Get the elements overlapping an element, except its lineage.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The element.
+
+        Returns
+        -------
+        list
+            The elements whose boxes intersect the box of the element,
+            other than its ancestors and descendants, shallowest first.
+        """
+        slot = self._slots.get(element)
+        if slot is None:
+            raise ValueError(f'{element.name} is not part of the layout.')
+
+        lineage = {slot}
+        parent = self._parent[slot]
+        while parent != _VIEWPORT:
+            lineage.add(parent)
+            parent = self._parent[parent]
+
+        found = []
+        for _slot in self._intersecting(self.box(element)):
+            if _slot in lineage:
+                continue
+            ancestor = self._parent[_slot]
+            while ancestor != _VIEWPORT and ancestor != slot:
+                ancestor = self._parent[ancestor]
+            if ancestor != slot:
+                found.append(self._elements[_slot])
+        return found
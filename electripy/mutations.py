@@ -0,0 +1,324 @@
+"""Module for updating the elements of the UI from worker threads.
+
+Elements are not synchronized: worker threads submit their mutations to a
+:class: `MutationQueue`, and the single thread owning the UI drains and
+applies them in order, e.g. the update scheduler on every tick. While the
+queue of the UI is owned, handlers of events keep running on the thread
+pool of the event bus and borrow the ownership for each change they make,
+coroutine handlers for each of their steps.
+"""
+import threading
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from electripy.diff import get_change_tracker
+
+_lending = threading.local()
+
+
+def _assign(element, values):
+    """Assign attributes or properties of an element in one batch."""
+    with element.batch():
+        for key, value in values.items():
+            setattr(element, key, value)
+
+
+class _LentCoroutine:
+    """Awaitable running every step of a coroutine as the owner of a queue."""
+
+    __slots__ = ('_coro', '_queue')
+
+    def __init__(self, coro, queue):
+        self._coro = coro
+        self._queue = queue
+
+    def __await__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def send(self, value):
+        with self._queue.lend():
+            return self._coro.send(value)
+
+    def throw(self, *exc_info):
+        with self._queue.lend():
+            return self._coro.throw(*exc_info)
+
+    def close(self):
+        self._coro.close()
+
+
+async def _run_lent(coro, queue):
+    """Run a coroutine as the owner of a queue, step by step."""
+    return await _LentCoroutine(coro, queue)
+
+
+class MutationQueue:
+    """Queue of mutations of the UI submitted from any thread.
+
+    Submitting appends to a deque without taking a lock, so producers
+    never contend with each other or with the owner. The first thread
+    draining the queue becomes its owner; mutations are applied by the
+    owner alone, in the order they were submitted, inside one batch of
+    the change tracker.
+
+    In debug mode, the owner also owns the change tracker: changes of
+    mounted elements made directly from any other thread raise a
+    `RuntimeError` before they are applied.
+
+    Attributes
+    ----------
+    debug : bool
+        Whether to catch direct mutations from other threads.
+    owner : int
+        The ident of the thread draining the queue, None until claimed.
+    applied : int
+        The number of mutations applied.
+    errors : int
+        The number of mutations that raised an exception.
+    """
+
+    def __init__(self, change_tracker=None, debug=False):
+        """Initialize the mutation queue.
+
+        Parameters
+        ----------
+        change_tracker : :class: `ChangeTracker`, optional
+            The change tracker batching the mutations, the one of the UI
+            by default.
+        debug : bool, optional
+            Whether to catch direct mutations from other threads.
+        """
+        self.change_tracker = change_tracker
+        self.debug = debug
+        self.owner = None
+        self.applied = 0
+        self.errors = 0
+
+        self._mutations = deque()
+
+    def __len__(self):
+        """Get the number of pending mutations."""
+        return len(self._mutations)
+
+    @property
+    def tracker(self):
+        """Get the change tracker batching the mutations."""
+        return self.change_tracker or get_change_tracker()
+
+    def post(self, func, *args, **kwargs):
+        """Queue a mutation from any thread, without waiting for it.
+
+        Parameters
+        ----------
+        func : callable
+            The function applying the mutation.
+        *args, **kwargs
+            The arguments of the function.
+        """
+        self._mutations.append((func, args, kwargs, None))
+
+    def submit(self, func, *args, **kwargs):
+        """Queue a mutation from any thread.
+
+        Parameters
+        ----------
+        func : callable
+            The function applying the mutation.
+        *args, **kwargs
+            The arguments of the function.
+
+        Returns
+        -------
+        :class: `concurrent.futures.Future`
+            The future of the result of the function.
+        """
+        future = Future()
+        self._mutations.append((func, args, kwargs, future))
+        return future
+
+    def assign(self, element, **values):
+        """Queue the assignment of attributes or properties of an element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The element.
+        **values
+            The values of the attributes or properties, e.g. ``text``.
+        """
+        self._mutations.append((_assign, (element, values), {}, None))
+
+    def claim(self):
+        """Make the current thread the owner of the queue.
+
+        Raises
+        ------
+        RuntimeError
+            If another thread owns the queue.
+        """
+        ident = threading.get_ident()
+        if self.owner is None:
+            self.owner = ident
+            if self.debug:
+                self.tracker.owner = ident
+        elif self.owner != ident:
+            raise RuntimeError(
+                'The mutation queue is owned by another thread.')
+
+    @contextmanager
+    def lend(self):
+        """Let the current thread change the UI as the owner for a block.
+
+        The block holds the lock of the change tracker, which the owner
+        also holds while draining, so the two never change elements at
+        the same time. It must not wait for the owner, e.g. on the result
+        of a submitted mutation.
+        """
+        tracker = self.tracker
+        with tracker.lock:
+            previous = tracker.delegate
+            tracker.delegate = threading.get_ident()
+            try:
+                yield
+            finally:
+                tracker.delegate = previous
+
+    @contextmanager
+    def lending(self):
+        """Let the current thread change the UI as the owner, change by change.
+
+        Inside the block, every change of a mounted element made by the
+        thread runs in :meth:`lend`, so the owner is only held off while
+        a change is applied, never while the thread does anything else.
+        """
+        previous = getattr(_lending, 'queue', None)
+        _lending.queue = self
+        try:
+            yield
+        finally:
+            _lending.queue = previous
+
+    def as_owner(self, coro):
+        """Wrap a coroutine so every step of it runs as the owner.
+
+        The steps, from one ``await`` to the next, run in :meth:`lend`
+        on the thread of the event loop, so the owner is only held off
+        while the coroutine runs, never while it awaits.
+
+        Parameters
+        ----------
+        coro : coroutine
+            The coroutine.
+
+        Returns
+        -------
+        coroutine
+            The wrapped coroutine.
+        """
+        return _run_lent(coro, self)
+
+    def release(self):
+        """Give up the ownership of the queue."""
+        if self.debug and self.tracker.owner == self.owner:
+            self.tracker.owner = None
+        self.owner = None
+
+    def drain(self, max_mutations=None):
+        """Apply the pending mutations in order, from the owner thread.
+
+        Parameters
+        ----------
+        max_mutations : int, optional
+            The maximum number of mutations to apply, all by default.
+
+        Returns
+        -------
+        int
+            The number of mutations applied.
+        """
+        self.claim()
+        tracker = self.tracker
+        mutations = self._mutations
+        applied = 0
+        with tracker.lock, tracker.batch():
+            while mutations and (max_mutations is None or
+                                 applied < max_mutations):
+                func, args, kwargs, future = mutations.popleft()
+                applied += 1
+                if future is not None and \
+                        not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as error:
+                    self.errors += 1
+                    if future is not None:
+                        future.set_exception(error)
+                else:
+                    if future is not None:
+                        future.set_result(result)
+
+        self.applied += applied
+        return applied
+
+
+_mutation_queue = None
+
+
+def get_mutation_queue():
+    """Get the mutation queue of the UI."""
+    global _mutation_queue
+    if _mutation_queue is None:
+        _mutation_queue = MutationQueue()
+    return _mutation_queue
+
+
+def set_mutation_queue(mutation_queue):
+    """Set the mutation queue of the UI.
+
+    Parameters
+    ----------
+    mutation_queue : :class: `MutationQueue`
+        The mutation queue to use.
+    """
+    global _mutation_queue
+    _mutation_queue = mutation_queue
+
+
+def active_mutation_queue():
+    """Get the mutation queue of the UI if another thread owns it.
+
+    Returns
+    -------
+    :class: `MutationQueue`
+        The queue, None if no thread drains it or the current thread does.
+    """
+    queue = _mutation_queue
+    if queue is None or queue.owner in (None, threading.get_ident()):
+        return None
+    return queue
+
+
+def lending_queue():
+    """Get the queue the current thread changes the UI through, if any.
+
+    Returns
+    -------
+    :class: `MutationQueue`
+        The queue, None outside of :meth:`MutationQueue.lending`.
+    """
+    return getattr(_lending, 'queue', None)
+
+
+def post(func, *args, **kwargs):
+    """Queue a mutation of the UI, see :meth:`MutationQueue.post`."""
+    get_mutation_queue().post(func, *args, **kwargs)
+
+
+def submit(func, *args, **kwargs):
+    """Queue a mutation of the UI, see :meth:`MutationQueue.submit`."""
+    return get_mutation_queue().submit(func, *args, **kwargs)
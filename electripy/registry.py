@@ -0,0 +1,47 @@
+"""Module for allocating element ids and resolving ids to elements."""
+import itertools
+import weakref
+
+_id_counter = itertools.count(1)
+_elements = weakref.WeakValueDictionary()
+
+
+def allocate_id():
+    """Allocate a new element id.
+
+    Ids are drawn from a per-process counter, so they are unique for the
+    lifetime of the process and start with a letter to be valid HTML ids.
+    """
+    return f'e{next(_id_counter):x}'
+
+
+def register(element):
+    """Register an element under its id.
+
+    The registry only holds weak references, so it does not keep
+    elements alive.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The element to register.
+    """
+    _elements[element.id] = element
+
+
+def get_element(element_id, default=None):
+    """Get a live element by its id.
+
+    Parameters
+    ----------
+    element_id : str
+        The id of the element.
+    default : object, optional
+        The value to return if no live element has this id.
+    """
+    return _elements.get(element_id, default)
+
+
+def live_elements():
+    """Get the number of live registered elements."""
+    return len(_elements)
@@ -0,0 +1,318 @@
+"""Module for flushing the changes of the UI at a target frame rate."""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import eel
+
+from electripy.diff import get_change_tracker
+
+DEFAULT_RATE = 60.0
+DEFAULT_MAX_IN_FLIGHT = 2
+DEFAULT_ACK_TIMEOUT = 5.0
+
+
+def _send_to_frontend(ops, ack):
+    """Send patch operations to the UI and acknowledge once handled.
+
+    Flushes the UI fails to apply are acknowledged too, they are not
+    retried.
+    """
+    getattr(eel, 'apply_patches')(ops)(lambda _: ack(),
+                                       lambda *_: ack())
+
+
+class UpdateScheduler:
+    """Flushes the pending changes of the UI at a target rate.
+
+    Changes recorded by the change tracker between two ticks are coalesced,
+    so only the last value of every property is sent. Every flush stays in
+    flight until the frontend acknowledges it; when ``max_in_flight``
+    flushes are unacknowledged the frontend is falling behind and ticks
+    are skipped, letting the changes coalesce further. Flushes that stay
+    unacknowledged for ``ack_timeout`` seconds, e.g. sent while no client
+    was connected, expire and stop counting as in flight.
+
+    A tick raising an exception, e.g. because the UI is not initialized
+    yet, is reported to ``on_error`` and does not stop the scheduler; the
+    operations it failed to send are sent first by the next tick.
+
+    Attributes
+    ----------
+    rate : float
+        The target number of flushes per second.
+    max_in_flight : int
+        The maximum number of unacknowledged flushes.
+    ack_timeout : float
+        The number of seconds after which an unacknowledged flush expires.
+    on_error : callable
+        The function called with the exception of a failed tick, if any.
+    mutation_queue : :class: `MutationQueue`
+        The queue of mutations applied before every tick, if any.
+    flushes : int
+        The number of flushes sent.
+    skipped : int
+        The number of ticks skipped because of back-pressure.
+    in_flight : int
+        The number of unacknowledged flushes.
+    expired : int
+        The number of flushes that expired unacknowledged.
+    errors : int
+        The number of ticks that raised an exception.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 send=None, change_tracker=None, mutation_queue=None,
+                 ack_timeout=DEFAULT_ACK_TIMEOUT, on_error=None):
+        """Initialize the update scheduler.
+
+        Parameters
+        ----------
+        rate : float, optional
+            The target number of flushes per second.
+        max_in_flight : int, optional
+            The maximum number of unacknowledged flushes.
+        send : callable, optional
+            The function called with the patch operations and the `ack`
+            callback of every flush, defaults to the ``apply_patches``
+            function exposed by the UI.
+        change_tracker : :class: `ChangeTracker`, optional
+            The change tracker to flush, the one of the UI by default.
+        mutation_queue : :class: `MutationQueue`, optional
+            The queue of mutations submitted by worker threads, drained by
+            the thread of the scheduler before every tick.
+        ack_timeout : float, optional
+            The number of seconds after which an unacknowledged flush
+            expires.
+        on_error : callable, optional
+            The function called with the exception of a failed tick.
+        """
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.send = send or _send_to_frontend
+        self.change_tracker = change_tracker
+        self.mutation_queue = mutation_queue
+        self.ack_timeout = ack_timeout
+        self.on_error = on_error
+
+        self.flushes = 0
+        self.skipped = 0
+        self.in_flight = 0
+        self.expired = 0
+        self.errors = 0
+
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._flush_waiters = []
+        self._unacked = OrderedDict()
+        self._seq = 0
+        self._unsent = []
+        self._unsent_since = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        """Start the scheduler."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop the scheduler."""
+        self.stop()
+
+    @property
+    def tracker(self):
+        """Get the change tracker flushed by the scheduler."""
+        return self.change_tracker or get_change_tracker()
+
+    @property
+    def metrics(self):
+        """Get the metrics of the scheduler and its change tracker.
+
+        Returns
+        -------
+        dict
+            The number of ``flushes``, ``skipped`` ticks and flushes
+            ``in_flight``, the ``mean_latency`` and ``max_latency`` in
+            seconds between the oldest pending change and its flush, and
+            the ``updates``, ``coalesced`` and ``dropped`` counters of the
+            change tracker.
+        """
+        tracker = self.tracker
+        return {
+            'flushes': self.flushes,
+            'skipped': self.skipped,
+            'in_flight': self.in_flight,
+            'mean_latency': self._total_latency / max(self.flushes, 1),
+            'max_latency': self._max_latency,
+            'updates': tracker.updates,
+            'coalesced': tracker.coalesced,
+            'dropped': tracker.dropped,
+        }
+
+    def start(self):
+        """Start flushing on a background thread."""
+        if self._thread is not None:
+            return
+
+        tracker = self.tracker
+        tracker.auto_flush = False
+        tracker.scheduler = self
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name='electripy-scheduler')
+        self._thread.start()
+
+    def stop(self, flush=True):
+        """Stop flushing.
+
+        Parameters
+        ----------
+        flush : bool, optional
+            Whether to send the remaining changes before returning.
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            if self.tracker.scheduler is self:
+                self.tracker.scheduler = None
+
+        mutation_queue = self.mutation_queue
+        if mutation_queue is not None:
+            mutation_queue.release()
+        if flush:
+            self.tick(force=True)
+        if mutation_queue is not None:
+            mutation_queue.release()
+
+    def tick(self, force=False):
+        """Flush the pending changes unless the frontend is behind.
+
+        The pending mutations of the mutation queue are applied first.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Whether to flush regardless of back-pressure.
+
+        Returns
+        -------
+        list
+            The patch operations sent, None if the tick was skipped.
+        """
+        if self.mutation_queue is not None:
+            self.mutation_queue.drain()
+
+        with self._lock:
+            waiters, self._flush_waiters = self._flush_waiters, []
+        ops = None
+        try:
+            ops = self._flush(force)
+        finally:
+            if ops is None:
+                with self._lock:
+                    self._flush_waiters[:0] = waiters
+        if ops is not None:
+            for waiter in waiters:
+                waiter.set_result(ops)
+        return ops
+
+    def next_flush(self):
+        """Get the future of the operations sent by the next tick.
+
+        Changes made before the call are part of the operations, unless
+        an earlier tick already sent them. Ticks skipped because of
+        back-pressure do not resolve the future.
+
+        Returns
+        -------
+        :class: `concurrent.futures.Future`
+            The future of the patch operations, empty if nothing changed.
+        """
+        future = Future()
+        with self._lock:
+            self._flush_waiters.append(future)
+        return future
+
+    def _flush(self, force):
+        """Collect and send the pending changes, None if skipped."""
+        tracker = self.tracker
+        pending_since = self._unsent_since \
+            if self._unsent else tracker.pending_since
+        if pending_since is None:
+            return []
+
+        with self._lock:
+            self._expire()
+            if not force and self.in_flight >= self.max_in_flight:
+                self.skipped += 1
+                return None
+
+        ops = self._unsent + tracker.collect()
+        self._unsent, self._unsent_since = [], None
+        if not ops:
+            return ops
+
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            self._unacked[seq] = time.monotonic()
+            self.in_flight = len(self._unacked)
+
+        try:
+            self.send(ops, functools.partial(self._ack, seq))
+        except BaseException:
+            self._unsent, self._unsent_since = ops, pending_since
+            self._ack(seq)
+            raise
+
+        latency = time.monotonic() - pending_since
+        with self._lock:
+            self.flushes += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+        return ops
+
+    def ack(self):
+        """Acknowledge that the frontend applied the oldest flush."""
+        with self._lock:
+            if self._unacked:
+                self._unacked.popitem(last=False)
+            self.in_flight = len(self._unacked)
+
+    def _ack(self, seq):
+        """Acknowledge a flush, unless it already expired."""
+        with self._lock:
+            self._unacked.pop(seq, None)
+            self.in_flight = len(self._unacked)
+
+    def _expire(self):
+        """Forget the flushes unacknowledged for longer than the timeout."""
+        deadline = time.monotonic() - self.ack_timeout
+        while self._unacked and next(iter(self._unacked.values())) < deadline:
+            self._unacked.popitem(last=False)
+            self.expired += 1
+        self.in_flight = len(self._unacked)
+
+    def _run(self):
+        """Tick at the target rate until stopped."""
+        interval = 1 / self.rate
+        next_tick = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                self.tick()
+            except Exception as error:
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(error)
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            self._stopped.wait(delay)
@@ -0,0 +1,340 @@
+"""Module for indexing and querying the elements of a tree.
+
+Selectors follow a small subset of CSS: compound selectors made of an
+element name, ``.class`` and ``#id`` parts, combined with the descendant
+(whitespace) and child (``>``) combinators, and grouped with commas::
+
+    Button.primary
+    #e1f > Paragraph
+    .toolbar Button, .menu Button
+"""
+import re
+
+from electripy.utils import iter_tree
+
+_COMPOUND = re.compile(r'([.#]?)([\w-]+)')
+_TOKEN = re.compile(r'\s*(>)\s*|\s+|([^\s>]+)')
+
+
+def class_tokens(class_name):
+    """Get the class names of a space separated class attribute.
+
+    Parameters
+    ----------
+    class_name : str
+        The class attribute.
+    """
+    return class_name.split() if isinstance(class_name, str) else []
+
+
+def parse_compound(compound):
+    """Parse a compound selector.
+
+    Parameters
+    ----------
+    compound : str
+        The compound selector, e.g. ``Button.primary#e1``.
+
+    Returns
+    -------
+    tuple
+        The element name or None, the id or None and the class names.
+    """
+    name = None
+    element_id = None
+    classes = []
+    end = 0
+    for match in _COMPOUND.finditer(compound):
+        if match.start() != end:
+            break
+        end = match.end()
+
+        prefix, value = match.groups()
+        if prefix == '.':
+            classes.append(value)
+        elif prefix == '#':
+            element_id = value
+        elif name is None and match.start() == 0:
+            name = value
+        else:
+            break
+
+    if end != len(compound) or not compound:
+        raise ValueError(f'Invalid selector {compound!r}.')
+    return name, element_id, tuple(classes)
+
+
+def parse_selector(selector):
+    """Parse a selector into groups of compound selectors.
+
+    Parameters
+    ----------
+    selector : str
+        The selector.
+
+    Returns
+    -------
+    list
+        For every comma separated group, the list of ``(combinator,
+        compound)`` pairs from left to right. The combinator of the first
+        compound is None, the next ones are either ``' '`` or ``'>'``.
+    """
+    groups = []
+    for group in selector.split(','):
+        steps = []
+        combinator = None
+        for match in _TOKEN.finditer(group.strip()):
+            child, compound = match.groups()
+            if child:
+                if combinator == '>' or not steps:
+                    raise ValueError(f'Invalid selector {selector!r}.')
+                combinator = '>'
+            elif compound:
+                steps.append((combinator, parse_compound(compound)))
+                combinator = ' '
+
+        if not steps or combinator == '>':
+            raise ValueError(f'Invalid selector {selector!r}.')
+        groups.append(steps)
+    return groups
+
+
+def matches_compound(element, compound):
+    """Check whether an element matches a compound selector.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The element.
+    compound : tuple
+        The compound selector, see :func:`parse_compound`.
+    """
+    name, element_id, classes = compound
+    if name is not None and element.name != name:
+        return False
+    if element_id is not None and element.id != element_id:
+        return False
+    if classes:
+        _classes = class_tokens(element.class_name)
+        return all(class_name in _classes for class_name in classes)
+    return True
+
+
+def _matches_ancestors(element, steps, idx):
+    """Check whether the ancestors of an element match steps[:idx + 1]."""
+    combinator = steps[idx + 1][0]
+    parent = element.parent
+    while parent is not None:
+        if matches_compound(parent, steps[idx][1]) and (
+                idx == 0 or _matches_ancestors(parent, steps, idx - 1)):
+            return True
+        if combinator == '>':
+            return False
+        parent = parent.parent
+    return False
+
+
+class SelectorIndex:
+    """Index of the elements of a tree by id, class name and type.
+
+    The index is held by the root of a tree and kept up to date as
+    elements are added to, removed from or renamed in the tree.
+
+    Attributes
+    ----------
+    by_id : dict
+        The elements keyed on their id.
+    by_class : dict
+        The elements of every class name, in the order they were indexed.
+    by_name : dict
+        The elements of every element name, in the order they were indexed.
+    by_type : dict
+        The elements of every element class, in the order they were
+        indexed.
+    """
+
+    def __init__(self, root):
+        """Initialize the index with the elements of a tree.
+
+        Parameters
+        ----------
+        root : :class: `Element`
+            The root of the tree.
+        """
+        self.root = root
+        self.by_id = {}
+        self.by_class = {}
+        self.by_name = {}
+        self.by_type = {}
+        self.add(root)
+
+    def __len__(self):
+        """Get the number of indexed elements."""
+        return len(self.by_id)
+
+    def add(self, element):
+        """Index an element and its descendants.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root of the added subtree.
+        """
+        for _element, _ in iter_tree(element):
+            self.by_id[_element.id] = _element
+            self.by_name.setdefault(_element.name, {})[_element] = None
+            self.by_type.setdefault(type(_element), {})[_element] = None
+            for class_name in class_tokens(_element.class_name):
+                self.by_class.setdefault(class_name, {})[_element] = None
+
+    def remove(self, element):
+        """Remove an element and its descendants from the index.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The root of the removed subtree.
+        """
+        for _element, _ in iter_tree(element):
+            self.by_id.pop(_element.id, None)
+            self.by_name.get(_element.name, {}).pop(_element, None)
+            self.by_type.get(type(_element), {}).pop(_element, None)
+            for class_name in class_tokens(_element.class_name):
+                self.by_class.get(class_name, {}).pop(_element, None)
+
+    def rename(self, element, old_class_name, class_name):
+        """Update the class names of an indexed element.
+
+        Parameters
+        ----------
+        element : :class: `Element`
+            The element.
+        old_class_name : str
+            The previous class attribute of the element.
+        class_name : str
+            The new class attribute of the element.
+        """
+        old_classes = class_tokens(old_class_name)
+        classes = class_tokens(class_name)
+        for _class_name in old_classes:
+            if _class_name not in classes:
+                self.by_class.get(_class_name, {}).pop(element, None)
+        for _class_name in classes:
+            if _class_name not in old_classes:
+                self.by_class.setdefault(_class_name, {})[element] = None
+
+    def find_by_id(self, element_id):
+        """Get the element of the tree with the given id, if any.
+
+        Parameters
+        ----------
+        element_id : str
+            The id of the element.
+        """
+        return self.by_id.get(element_id)
+
+    def find_all(self, element_type=None, class_name=None):
+        """Get the elements of the tree matching a type and a class name.
+
+        Parameters
+        ----------
+        element_type : type or str, optional
+            The class of the elements, subclasses included, or their name.
+        class_name : str, optional
+            The class name the elements must have.
+
+        Returns
+        -------
+        list
+            The matching elements, in the order they were indexed.
+        """
+        candidates = None
+        if class_name is not None:
+            candidates = self.by_class.get(class_name, {})
+
+        if element_type is None:
+            return list(self.by_id.values() if candidates is None
+                        else candidates)
+
+        if isinstance(element_type, str):
+            typed = self.by_name.get(element_type, {})
+        else:
+            typed = {}
+            for _type, elements in self.by_type.items():
+                if issubclass(_type, element_type):
+                    typed.update(elements)
+
+        if candidates is None:
+            return list(typed)
+        if len(typed) < len(candidates):
+            return [element for element in typed if element in candidates]
+        return [element for element in candidates if element in typed]
+
+    def _candidates(self, compound):
+        """Get the indexed elements possibly matching a compound selector."""
+        name, element_id, classes = compound
+        if element_id is not None:
+            element = self.by_id.get(element_id)
+            return [] if element is None else [element]
+        if classes:
+            return min((self.by_class.get(class_name, {})
+                        for class_name in classes), key=len)
+        if name is not None:
+            return self.by_name.get(name, {})
+        return self.by_id.values()
+
+    def select(self, selector, scope=None):
+        """Get the elements of the tree matching a selector.
+
+        Candidates are looked up in the index with the last compound
+        selector of every group, then filtered by walking their ancestors.
+        Like ``querySelectorAll``, ancestors outside of the scope may match
+        the leading compound selectors.
+
+        Parameters
+        ----------
+        selector : str
+            The selector.
+        scope : :class: `Element`, optional
+            Only match this element and its descendants.
+
+        Returns
+        -------
+        list
+            The matching elements, in the order they were indexed.
+        """
+        scope = None if scope is self.root else scope
+        found = {}
+        for steps in parse_selector(selector):
+            compound = steps[-1][1]
+            for element in list(self._candidates(compound)):
+                if element in found:
+                    continue
+                if not matches_compound(element, compound):
+                    continue
+                if len(steps) > 1 and not _matches_ancestors(
+                        element, steps, len(steps) - 2):
+                    continue
+                if scope is not None and element is not scope and \
+                        not is_descendant(element, scope):
+                    continue
+                found[element] = None
+        return list(found)
+
+
+def is_descendant(element, ancestor):
+    """Check whether an element is a descendant of another one.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The element.
+    ancestor : :class: `Element`
+        The possible ancestor.
+    """
+    parent = element.parent
+    while parent is not None:
+        if parent is ancestor:
+            return True
+        parent = parent.parent
+    return False
@@ -0,0 +1,316 @@
+"""Module for serializing element trees.
+
+Trees are serialized in a single iterative pass into nested payloads with
+the ``name``, ``id``, ``attributes`` and ``children`` of every element,
+either as dictionaries, as compact JSON or as a compact binary encoding.
+"""
+import json
+import struct
+
+BINARY_MAGIC = b'EPT1'
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_STR_REF = 6
+_LIST = 7
+_DICT = 8
+_BYTES = 9
+
+_DOUBLE = struct.Struct('<d')
+_KEY = object()
+
+_encode_json = json.JSONEncoder(separators=(',', ':'),
+                                check_circular=False).encode
+
+
+def to_dict(element):
+    """Serialize an element and its children into a nested payload.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+
+    Returns
+    -------
+    dict
+        The payload with the ``name``, ``id``, ``attributes`` and
+        ``children`` of every element.
+    """
+    payload = element._get_payload()
+    stack = [(element, payload)]
+    while stack:
+        _element, _payload = stack.pop()
+        _children = _payload['children'] = []
+        for child in _element.children:
+            _child_payload = child._get_payload()
+            _children.append(_child_payload)
+            stack.append((child, _child_payload))
+
+    return payload
+
+
+def iter_json(element, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Serialize an element and its children into chunks of compact JSON.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    chunk_size : int, optional
+        The approximate number of characters of every chunk.
+
+    Yields
+    ------
+    str
+        The chunks of the JSON document, see :func:`to_dict`.
+    """
+    parts = []
+    size = 0
+    stack = [element]
+    while stack:
+        _element = stack.pop()
+        if _element.__class__ is str:
+            part = _element
+        else:
+            _payload = _encode_json(_element._get_payload())
+            part = f'{_payload[:-1]},"children":['
+            stack.append(']}')
+            for child in reversed(_element.children):
+                stack.append(child)
+                stack.append(',')
+            if _element.children:
+                stack.pop()
+
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield ''.join(parts)
+            parts = []
+            size = 0
+
+    if parts:
+        yield ''.join(parts)
+
+
+def to_json(element):
+    """Serialize an element and its children into compact JSON.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+
+    Returns
+    -------
+    str
+        The JSON document, see :func:`to_dict`.
+    """
+    return ''.join(iter_json(element))
+
+
+def write_json(element, stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write an element and its children to a stream as compact JSON.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    stream : file-like
+        The text stream to write to.
+    chunk_size : int, optional
+        The approximate number of characters of every write.
+    """
+    for chunk in iter_json(element, chunk_size):
+        stream.write(chunk)
+
+
+def _write_varint(out, value):
+    """Append an unsigned LEB128 integer."""
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """Read an unsigned LEB128 integer."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class _Encoder:
+    """Compact binary encoder interning every string it writes once."""
+
+    def __init__(self):
+        self.out = bytearray(BINARY_MAGIC)
+        self.strings = {}
+
+    def write_str(self, value):
+        """Write a string, as a reference if it was already written."""
+        out = self.out
+        idx = self.strings.get(value)
+        if idx is not None:
+            out.append(_STR_REF)
+            _write_varint(out, idx)
+            return
+
+        self.strings[value] = len(self.strings)
+        _value = value.encode()
+        out.append(_STR)
+        _write_varint(out, len(_value))
+        out += _value
+
+    def write(self, value):
+        """Write a value of the attributes of an element."""
+        out = self.out
+        if isinstance(value, str):
+            self.write_str(value)
+        elif value is None:
+            out.append(_NONE)
+        elif value is True or value is False:
+            out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, value << 1 if value >= 0 else
+                          (-value << 1) - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            out.append(_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, _value in value.items():
+                self.write_str(key)
+                self.write(_value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for _value in value:
+                self.write(_value)
+        else:
+            self.write(value.item() if hasattr(value, 'item') else str(value))
+
+
+def to_bytes(element):
+    """Serialize an element and its children into a compact binary payload.
+
+    Every string is written once and referenced afterwards, so repeated
+    names, attribute keys, class names and styles only cost a few bytes.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+
+    Returns
+    -------
+    bytearray
+        The encoded payload, see :func:`from_bytes`.
+    """
+    encoder = _Encoder()
+    out = encoder.out
+    stack = [element]
+    while stack:
+        _element = stack.pop()
+        _payload = _element._get_payload()
+        out.append(_DICT)
+        _write_varint(out, len(_payload) + 1)
+        for key, value in _payload.items():
+            encoder.write_str(key)
+            encoder.write(value)
+
+        encoder.write_str('children')
+        out.append(_LIST)
+        _write_varint(out, len(_element.children))
+        stack.extend(reversed(_element.children))
+
+    return out
+
+
+def from_bytes(data):
+    """Decode a payload encoded by :func:`to_bytes`.
+
+    Parameters
+    ----------
+    data : bytes-like
+        The encoded payload.
+
+    Returns
+    -------
+    dict
+        The nested payload, see :func:`to_dict`.
+    """
+    data = memoryview(data)
+    if data[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+        raise ValueError('Not an electripy tree payload.')
+
+    pos = len(BINARY_MAGIC)
+    strings = []
+    stack = []
+    while True:
+        tag = data[pos]
+        pos += 1
+        count = 0
+        if tag == _STR:
+            length, pos = _read_varint(data, pos)
+            value = str(data[pos:pos + length], 'utf-8')
+            strings.append(value)
+            pos += length
+        elif tag == _STR_REF:
+            idx, pos = _read_varint(data, pos)
+            value = strings[idx]
+        elif tag == _DICT or tag == _LIST:
+            count, pos = _read_varint(data, pos)
+            value = {} if tag == _DICT else []
+        elif tag == _INT:
+            value, pos = _read_varint(data, pos)
+            value = value >> 1 if not value & 1 else -((value + 1) >> 1)
+        elif tag == _FLOAT:
+            value, = _DOUBLE.unpack_from(data, pos)
+            pos += _DOUBLE.size
+        elif tag == _BYTES:
+            length, pos = _read_varint(data, pos)
+            value = bytes(data[pos:pos + length])
+            pos += length
+        elif tag <= _TRUE:
+            value = (None, False, True)[tag]
+        else:
+            raise ValueError(f'Unknown tag {tag} at offset {pos - 1}.')
+
+        if not stack:
+            root = value
+        else:
+            top = stack[-1]
+            if top[0].__class__ is list:
+                top[0].append(value)
+                top[1] -= 1
+            elif top[2] is _KEY:
+                top[2] = value
+            else:
+                top[0][top[2]] = value
+                top[2] = _KEY
+                top[1] -= 1
+
+        if count:
+            stack.append([value, count, _KEY])
+        while stack and not stack[-1][1]:
+            stack.pop()
+        if not stack:
+            return root
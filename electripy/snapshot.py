@@ -0,0 +1,168 @@
+"""Module for saving built element trees and restoring them at startup.
+
+A snapshot holds the state of every element of a tree, with its
+attributes, computed styles and processed image buffers, so restoring it
+skips `_setup` altogether: no download, decode, resize or style parsing
+happens again. The file is laid out as a header, a table of the pixel
+buffers, the pickled elements and the buffers themselves, aligned so the
+restored images are views of the memory-mapped file, paged in by the
+operating system as they are used.
+
+Snapshots are pickles: callbacks and data sources must be importable
+functions, and only snapshots written by the application itself should
+be restored.
+"""
+import io
+import mmap
+import pickle
+import struct
+
+from PIL import Image as PILImage
+
+from electripy.children import ChildList
+from electripy.elements import Element
+from electripy.utils import iter_tree, paused_gc
+
+SNAPSHOT_MAGIC = b'EPS1'
+
+_HEADER = struct.Struct('<4sQQ')
+_BUFFER = struct.Struct('<QQ')
+_ALIGNMENT = 64
+_SHARED_MODES = frozenset(('L', 'RGBA', 'RGBX', 'CMYK', 'I', 'F'))
+
+
+def _align(offset):
+    """Round an offset up to the alignment of the buffers."""
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _new_element(cls):
+    """Create an element without initializing it."""
+    return cls.__new__(cls)
+
+
+def _restore_element(element, state):
+    """Restore an element from its state."""
+    element._set_state(state)
+
+
+def _image_from_buffer(mode, size, buffer):
+    """Create an image over a pixel buffer, sharing it where possible."""
+    if mode in _SHARED_MODES:
+        return PILImage.frombuffer(mode, size, buffer, 'raw', mode, 0, 1)
+    return PILImage.frombytes(mode, size, buffer)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler writing elements by state and pixels out-of-band."""
+
+    def reducer_override(self, obj):
+        """Reduce elements and images, other objects are pickled as usual."""
+        if isinstance(obj, Element):
+            return (_new_element, (type(obj),), obj._get_state(), None, None,
+                    _restore_element)
+        if isinstance(obj, PILImage.Image) and obj.palette is None:
+            return (_image_from_buffer,
+                    (obj.mode, obj.size, pickle.PickleBuffer(obj.tobytes())))
+        return NotImplemented
+
+
+def save_snapshot(element, path):
+    """Save an element and its descendants to a snapshot file.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    path : str or path-like
+        The path of the snapshot file.
+
+    Returns
+    -------
+    int
+        The size of the snapshot in bytes.
+
+    Raises
+    ------
+    ValueError
+        If a value held by an element cannot be saved, e.g. a lambda.
+    """
+    elements = [_element for _element, _ in iter_tree(element)]
+    indices = {_element: idx for idx, _element in enumerate(elements)}
+    parents = [indices.get(_element.parent, -1) for _element in elements]
+
+    buffers = []
+    stream = io.BytesIO()
+    try:
+        _SnapshotPickler(stream, protocol=5,
+                         buffer_callback=buffers.append).dump(
+            (elements, parents))
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(
+            f'{element.name} {element.id} cannot be snapshotted: {error}'
+        ) from error
+
+    payload = stream.getbuffer()
+    views = [buffer.raw() for buffer in buffers]
+    table = []
+    offset = _align(_HEADER.size + _BUFFER.size * len(views) + len(payload))
+    for view in views:
+        table.append((offset, view.nbytes))
+        offset = _align(offset + view.nbytes)
+
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, len(payload), len(views)))
+        for entry in table:
+            file.write(_BUFFER.pack(*entry))
+        file.write(payload)
+        for (offset, _), view in zip(table, views):
+            file.write(bytes(offset - file.tell()))
+            file.write(view)
+        return file.tell()
+
+
+def load_snapshot(path):
+    """Restore an element and its descendants from a snapshot file.
+
+    The elements get new ids and are registered, but none of them runs
+    `_setup`. Image buffers stay in the mapped file until they are used.
+
+    Parameters
+    ----------
+    path : str or path-like
+        The path of the snapshot file.
+
+    Returns
+    -------
+    :class: `Element`
+        The detached root of the restored tree.
+    """
+    with open(path, 'rb') as file:
+        data = memoryview(mmap.mmap(file.fileno(), 0,
+                                    access=mmap.ACCESS_READ))
+
+    if len(data) < _HEADER.size or \
+            data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError(f'{path} is not an electripy snapshot.')
+
+    _, size, count = _HEADER.unpack_from(data)
+    pos = _HEADER.size
+    buffers = []
+    for _ in range(count):
+        offset, nbytes = _BUFFER.unpack_from(data, pos)
+        buffers.append(data[offset:offset + nbytes])
+        pos += _BUFFER.size
+
+    with paused_gc():
+        elements, parents = pickle.loads(data[pos:pos + size],
+                                         buffers=buffers)
+
+        children = [[] for _ in elements]
+        for _element, parent in zip(elements, parents):
+            if parent >= 0:
+                _element.parent = elements[parent]
+                children[parent].append(_element)
+        for _element, _children in zip(elements, children):
+            if _children:
+                _element.children = ChildList(_children)
+    return elements[0]
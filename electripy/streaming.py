@@ -0,0 +1,305 @@
+"""Module for feeding elements with streams of frames."""
+import asyncio
+import threading
+import weakref
+from collections import deque
+
+LATEST = 'latest'
+DROP_OLDEST = 'drop-oldest'
+DROP_POLICIES = (LATEST, DROP_OLDEST)
+
+
+class FrameQueue:
+    """Bounded queue of frames that never blocks the producer.
+
+    When the queue is full, the ``latest`` policy drops every queued frame
+    so the consumer always gets the most recent one, and the
+    ``drop-oldest`` policy only drops the oldest frame.
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of queued frames.
+    drop_policy : str
+        The policy applied when the queue is full.
+    pushed : int
+        The number of frames pushed.
+    dropped : int
+        The number of frames dropped.
+    """
+
+    def __init__(self, maxsize=2, drop_policy=LATEST):
+        """Initialize the frame queue.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of queued frames.
+        drop_policy : str, optional
+            Either ``latest`` or ``drop-oldest``.
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(
+                f'{drop_policy} is not a valid drop policy, '
+                f'use one of {DROP_POLICIES}.')
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1.')
+
+        self.maxsize = maxsize
+        self.drop_policy = drop_policy
+        self.pushed = 0
+        self.dropped = 0
+
+        self._frames = deque()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        """Get the number of queued frames."""
+        return len(self._frames)
+
+    def push(self, frame):
+        """Queue a frame, dropping frames if the queue is full.
+
+        Parameters
+        ----------
+        frame : object
+            The frame to queue.
+        """
+        with self._condition:
+            if len(self._frames) >= self.maxsize:
+                if self.drop_policy == LATEST:
+                    self.dropped += len(self._frames)
+                    self._frames.clear()
+                else:
+                    self.dropped += 1
+                    self._frames.popleft()
+
+            self._frames.append(frame)
+            self.pushed += 1
+            self._condition.notify()
+
+    def pop(self, timeout=None):
+        """Get the next frame, waiting until one is queued.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        object
+            The frame, or None if the queue was closed or the wait timed out.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._frames or self._closed, timeout)
+            if not self._frames:
+                return None
+            return self._frames.popleft()
+
+    def close(self):
+        """Close the queue, waking up waiting consumers."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+def _convert_frames(stream_ref, queue, idle):
+    """Convert the frames of a stream until it is closed or collected.
+
+    The worker only holds the stream while converting a frame, so waiting
+    for frames never keeps the stream, nor the element feeding it, alive.
+    """
+    while True:
+        frame = queue.pop()
+        stream = stream_ref()
+        if frame is None or stream is None:
+            if queue._closed or stream is None:
+                idle.set()
+                return
+            continue
+
+        stream._process(frame)
+        del stream
+
+
+class FrameStream:
+    """Converts queued frames on a worker thread.
+
+    Frames are pushed from any thread without blocking, converted by
+    ``convert`` on the worker thread and handed to ``on_frame``. The
+    worker is started by the first frame and stopped by :meth:`close`,
+    or once the stream is garbage collected. A frame failing to convert
+    or to be shown is reported to ``on_error`` and skipped.
+
+    Attributes
+    ----------
+    queue : :class: `FrameQueue`
+        The queue of pending frames.
+    on_error : callable
+        Function called with the frame and the exception of every frame
+        that failed.
+    converted : int
+        The number of frames converted.
+    errors : int
+        The number of frames that failed.
+    """
+
+    def __init__(self, convert, on_frame, maxsize=2, drop_policy=LATEST,
+                 on_error=None):
+        """Initialize the frame stream.
+
+        Parameters
+        ----------
+        convert : callable
+            The function converting a raw frame.
+        on_frame : callable
+            The function receiving every converted frame.
+        maxsize : int, optional
+            The maximum number of queued frames.
+        drop_policy : str, optional
+            Either ``latest`` or ``drop-oldest``.
+        on_error : callable, optional
+            Function called with the frame and the exception of every
+            frame that failed.
+        """
+        self.convert = convert
+        self.on_frame = on_frame
+        self.on_error = on_error
+        self.queue = FrameQueue(maxsize, drop_policy)
+        self.converted = 0
+        self.errors = 0
+
+        self._idle = threading.Event()
+        self._idle.set()
+        self._worker = None
+        self._lock = threading.Lock()
+        weakref.finalize(self, self.queue.close)
+
+    @property
+    def running(self):
+        """Check whether the worker thread is running."""
+        return self._worker is not None and self._worker.is_alive()
+
+    def _start(self):
+        """Start the worker thread unless it was started already."""
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=_convert_frames,
+                    args=(weakref.ref(self), self.queue, self._idle),
+                    daemon=True, name='electripy-frames')
+                self._worker.start()
+
+    def push(self, frame):
+        """Queue a frame for conversion without blocking.
+
+        Parameters
+        ----------
+        frame : object
+            The raw frame.
+        """
+        if self._worker is None:
+            self._start()
+        with self.queue._condition:
+            self._idle.clear()
+            self.queue.push(frame)
+
+    def feed(self, frames):
+        """Push the frames of an iterator from a feeder thread.
+
+        Parameters
+        ----------
+        frames : iterable
+            The raw frames.
+
+        Returns
+        -------
+        :class: `threading.Thread`
+            The feeder thread.
+        """
+        def _feed():
+            for frame in frames:
+                if self.queue._closed:
+                    break
+                self.push(frame)
+
+        feeder = threading.Thread(target=_feed, daemon=True,
+                                  name='electripy-feeder')
+        feeder.start()
+        return feeder
+
+    async def feed_async(self, frames):
+        """Push the frames of an asynchronous iterator.
+
+        Parameters
+        ----------
+        frames : async iterable
+            The raw frames.
+        """
+        async for frame in frames:
+            if self.queue._closed:
+                break
+            self.push(frame)
+
+    def feed_async_in_thread(self, frames):
+        """Push the frames of an asynchronous iterator from its own loop.
+
+        Parameters
+        ----------
+        frames : async iterable
+            The raw frames.
+
+        Returns
+        -------
+        :class: `threading.Thread`
+            The thread running the event loop.
+        """
+        feeder = threading.Thread(
+            target=asyncio.run, args=(self.feed_async(frames),), daemon=True,
+            name='electripy-feeder')
+        feeder.start()
+        return feeder
+
+    def wait(self, timeout=None):
+        """Wait until every queued frame is converted.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait.
+
+        Returns
+        -------
+        bool
+            Whether the stream is idle.
+        """
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Stop the worker thread."""
+        self.queue.close()
+        with self._lock:
+            worker = self._worker
+        if worker is not None and worker is not threading.current_thread():
+            worker.join()
+
+    def _process(self, frame):
+        """Convert and show a frame, reporting its failure if any."""
+        try:
+            self.on_frame(self.convert(frame))
+        except Exception as error:
+            self.errors += 1
+            if self.on_error is not None:
+                try:
+                    self.on_error(frame, error)
+                except Exception:
+                    pass
+        else:
+            self.converted += 1
+        finally:
+            with self.queue._condition:
+                if not self.queue._frames:
+                    self._idle.set()
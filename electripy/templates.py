@@ -0,0 +1,86 @@
+"""Module for building repeated subtrees from templates."""
+
+
+class Template:
+    """Element subtree defined once and instantiated by cloning.
+
+    Instances skip the setup of their elements and share the unchanged
+    styles and image data of the prototype copy-on-write, so building
+    them costs in proportion to the overrides rather than to the setup of
+    the whole subtree.
+
+    Attributes
+    ----------
+    prototype : :class: `Element`
+        The subtree every instance is cloned from.
+    instances : int
+        The number of instances created.
+    """
+
+    def __init__(self, prototype):
+        """Initialize the template.
+
+        Parameters
+        ----------
+        prototype : :class: `Element`
+            The detached root of the subtree to clone.
+        """
+        if prototype.parent is not None or prototype._mounted:
+            raise ValueError('The prototype of a template must be detached.')
+
+        self.prototype = prototype
+        self.instances = 0
+
+    def __call__(self, parent=None, position=None, **overrides):
+        """Create an instance of the template.
+
+        Parameters
+        ----------
+        parent : :class: `Element`, optional
+            The element the instance is added to.
+        position : tuple, optional
+            The position of the instance in its parent, the one of the
+            prototype by default.
+        **overrides
+            Values assigned to the attributes or properties of the
+            instance, see :meth:`Element.clone`.
+
+        Returns
+        -------
+        :class: `Element`
+            The instance.
+        """
+        element = self.prototype.clone(**overrides)
+        if parent is not None:
+            parent.add_child(element, element.position if position is None
+                             else position)
+        self.instances += 1
+        return element
+
+    def instantiate(self, overrides, parent=None, positions=None):
+        """Create one instance of the template per set of overrides.
+
+        Parameters
+        ----------
+        overrides : iterable
+            The dictionaries of overrides of every instance.
+        parent : :class: `Element`, optional
+            The element the instances are added to.
+        positions : array_like, optional
+            The ``(N, 2)`` positions of the instances in their parent, see
+            :meth:`Element.add_children`. The positions of the prototype
+            by default.
+
+        Returns
+        -------
+        list
+            The instances.
+        """
+        elements = [self.prototype.clone(**_overrides)
+                    for _overrides in overrides]
+        self.instances += len(elements)
+        if parent is not None:
+            if positions is None:
+                positions = [element.position for element in elements]
+            parent.add_children(elements, positions)
+        return elements
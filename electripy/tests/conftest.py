@@ -0,0 +1,123 @@
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image as PILImage
+
+from electripy import aio, cache, diff, events, imaging, mutations
+
+
+class AssetServer:
+    """Local HTTP stand-in serving generated test images."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.requests = 0
+        self.latency = 0
+
+        _server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def do_GET(self):
+                _server.requests += 1
+                if _server.latency:
+                    time.sleep(_server.latency)
+                super().do_GET()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(
+            ('127.0.0.1', 0),
+            functools.partial(Handler, directory=str(directory)))
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+
+    def url(self, name):
+        return f'http://127.0.0.1:{self.httpd.server_port}/{name}'
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture(scope='session')
+def image_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('images')
+
+    PILImage.new('RGBA', (50, 50), (255, 0, 0, 255)).save(directory / 'icon.png')
+    PILImage.new('RGB', (200, 100), (0, 255, 0)).save(directory / 'wide.png')
+    PILImage.new('RGB', (100, 200), (0, 0, 255)).save(directory / 'tall.png')
+    PILImage.new('RGB', (2000, 1500), (0, 0, 255)).save(directory / 'large.jpg')
+    for idx in range(16):
+        PILImage.new('RGBA', (24, 24), (idx, 0, 0, 255)).save(
+            directory / f'icon_{idx}.png')
+
+    return directory
+
+
+@pytest.fixture
+def asset_server(image_dir):
+    server = AssetServer(image_dir)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def asset_cache(tmp_path):
+    previous = cache._asset_cache
+    asset_cache = cache.AssetCache(cache_dir=str(tmp_path / 'cache'))
+    cache.set_asset_cache(asset_cache)
+    yield asset_cache
+    cache.set_asset_cache(previous)
+
+
+@pytest.fixture
+def variant_cache():
+    previous = imaging._variant_cache
+    variant_cache = imaging.VariantCache()
+    imaging.set_variant_cache(variant_cache)
+    yield variant_cache
+    imaging.set_variant_cache(previous)
+
+
+@pytest.fixture
+def change_tracker():
+    previous = diff._change_tracker
+    sent = []
+    change_tracker = diff.ChangeTracker(send=sent.append)
+    change_tracker.sent = sent
+    diff.set_change_tracker(change_tracker)
+    yield change_tracker
+    diff.set_change_tracker(previous)
+
+
+@pytest.fixture
+def event_bus():
+    previous = events._event_bus
+    event_bus = events.EventBus(max_workers=0)
+    events.set_event_bus(event_bus)
+    yield event_bus
+    events.set_event_bus(previous)
+
+
+@pytest.fixture
+def async_bridge():
+    previous = aio._async_bridge
+    async_bridge = aio.AsyncBridge()
+    aio.set_async_bridge(async_bridge)
+    yield async_bridge
+    async_bridge.stop()
+    aio.set_async_bridge(previous)
+
+
+@pytest.fixture
+def mutation_queue():
+    previous = mutations._mutation_queue
+    mutation_queue = mutations.MutationQueue(debug=True)
+    mutations.set_mutation_queue(mutation_queue)
+    yield mutation_queue
+    mutations.set_mutation_queue(previous)
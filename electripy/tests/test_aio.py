@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+import numpy.testing as npt
+from electripy import aio, diff
+from electripy.elements import Button, Paragraph
+from electripy.events import PRESS
+from electripy.scheduler import UpdateScheduler
+
+
+def test_async_bridge(async_bridge):
+    async def current_thread():
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    npt.assert_equal(async_bridge.running, False)
+    npt.assert_equal(async_bridge.run(current_thread(), 5),
+                     'electripy-asyncio')
+    npt.assert_equal(async_bridge.running, True)
+    npt.assert_equal(async_bridge.submitted, 1)
+
+    async def attached():
+        async_bridge.attach()
+        return await asyncio.wrap_future(async_bridge.submit(
+            current_thread()))
+
+    npt.assert_equal(asyncio.run(attached()), 'MainThread')
+
+
+def test_coroutine_handlers(async_bridge, event_bus):
+    done = []
+
+    async def slow_io(event):
+        await asyncio.sleep(0.2)
+        done.append(event.element)
+
+    labels = [Paragraph(f'Label {idx}') for idx in range(1000)]
+    for label in labels:
+        label.on('load', slow_io)
+
+    start = time.perf_counter()
+    futures = event_bus.dispatch_batch([[label.id, 'load']
+                                        for label in labels])
+    npt.assert_equal(time.perf_counter() - start < 0.2, True)
+    for future in futures:
+        future.result(5)
+    npt.assert_equal(time.perf_counter() - start < 2, True)
+    npt.assert_equal(len(done), 1000)
+
+    presses = []
+
+    async def press_callback():
+        await asyncio.sleep(0)
+        presses.append(threading.current_thread().name)
+
+    button = Button('Async', press_callback=press_callback)
+    [future] = event_bus.dispatch(button.id, PRESS)
+    future.result(5)
+    npt.assert_equal(presses, ['electripy-asyncio'])
+
+
+def test_awaitable_operations(async_bridge, event_bus, change_tracker):
+    label = Paragraph('Label')
+    diff.mount(label)
+    change_tracker.flush()
+
+    async def scenario():
+        waiting = asyncio.ensure_future(label.wait_for('hover', timeout=5))
+        await asyncio.sleep(0)
+        event_bus.dispatch(label.id, 'hover', 'detail')
+        event = await waiting
+        ops = await aio.update(label, text=event.detail, class_name='hot')
+        return event, ops
+
+    event, ops = async_bridge.run(scenario(), 5)
+    npt.assert_equal((event.element, event.detail), (label, 'detail'))
+    npt.assert_equal(ops, [[diff.SET_ATTR, label.id, {'class': 'hot'}],
+                           [diff.SET_TEXT, label.id, 'detail']])
+    npt.assert_equal(event_bus.handlers(label, 'hover'), ())
+
+    async def timeout():
+        await label.wait_for('hover', timeout=0.01)
+
+    with npt.assert_raises(asyncio.TimeoutError):
+        async_bridge.run(timeout(), 5)
+
+
+def test_awaitable_operations_scheduled(async_bridge, change_tracker,
+                                        mutation_queue):
+    label = Paragraph('Label')
+    diff.mount(label)
+    sent = []
+    scheduler = UpdateScheduler(
+        rate=200, send=lambda ops, ack: (sent.append(ops), ack()),
+        mutation_queue=mutation_queue)
+
+    async def main():
+        ops = await aio.update(label, text='Updated', class_name='hot')
+        return ops, await aio.flush()
+
+    with scheduler:
+        mutation_queue.submit(lambda: None).result(5)
+        ops, flushed = async_bridge.run(main(), 5)
+
+    npt.assert_equal(ops[-2:], [[diff.SET_ATTR, label.id, {'class': 'hot'}],
+                                [diff.SET_TEXT, label.id, 'Updated']])
+    npt.assert_equal(ops in sent, True)
+    npt.assert_equal(flushed, [])
+    npt.assert_equal(label.text, 'Updated')
+    npt.assert_equal(change_tracker.scheduler, None)
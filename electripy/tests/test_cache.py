@@ -0,0 +1,132 @@
+import os
+import threading
+
+import numpy.testing as npt
+from electripy.cache import AssetCache
+from electripy.elements import Image
+
+
+def test_asset_cache(tmp_path, asset_server):
+    cache_dir = str(tmp_path / 'assets')
+    asset_cache = AssetCache(cache_dir=cache_dir)
+
+    icon_path = asset_cache.fetch(asset_server.url('icon.png'))
+    npt.assert_equal(icon_path.endswith('.png'), True)
+    npt.assert_equal(asset_cache.misses, 1)
+    npt.assert_equal(asset_cache.bytes_fetched > 0, True)
+    npt.assert_equal(asset_server.requests, 1)
+
+    npt.assert_equal(asset_cache.fetch(asset_server.url('icon.png')),
+                     icon_path)
+    npt.assert_equal(asset_cache.hits, 1)
+    npt.assert_equal(asset_server.requests, 1)
+
+    asset_cache.save()
+    warm_cache = AssetCache(cache_dir=cache_dir)
+    npt.assert_equal(warm_cache.fetch(asset_server.url('icon.png')), icon_path)
+    npt.assert_equal(warm_cache.stats['hits'], 1)
+    npt.assert_equal(warm_cache.stats['misses'], 0)
+    npt.assert_equal(warm_cache.stats['bytes_fetched'], 0)
+    npt.assert_equal(asset_server.requests, 1)
+
+    revalidating_cache = AssetCache(cache_dir=cache_dir, revalidate=True)
+    npt.assert_equal(
+        revalidating_cache.fetch(asset_server.url('icon.png')), icon_path)
+    npt.assert_equal(revalidating_cache.hits, 1)
+    npt.assert_equal(revalidating_cache.bytes_fetched, 0)
+    npt.assert_equal(asset_server.requests, 2)
+
+    warm_cache.clear()
+    npt.assert_equal(warm_cache.contains(asset_server.url('icon.png')), False)
+    npt.assert_equal(warm_cache.size, 0)
+
+
+def test_asset_cache_eviction(tmp_path, asset_server):
+    first = AssetCache(cache_dir=str(tmp_path / 'assets'))
+    first.fetch(asset_server.url('icon_0.png'))
+    first.save()
+    blob_size = first.size
+
+    asset_cache = AssetCache(cache_dir=str(tmp_path / 'assets'),
+                             max_size=2 * blob_size)
+    asset_cache.fetch(asset_server.url('icon_1.png'))
+    asset_cache.fetch(asset_server.url('icon_0.png'))
+    asset_cache.fetch(asset_server.url('icon_2.png'))
+
+    npt.assert_equal(asset_cache.evictions, 1)
+    npt.assert_equal(asset_cache.contains(asset_server.url('icon_0.png')), True)
+    npt.assert_equal(asset_cache.contains(asset_server.url('icon_1.png')), False)
+    npt.assert_equal(asset_cache.contains(asset_server.url('icon_2.png')), True)
+    npt.assert_equal(asset_cache.size <= asset_cache.max_size, True)
+
+
+def test_asset_cache_shared_blobs(tmp_path, asset_server):
+    cache_dir = str(tmp_path / 'assets')
+    asset_cache = AssetCache(cache_dir=cache_dir)
+    icon = asset_server.url('icon.png')
+    path = asset_cache.fetch(icon)
+    npt.assert_equal(asset_cache.fetch(icon + '?v=2'), path)
+    npt.assert_equal(asset_cache.size, os.path.getsize(path))
+
+    asset_cache.save()
+    npt.assert_equal(AssetCache(cache_dir=cache_dir).size, asset_cache.size)
+
+    asset_cache.max_size = 0
+    asset_cache.fetch(asset_server.url('wide.png'))
+    npt.assert_equal(asset_cache.evictions, 2)
+    npt.assert_equal(os.path.exists(path), False)
+    npt.assert_equal(asset_cache.size, sum(
+        os.path.getsize(os.path.join(cache_dir, 'blobs', name))
+        for name in os.listdir(os.path.join(cache_dir, 'blobs'))))
+
+
+def test_asset_cache_save_interval(tmp_path, asset_server):
+    cache_dir = str(tmp_path / 'assets')
+    asset_cache = AssetCache(cache_dir=cache_dir, save_interval=3600)
+    urls = [asset_server.url(f'icon_{idx}.png') for idx in range(3)]
+    for url in urls:
+        asset_cache.fetch(url)
+    npt.assert_equal(AssetCache(cache_dir=cache_dir).contains(urls[0]),
+                     False)
+
+    asset_cache.save()
+    npt.assert_equal(all(AssetCache(cache_dir=cache_dir).contains(url)
+                         for url in urls), True)
+
+    eager_cache = AssetCache(cache_dir=cache_dir, save_interval=0)
+    eager_cache.fetch(asset_server.url('icon.png'))
+    npt.assert_equal(AssetCache(cache_dir=cache_dir).contains(
+        asset_server.url('icon.png')), True)
+
+
+def test_asset_cache_concurrent_fetch(tmp_path, asset_server):
+    asset_cache = AssetCache(cache_dir=str(tmp_path / 'assets'))
+    asset_server.latency = 0.1
+
+    paths = []
+    threads = [
+        threading.Thread(target=lambda: paths.append(
+            asset_cache.fetch(asset_server.url('icon.png'))))
+        for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    npt.assert_equal(len(set(paths)), 1)
+    npt.assert_equal(asset_server.requests, 1)
+    npt.assert_equal(asset_cache.misses, 1)
+    npt.assert_equal(asset_cache.hits, 7)
+
+
+def test_image_uses_asset_cache(asset_server, asset_cache):
+    src = asset_server.url('icon.png')
+
+    first = Image(src=src, maintain_aspect=True)
+    second = Image(src=src, maintain_aspect=True)
+
+    npt.assert_equal(first.img_data.size, (50, 50))
+    npt.assert_equal(second.attributes['src'], src)
+    npt.assert_equal(asset_cache.misses, 1)
+    npt.assert_equal(asset_cache.hits, 1)
+    npt.assert_equal(asset_server.requests, 1)
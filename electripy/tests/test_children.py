@@ -0,0 +1,79 @@
+import random
+
+import numpy.testing as npt
+from electripy.children import EMPTY_CHILDREN, ChildList
+from electripy.elements import Paragraph
+
+
+def test_child_list():
+    rng = random.Random(0)
+    expected = []
+    children = ChildList()
+    for item in range(2000):
+        op = rng.random()
+        if op < 0.5 or not expected:
+            idx = rng.randint(-len(expected) - 1, len(expected) + 1)
+            expected.insert(idx, item)
+            children.insert(idx, item)
+        elif op < 0.7:
+            removed = rng.choice(expected)
+            expected.remove(removed)
+            children.remove(removed)
+        elif op < 0.9:
+            moved = rng.choice(expected)
+            idx = rng.randrange(len(expected))
+            expected.remove(moved)
+            expected.insert(idx, moved)
+            children.move(moved, idx)
+        else:
+            idx = rng.randrange(-len(expected), len(expected))
+            del expected[idx]
+            del children[idx]
+
+    npt.assert_equal(list(children), expected)
+    npt.assert_equal(list(reversed(children)), expected[::-1])
+    npt.assert_equal(children == expected, True)
+    npt.assert_equal([children.index(item) for item in expected],
+                     list(range(len(expected))))
+    npt.assert_equal([children[idx] for idx in range(len(expected))],
+                     expected)
+    npt.assert_equal(children[-3:], expected[-3:])
+    npt.assert_equal(expected[0] in children, True)
+    npt.assert_equal(-1 in children, False)
+
+    children.extend(range(5000, 5010))
+    children.reverse()
+    npt.assert_equal(list(children), (expected + list(range(5000, 5010)))[::-1])
+
+    for idx, duplicate in ((0, 5000), (len(children), 5000)):
+        with npt.assert_raises(ValueError):
+            children.insert(idx, duplicate)
+    with npt.assert_raises(ValueError):
+        children.extend([6000, 6000])
+    npt.assert_equal(6000 in children, False)
+    with npt.assert_raises(ValueError):
+        children.remove(-1)
+    with npt.assert_raises(IndexError):
+        children[len(children)]
+
+    children.clear()
+    npt.assert_equal((len(children), list(children)), (0, []))
+
+
+def test_empty_children_shared():
+    leaves = [Paragraph('a'), Paragraph('b')]
+    npt.assert_equal([leaf.children is EMPTY_CHILDREN for leaf in leaves],
+                     [True, True])
+    with npt.assert_raises(TypeError):
+        EMPTY_CHILDREN.insert(0, leaves[0])
+
+    leaves[0].add_child(Paragraph('c'))
+    npt.assert_equal(leaves[0].children is EMPTY_CHILDREN, False)
+    npt.assert_equal((len(leaves[0].children), len(EMPTY_CHILDREN)), (1, 0))
+    npt.assert_equal(leaves[1].children is EMPTY_CHILDREN, True)
+
+    npt.assert_equal(leaves[1]._style is Paragraph('d')._style, True)
+    default = dict(leaves[1]._style)
+    leaves[1].add_style({'color': 'red'})
+    npt.assert_equal((leaves[1]._style, Paragraph('d')._style),
+                     ({**default, 'color': 'red'}, default))
@@ -0,0 +1,206 @@
+import json
+
+import numpy.testing as npt
+from electripy import diff
+from electripy.elements import ConsoleParagraph, Paragraph
+
+
+def test_mount(change_tracker):
+    root = Paragraph('Root', class_name='root')
+    label = Paragraph('Label', parent=root)
+
+    diff.mount(root)
+    npt.assert_equal(change_tracker.flush(), change_tracker.sent[0])
+
+    [[op, parent_id, before_id, payload]] = change_tracker.sent[0]
+    npt.assert_equal((op, parent_id, before_id), (diff.INSERT, None, None))
+    npt.assert_equal(payload['id'], root.id)
+    npt.assert_equal(payload['attributes']['class'], 'root')
+    npt.assert_equal(payload['children'][0]['id'], label.id)
+    npt.assert_equal(payload['children'][0]['text'], 'Label')
+    npt.assert_equal(change_tracker.flush(), [])
+
+
+def test_resync(change_tracker):
+    root = Paragraph('Root')
+    label = Paragraph('Label', parent=root)
+    diff.mount(root)
+    other = Paragraph('Other')
+    diff.mount(other)
+    change_tracker.unmount(other)
+    label.text = 'Changed'
+
+    [payload] = diff.resync_ui()
+    npt.assert_equal(payload['id'], root.id)
+    npt.assert_equal(payload['children'][0]['text'], 'Changed')
+    npt.assert_equal(change_tracker.flush(), [])
+
+    label.text = 'After resync'
+    npt.assert_equal(change_tracker.flush(),
+                     [[diff.SET_TEXT, label.id, 'After resync']])
+
+
+def test_attribute_changes(change_tracker):
+    root = Paragraph('Root')
+    labels = [Paragraph(f'Label {idx}', parent=root) for idx in range(5000)]
+    diff.mount(root)
+    full_size = len(json.dumps(change_tracker.flush()))
+
+    labels[42].text = 'Changed'
+    labels[42].text = 'Changed again'
+    ops = change_tracker.flush()
+    npt.assert_equal(ops, [[diff.SET_TEXT, labels[42].id, 'Changed again']])
+    npt.assert_equal(len(json.dumps(ops)) < full_size / 1000, True)
+
+    labels[7].add_style({'color': 'red'})
+    labels[7].class_name = 'highlight'
+    labels[8].set_attribute('title', 'Tooltip')
+    ops = change_tracker.flush()
+    npt.assert_equal(ops, [
+        [diff.SET_ATTR, labels[7].id, {'class': 'highlight'}],
+        [diff.SET_STYLE, labels[7].id, {'color': 'red'}],
+        [diff.SET_ATTR, labels[8].id, {'title': 'Tooltip'}],
+    ])
+    npt.assert_equal(change_tracker.flushes, 3)
+
+
+def test_children_changes(change_tracker):
+    root = Paragraph('Root')
+    rows = [Paragraph(f'Row {idx}', parent=root) for idx in range(4)]
+    diff.mount(root)
+    change_tracker.flush()
+
+    new_row = Paragraph('New row')
+    root.add_child(new_row, (0, 0))
+    root.remove_child(rows[1])
+    ops = change_tracker.flush()
+
+    npt.assert_equal(ops[0], [diff.REMOVE, root.id, rows[1].id])
+    npt.assert_equal([op[0] for op in ops], [diff.REMOVE, diff.INSERT])
+    npt.assert_equal(ops[1][1:3], [root.id, None])
+    npt.assert_equal(ops[1][3]['id'], new_row.id)
+    npt.assert_equal(new_row._mounted, True)
+    npt.assert_equal(rows[1]._mounted, False)
+
+    rows[1].text = 'Not mounted'
+    npt.assert_equal(change_tracker.flush(), [])
+
+    root.remove_child(rows[0])
+    root.add_child(rows[0], (0, 0))
+    ops = change_tracker.flush()
+    npt.assert_equal(ops, [[diff.MOVE, root.id, rows[0].id, None]])
+
+    new_row.text = 'Updated'
+    ops = change_tracker.flush()
+    npt.assert_equal(ops, [[diff.SET_TEXT, new_row.id, 'Updated']])
+
+
+def test_reparent_changes(change_tracker):
+    root = Paragraph('Root')
+    left = Paragraph('Left', parent=root)
+    right = Paragraph('Right', parent=root)
+    item = Paragraph('Item', parent=left)
+    diff.mount(root)
+    change_tracker.flush()
+
+    item.text = 'Moved'
+    left.remove_child(item)
+    right.add_child(item, (0, 0))
+    ops = change_tracker.flush()
+
+    npt.assert_equal(ops[0], [diff.REMOVE, left.id, item.id])
+    npt.assert_equal(ops[1][:3], [diff.INSERT, right.id, None])
+    npt.assert_equal(ops[1][3]['text'], 'Moved')
+    npt.assert_equal(len(ops), 2)
+    npt.assert_equal(item._mounted, True)
+
+
+def test_append_changes(change_tracker):
+    console = ConsoleParagraph('Started', max_lines=100)
+    diff.mount(console)
+    change_tracker.flush()
+
+    console.append('Line 1')
+    console.append('Line 2')
+    npt.assert_equal(change_tracker.flush(),
+                     [[diff.APPEND_TEXT, console.id, ['Line 1', 'Line 2']]])
+
+    for idx in range(1000):
+        console.append(f'Line {idx}')
+    [[op, _, lines]] = change_tracker.flush()
+    npt.assert_equal((op, len(lines), lines[-1]),
+                     (diff.APPEND_TEXT, 100, 'Line 999'))
+
+    console.append('Dropped')
+    console.text = 'Reset'
+    console.append('After reset')
+    npt.assert_equal(change_tracker.flush(), [
+        [diff.SET_TEXT, console.id, 'Reset\nAfter reset']])
+
+    console.text = 'Reset\nAfter reset'
+    npt.assert_equal(change_tracker.flush(), [])
+
+
+def test_diff_children():
+    root = Paragraph('Root')
+    rows = [Paragraph(f'Row {idx}', parent=root) for idx in range(5)]
+    old_children = list(root.children)
+
+    root.children.reverse()
+    removals, placements, removed, inserted = diff.diff_children(
+        root, old_children)
+
+    npt.assert_equal((removals, removed, inserted), ([], [], []))
+    npt.assert_equal(len(placements), 4)
+    npt.assert_equal(all(op[0] == diff.MOVE for op in placements), True)
+    npt.assert_equal(placements[0][2:], [rows[0].id, None])
+    npt.assert_equal(placements[1][2:], [rows[1].id, rows[0].id])
+
+
+def test_batch(change_tracker):
+    root = Paragraph('Root')
+    rows = [Paragraph(f'Row {idx}', parent=root) for idx in range(1000)]
+    diff.mount(root)
+    change_tracker.flush()
+    change_tracker.auto_flush = True
+
+    rows[0].position = (10, 10)
+    rows[0].add_style({'color': 'red'})
+    rows[0].class_name = 'selected'
+    npt.assert_equal(change_tracker.flushes, 5)
+
+    with rows[1].batch():
+        rows[1].position = (10, 10)
+        rows[1].add_style({'color': 'red'})
+        rows[1].class_name = 'selected'
+        npt.assert_equal(change_tracker.flushes, 5)
+
+    npt.assert_equal(change_tracker.flushes, 6)
+    npt.assert_equal(change_tracker.sent[-1], [
+        [diff.SET_ATTR, rows[1].id,
+         {'position': (10, 10), 'class': 'selected'}],
+        [diff.SET_STYLE, rows[1].id,
+         {'left': '10px', 'bottom': '10px', 'color': 'red'}],
+    ])
+
+    rows[2].add_child(rows[3])
+    flushes = change_tracker.flushes
+    with rows[2].batch():
+        rows[2].position = (20, 20)
+        rows[3].text = 'Child'
+        npt.assert_equal(change_tracker.flushes, flushes)
+
+    npt.assert_equal(change_tracker.flushes, flushes + 1)
+    npt.assert_equal(change_tracker.sent[-1][-1],
+                     [diff.SET_TEXT, rows[3].id, 'Child'])
+
+    with diff.batch():
+        for idx, row in enumerate(rows):
+            row.text = f'Updated {idx}'
+            row.add_style({'color': 'blue', 'font-size': '12px'})
+            with row.batch():
+                row.class_name = 'updated'
+
+    npt.assert_equal(change_tracker.flushes, flushes + 2)
+    npt.assert_equal(len(change_tracker.sent[-1]), 3 * len(rows))
+    npt.assert_equal(rows[-1]._style_string, None)
@@ -1,5 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import numpy.testing as npt
-from electripy.elements import Button, Element, Image, Paragraph
+from electripy import elements
+from electripy import diff
+from electripy.elements import (Button, ConsoleParagraph, Element, Image,
+                                Paragraph, StreamImage, VirtualGrid,
+                                VirtualList)
+from electripy.streaming import DROP_OLDEST
+from electripy.transport import (FrameChannel, read_message, socket_pair,
+                                 unpack_frame)
 
 
 def test_element():
@@ -112,6 +122,29 @@ def test_paragraph():
     npt.assert_equal(para.text, 'This is a new paragraph')
 
 
+def test_console_paragraph():
+    console = ConsoleParagraph('Started', max_lines=3)
+    npt.assert_equal(console.lines, ['Started'])
+    npt.assert_equal(console._parse_style()['white-space'], 'pre-wrap')
+    npt.assert_equal(console.attributes['data-max-lines'], 3)
+
+    console.append('Line 1')
+    console.append('Line 2\nLine 3')
+    npt.assert_equal(console.lines, ['Line 1', 'Line 2', 'Line 3'])
+    npt.assert_equal(console.text, 'Line 1\nLine 2\nLine 3')
+    console.append('\n'.join(f'Line {idx}' for idx in range(4, 100)))
+    npt.assert_equal(console.lines, ['Line 97', 'Line 98', 'Line 99'])
+
+    clone = console.clone()
+    clone.append('Cloned')
+    npt.assert_equal(clone.lines, ['Line 98', 'Line 99', 'Cloned'])
+    npt.assert_equal(console.lines, ['Line 97', 'Line 98', 'Line 99'])
+
+    console.text = ''
+    npt.assert_equal(console.lines, [])
+    npt.assert_raises(ValueError, ConsoleParagraph, max_lines=0)
+
+
 def test_image():
     url_image = Image(src="https://img.icons8.com/ios-glyphs/50/000000/python.png",
                       class_name="python-icon", maintain_aspect=True)
@@ -136,3 +169,256 @@ def test_image():
 
     npt.assert_equal(force_img_size_style['width'], '100px')
     npt.assert_equal(force_img_size_style['height'], '100px')
+
+
+def test_element_style():
+    para = Paragraph('Styled paragraph', font_size=12, position=(10, 20))
+
+    npt.assert_equal(
+        para.style, 'position: absolute; left: 10px; bottom: 20px; font-size: 12px')
+    npt.assert_equal(para.attributes['style'], para.style)
+
+    cached_style = para.style
+    npt.assert_equal(para.style is cached_style, True)
+
+    para.add_style({'color': 'red', 'left': '5px'})
+    npt.assert_equal(para._parse_style()['left'], '5px')
+    npt.assert_equal(para._parse_style()['color'], 'red')
+    npt.assert_equal(para.attributes['style'].endswith('color: red'), True)
+    npt.assert_equal('left: 5px' in para.style, True)
+
+
+def test_lazy_image(image_dir):
+    lazy_img = Image(src=str(image_dir / 'large.jpg'), size=(100, 100),
+                     lazy=True)
+
+    npt.assert_equal(lazy_img.size, (100, 75))
+    npt.assert_equal(lazy_img._img_data, None)
+
+    img_style = lazy_img._parse_style()
+    npt.assert_equal(img_style['width'], '100px')
+    npt.assert_equal(img_style['height'], '75px')
+
+    npt.assert_equal(lazy_img.img_data.size, (100, 75))
+    npt.assert_equal(lazy_img.img_data is lazy_img.img_data, True)
+
+    eager_img = Image(src=str(image_dir / 'tall.png'), size=(100, 50))
+    npt.assert_equal(eager_img._img_data.size, (25, 50))
+
+
+def test_button_prefetch_icons(monkeypatch, asset_server, asset_cache,
+                               variant_cache):
+    monkeypatch.setitem(elements.ICON_URLS, 'add',
+                        asset_server.url('icon_0.png'))
+    monkeypatch.setitem(elements.ICON_URLS, 'save',
+                        asset_server.url('icon_1.png'))
+
+    Button.prefetch_icons(['add', 'save'])
+    npt.assert_equal(asset_server.requests, 2)
+
+    add_btn = Button('Add', icon_name='add')
+    save_btn = Button('Save', icon_name='save')
+
+    npt.assert_equal(asset_server.requests, 2)
+    npt.assert_equal(variant_cache.misses, 2)
+    npt.assert_equal(add_btn.icon.size, (50, 50))
+    npt.assert_equal(save_btn.icon.img_data.size, (50, 50))
+
+
+def test_stream_image():
+    sink, client = socket_pair()
+    reader = ThreadPoolExecutor(max_workers=1)
+    stream_img = StreamImage(size=(100, 100), channel=FrameChannel([sink]),
+                             drop_policy=DROP_OLDEST, max_frames=4)
+
+    message = reader.submit(read_message, client)
+    stream_img.push(np.ones((50, 200, 3)))
+    frame = unpack_frame(message.result(timeout=5))
+    stream_img.wait(timeout=5)
+
+    npt.assert_equal(stream_img.size, (100, 25))
+    npt.assert_equal(stream_img._parse_style()['height'], '25px')
+    npt.assert_equal(stream_img.img_data.shape, (25, 100, 3))
+    npt.assert_equal(stream_img.img_data.dtype, np.uint8)
+    npt.assert_equal((frame['id'], frame['width']), (stream_img.id, 100))
+
+    frames = (np.full((50, 200), idx, np.uint8) for idx in range(3))
+    messages = [reader.submit(read_message, client) for _ in range(3)]
+    stream_img.feed(frames).join()
+    npt.assert_equal([unpack_frame(message.result(timeout=5))['seq']
+                      for message in messages], [2, 3, 4])
+    stream_img.wait(timeout=5)
+    npt.assert_equal(stream_img.img_data[0, 0], 2)
+
+    stream_img.close()
+
+
+def test_reparent_children():
+    first = Paragraph('first')
+    second = Paragraph('second')
+    rows = [Paragraph(f'row {idx}', parent=first) for idx in range(4)]
+    npt.assert_equal(first.find_all(class_name='row'), [])
+
+    second.add_child(rows[1], (0, 0))
+    npt.assert_equal(first.children, [rows[0], rows[2], rows[3]])
+    npt.assert_equal(second.children, [rows[1]])
+    npt.assert_equal(rows[1].parent, second)
+
+    first.add_child(rows[1], (0, 0), index=0)
+    first.move_child(rows[3], 1)
+    npt.assert_equal(first.children, [rows[1], rows[3], rows[0], rows[2]])
+    npt.assert_equal(len(second.children), 0)
+
+    first.index
+    late_row = Paragraph('late', parent=rows[0], class_name='row')
+    npt.assert_equal(first.find_all(class_name='row'), [late_row])
+
+    with npt.assert_raises(ValueError):
+        late_row.add_child(first, (0, 0))
+    with npt.assert_raises(ValueError):
+        second.remove_child(rows[0])
+    with npt.assert_raises(ValueError):
+        second.add_child(rows[0], (2.0, 0.5))
+    with npt.assert_raises(ValueError):
+        second.add_child(rows[0], (1, 2, 3))
+    with npt.assert_raises(ValueError):
+        second.add_child(rows[0], 'top')
+    with npt.assert_raises(TypeError):
+        second.add_child(rows[0], (0, 0), index='first')
+    npt.assert_equal(rows[0].parent, first)
+    npt.assert_equal(first.children, [rows[1], rows[3], rows[0], rows[2]])
+    npt.assert_equal(len(second.children), 0)
+
+    first.clear_children()
+    npt.assert_equal(len(first.children), 0)
+    npt.assert_equal(all(row.parent is None for row in rows), True)
+    npt.assert_equal(first.find_all(class_name='row'), [])
+
+
+def test_add_children():
+    grid = Paragraph('grid')
+    cells = [Paragraph(f'cell {idx}') for idx in range(6)]
+    positions = np.stack(np.meshgrid(np.linspace(0, 1, 3),
+                                     np.linspace(0, 0.5, 2)), -1).reshape(-1, 2)
+    grid.add_children(cells, positions)
+
+    npt.assert_equal(grid.children, cells)
+    npt.assert_equal(grid._parse_style()['position'], 'relative')
+    for cell, position in zip(cells, positions):
+        expected = Paragraph('expected')
+        Paragraph('parent').add_child(expected, tuple(position))
+        npt.assert_equal(cell._parse_style(), expected._parse_style())
+        npt.assert_equal(cell.position, expected.position)
+        npt.assert_equal(cell.parent, grid)
+
+    scatter = Paragraph('scatter')
+    scatter.add_children(cells[:2], [(10, 20), (0.5, 0.5)],
+                         relative=[False, True])
+    npt.assert_equal(cells[0].style.startswith(
+        'position: absolute; left: 10.0px; bottom: 20.0px'), True)
+    npt.assert_equal(cells[1]._parse_style()['left'], '50%')
+    npt.assert_equal(grid.children, cells[2:])
+
+    with npt.assert_raises(ValueError):
+        scatter.add_children(cells[2:4], [(0.5, 0.5), (1.5, 0.5)])
+    with npt.assert_raises(ValueError):
+        scatter.add_children(cells[2:4], [(0, 0)])
+    with npt.assert_raises(ValueError):
+        scatter.add_children([cells[2], cells[2]], [(0, 0), (1, 1)])
+    with npt.assert_raises(ValueError):
+        cells[0].add_children([scatter], [(0, 0)])
+    npt.assert_equal(grid.children, cells[2:])
+
+
+def test_element_slots(image_dir):
+    para = Paragraph('slotted')
+    img = Image(src=str(image_dir / 'icon.png'), lazy=True)
+    btn = Button('slotted')
+
+    for element in (para, img, btn, btn.paragraph):
+        npt.assert_equal(hasattr(element, '__dict__'), False)
+    with npt.assert_raises(AttributeError):
+        para.undeclared = True
+
+    npt.assert_equal(btn.icon_url_dict is Button('other').icon_url_dict,
+                     True)
+    npt.assert_equal(btn.icon_url_dict is elements.ICON_URLS, True)
+
+
+def test_virtual_list(change_tracker):
+    items = [f'Line {idx}' for idx in range(1000000)]
+    log = VirtualList(items, row_height=20, size=(300, 100), overscan=2)
+
+    npt.assert_equal(log.visible_range, range(0, 7))
+    npt.assert_equal(len(log.children), 7)
+    npt.assert_equal(log.attributes['data-content-height'], 20000000)
+    npt.assert_equal(log.rows[0].text, 'Line 0')
+    npt.assert_equal(log.rows[0].position, (0, 20000000 - 20))
+
+    diff.mount(log)
+    change_tracker.flush()
+    rows = set(log.children)
+    log.scroll_to(500000 * 20)
+    npt.assert_equal(log.visible_range, range(499998, 500007))
+    npt.assert_equal(log.rows[500000].text, 'Line 500000')
+    npt.assert_equal(set(log.children) >= rows, True)
+    ops = change_tracker.flush()
+    npt.assert_equal({op[0] for op in ops},
+                     {diff.SET_ATTR, diff.SET_STYLE, diff.SET_TEXT,
+                      diff.INSERT})
+
+    rows = set(log.children)
+    log.scroll_to(500010 * 20)
+    npt.assert_equal(set(log.children), rows)
+    ops = change_tracker.flush()
+    npt.assert_equal(diff.INSERT in {op[0] for op in ops}, False)
+
+    log.scroll_to(10 ** 12)
+    npt.assert_equal(log.visible_range, range(999993, 1000000))
+    npt.assert_equal(len(log.children), 7)
+
+    items[999999] = 'Edited'
+    log.refresh()
+    npt.assert_equal(log.rows[999999].text, 'Edited')
+
+    lines = VirtualList(lambda idx: idx * 2, length=3, size=(300, 100))
+    npt.assert_equal([row.text for row in lines.children], ['0', '2', '4'])
+    lines.length = 0
+    lines.refresh()
+    npt.assert_equal(lines.children, [])
+
+    with npt.assert_raises(ValueError):
+        VirtualList(lambda idx: idx)
+    with npt.assert_raises(ValueError):
+        VirtualList(items, create_row=Paragraph)
+
+    elements.scroll_virtual(log.id, 0)
+    npt.assert_equal(log.rows[0].text, 'Line 0')
+
+
+def test_virtual_grid():
+    created = []
+
+    def create_cell(item):
+        created.append(item)
+        return Paragraph(item)
+
+    def update_cell(cell, item):
+        cell.text = item
+
+    grid = VirtualGrid(lambda idx: f'Cell {idx}', create_cell, update_cell,
+                       cell_size=(100, 50), size=(400, 100), overscan=1,
+                       length=10 ** 6)
+    npt.assert_equal(grid.columns, 4)
+    npt.assert_equal(grid.visible_range, range(0, 12))
+    npt.assert_equal(grid.rows[5].position, (100, 250000 * 50 - 100))
+
+    grid.scroll_to_index(400)
+    npt.assert_equal(grid.visible_range, range(396, 412))
+    npt.assert_equal(grid.rows[401].text, 'Cell 401')
+    npt.assert_equal(len(created), 16)
+
+    clone = grid.clone()
+    npt.assert_equal(len(clone.rows), 16)
+    npt.assert_equal(clone.rows[401].parent is clone, True)
+    npt.assert_equal(clone.rows[401].text, 'Cell 401')
@@ -0,0 +1,75 @@
+import threading
+
+import numpy.testing as npt
+from electripy import events
+from electripy.elements import Button, Paragraph
+from electripy.events import PRESS, EventBus
+
+
+def test_button_press(event_bus):
+    presses = []
+    first = Button('First', press_callback=lambda: presses.append('first'))
+    second = Button('Second', press_callback=lambda: presses.append('second'))
+    Button('Inert')
+
+    events.dispatch_events([[second.id, PRESS, None], [first.id, PRESS]])
+    npt.assert_equal(presses, ['second', 'first'])
+    npt.assert_equal(event_bus.dispatched, 2)
+
+    event_bus.dispatch('missing', PRESS)
+    event_bus.dispatch(first.id, 'hover')
+    npt.assert_equal(event_bus.unhandled, 2)
+
+
+def test_handlers(event_bus):
+    label = Paragraph('Label')
+    received = []
+
+    def handler(event):
+        received.append((event.element, event.type, event.detail))
+
+    label.on('hover', handler)
+    label.on('hover', lambda event: received.append('second'))
+    event_bus.dispatch(label.id, 'hover', {'x': 1})
+    npt.assert_equal(received, [(label, 'hover', {'x': 1}), 'second'])
+
+    label.off('hover', handler)
+    event_bus.dispatch(label.id, 'hover')
+    npt.assert_equal(received[-1], 'second')
+    npt.assert_equal(len(received), 3)
+
+    label.off()
+    npt.assert_equal(event_bus.handlers(label, 'hover'), ())
+
+    errors = []
+    event_bus.on_error = lambda event, error: errors.append(error)
+    label.on('hover', lambda event: 1 / 0)
+    [future] = event_bus.dispatch(label.id, 'hover')
+    npt.assert_equal(isinstance(future.exception(), ZeroDivisionError), True)
+    npt.assert_equal((event_bus.errors, len(errors)), (1, 1))
+
+
+def test_thread_pool():
+    release = threading.Event()
+    started = threading.Barrier(3, timeout=5)
+
+    def slow(event):
+        started.wait()
+        release.wait(5)
+        return threading.current_thread().name
+
+    with EventBus(max_workers=2) as bus:
+        labels = [Paragraph(f'Label {idx}') for idx in range(2)]
+        for label in labels:
+            bus.on(label, 'slow', slow)
+
+        futures = bus.dispatch_batch([[label.id, 'slow']
+                                      for label in labels])
+        started.wait()
+        npt.assert_equal([future.done() for future in futures],
+                         [False, False])
+        release.set()
+        names = {future.result(5) for future in futures}
+        npt.assert_equal(len(names), 2)
+        npt.assert_equal(all(name.startswith('electripy-events')
+                             for name in names), True)
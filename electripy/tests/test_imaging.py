@@ -0,0 +1,115 @@
+import os
+import shutil
+import time
+
+import numpy.testing as npt
+from electripy import imaging
+from electripy.elements import Image
+from electripy.imaging import (VariantCache, decode_image, fit_size,
+                               prefetch_images, read_size, source_digest)
+from PIL import JpegImagePlugin
+
+
+def test_fit_size():
+    npt.assert_equal(fit_size((200, 100), (100, 50)), (100, 50))
+    npt.assert_equal(fit_size((100, 200), (100, 50)), (25, 50))
+    npt.assert_equal(fit_size((50, 50), (100, 50)), (50, 50))
+    npt.assert_equal(fit_size((50, 50), (100, 50), maintain_aspect=False),
+                     (100, 50))
+
+
+def test_decode_image(image_dir, monkeypatch):
+    large_jpg = str(image_dir / 'large.jpg')
+    npt.assert_equal(read_size(large_jpg), (2000, 1500))
+
+    draft_scales = []
+    _draft = JpegImagePlugin.JpegImageFile.draft
+
+    def draft(self, mode, size):
+        result = _draft(self, mode, size)
+        draft_scales.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, 'draft', draft)
+
+    img = decode_image(large_jpg, (100, 75))
+    npt.assert_equal(img.size, (100, 75))
+    npt.assert_equal(draft_scales, [(250, 188)])
+
+    img = decode_image(str(image_dir / 'wide.png'), (50, 25))
+    npt.assert_equal(img.size, (50, 25))
+    npt.assert_equal(img.getpixel((10, 10)), (0, 255, 0))
+
+
+def test_variant_cache(image_dir, tmp_path, monkeypatch):
+    variant_cache = VariantCache()
+    wide_png = str(image_dir / 'wide.png')
+    wide_copy = str(tmp_path / 'wide_copy.png')
+    shutil.copy(wide_png, wide_copy)
+
+    npt.assert_equal(source_digest(wide_png), source_digest(wide_copy))
+
+    imaging._digests.clear()
+    monkeypatch.setattr(imaging, 'MAX_DIGESTS', 2)
+    copies = [str(tmp_path / f'wide_{idx}.png') for idx in range(5)]
+    for copy in copies:
+        shutil.copy(wide_png, copy)
+        source_digest(copy)
+    npt.assert_equal(len(imaging._digests), 2)
+    npt.assert_equal([key[0] for key in imaging._digests],
+                     [os.path.realpath(copy) for copy in copies[-2:]])
+
+    img = variant_cache.get(wide_png, (50, 25))
+    npt.assert_equal(img.size, (50, 25))
+    npt.assert_equal(variant_cache.get(wide_copy, (50, 25)) is img, True)
+    npt.assert_equal(variant_cache.get(wide_png, (50, 25), False) is img,
+                     False)
+
+    npt.assert_equal(variant_cache.stats['hits'], 1)
+    npt.assert_equal(variant_cache.stats['misses'], 2)
+    npt.assert_equal(variant_cache.stats['nbytes'], 2 * 50 * 25 * 3)
+
+    small_cache = VariantCache(max_bytes=50 * 25 * 3)
+    small_cache.get(wide_png, (50, 25))
+    small_cache.get(wide_png, (20, 10))
+    npt.assert_equal(small_cache.evictions, 1)
+    npt.assert_equal(len(small_cache), 1)
+    npt.assert_equal(small_cache.nbytes, 20 * 10 * 3)
+
+
+def test_image_shares_variants(image_dir, variant_cache):
+    toolbar = [Image(src=str(image_dir / 'icon.png'), size=(24, 24))
+               for _ in range(100)]
+
+    npt.assert_equal(variant_cache.misses, 1)
+    npt.assert_equal(variant_cache.hits, 99)
+    npt.assert_equal(len({id(icon.img_data) for icon in toolbar}), 1)
+
+    lazy_icon = Image(src=str(image_dir / 'icon.png'), size=(24, 24),
+                      lazy=True)
+    npt.assert_equal(variant_cache.hits, 99)
+    npt.assert_equal(lazy_icon.img_data is toolbar[0].img_data, True)
+    npt.assert_equal(variant_cache.hits, 100)
+
+
+def test_prefetch_images(asset_server, asset_cache, variant_cache):
+    asset_server.latency = 0.2
+    sources = [asset_server.url(f'icon_{idx}.png') for idx in range(16)]
+
+    start = time.perf_counter()
+    images = prefetch_images(sources, size=(24, 24), max_workers=16)
+    elapsed = time.perf_counter() - start
+
+    npt.assert_equal(elapsed < 16 * asset_server.latency / 2, True)
+    npt.assert_equal(asset_server.requests, 16)
+    npt.assert_equal(asset_cache.misses, 16)
+    npt.assert_equal(variant_cache.misses, 16)
+
+    icons = [Image(src=src, size=(24, 24)) for src in sources]
+    npt.assert_equal(asset_server.requests, 16)
+    npt.assert_equal(variant_cache.misses, 16)
+    npt.assert_equal(icons[3].img_data is images[sources[3]], True)
+
+    futures = prefetch_images(sources[:2], size=(24, 24), wait=False)
+    npt.assert_equal(futures[sources[0]].result() is images[sources[0]],
+                     True)
@@ -0,0 +1,76 @@
+import numpy.testing as npt
+from electripy.elements import Paragraph
+from electripy.layout import parse_length
+
+
+def panel(width, height, **kwargs):
+    element = Paragraph('panel', **kwargs)
+    element.add_style({'width': f'{width}px', 'height': f'{height}px'})
+    return element
+
+
+def test_parse_length():
+    npt.assert_equal(parse_length('12px'), (12.0, False))
+    npt.assert_equal(parse_length('50%'), (0.5, True))
+    npt.assert_equal(parse_length('2em'), (0.0, False))
+    npt.assert_equal(parse_length(None), (0.0, False))
+
+
+def test_boxes():
+    root = panel(800, 600, position=(10, 20))
+    sidebar = panel(200, 600)
+    content = panel(400, 300)
+    label = panel(100, 20)
+    root.add_child(sidebar, (0, 0))
+    root.add_child(content, (0.5, 0.5))
+    content.add_child(label, (0.25, 0.1))
+
+    npt.assert_equal(root.box, (10, 20, 800, 600))
+    npt.assert_equal(sidebar.box, (10, 20, 200, 600))
+    npt.assert_equal(content.box, (410, 320, 400, 300))
+    npt.assert_equal(label.box, (510, 350, 100, 20))
+
+    content.add_style({'width': '200px'})
+    npt.assert_equal(label.box, (460, 350, 100, 20))
+    root.position = (0, 0)
+    npt.assert_equal(label.box, (450, 330, 100, 20))
+    content.add_style({'color': 'red'})
+    npt.assert_equal(root.layout._stale, False)
+
+    root.remove_child(content)
+    npt.assert_equal(len(root.layout), 2)
+    npt.assert_equal(content.box, (0, 0, 200, 300))
+    npt.assert_equal(label.box, (50, 30, 100, 20))
+    sidebar.add_children([content], [(100, 0)])
+    npt.assert_equal(len(root.layout), 4)
+    npt.assert_equal(label.box, (150, 30, 100, 20))
+
+    boxes = root.layout.boxes()
+    npt.assert_equal(boxes[label.id], label.box)
+    npt.assert_equal(len(boxes), 4)
+
+    root.add_style({'left': '10%'})
+    root.layout.viewport = (1000, 1000)
+    npt.assert_equal(label.box, (250, 30, 100, 20))
+
+
+def test_hit_test():
+    root = panel(800, 600)
+    left = panel(300, 300, parent=root)
+    right = panel(300, 300)
+    button = panel(50, 50)
+    root.add_child(right, (250, 0))
+    right.add_child(button, (10, 10))
+
+    layout = root.layout
+    npt.assert_equal(layout.hit_test(100, 100) is left, True)
+    npt.assert_equal(layout.hit_test(270, 20) is button, True)
+    npt.assert_equal(layout.hit_test(700, 500) is root, True)
+    npt.assert_equal(layout.hit_test(900, 100), None)
+
+    npt.assert_equal(layout.overlaps(left), [right, button])
+    npt.assert_equal(layout.overlaps(button), [left])
+    npt.assert_equal(layout.query((550, 0, 10, 10)), [root])
+
+    right.position = (300, 0)
+    npt.assert_equal(layout.overlaps(left), [])
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy.testing as npt
+from electripy import diff
+from electripy.elements import Paragraph, VirtualList, scroll_virtual
+from electripy.mutations import MutationQueue
+from electripy.scheduler import UpdateScheduler
+
+
+def test_mutation_queue(change_tracker):
+    root = Paragraph('Root')
+    labels = [Paragraph(f'Label {idx}', parent=root) for idx in range(8)]
+    diff.mount(root)
+    change_tracker.flush()
+
+    queue = MutationQueue()
+    seen = [[] for _ in labels]
+
+    def produce(idx):
+        for value in range(1000):
+            queue.post(seen[idx].append, value)
+            queue.assign(labels[idx], text=f'Value {value}')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(produce, range(8)))
+    npt.assert_equal(len(queue), 16000)
+
+    npt.assert_equal(queue.drain(max_mutations=10), 10)
+    npt.assert_equal(queue.drain(), 15990)
+    npt.assert_equal(queue.applied, 16000)
+    npt.assert_equal(seen, [list(range(1000))] * 8)
+    npt.assert_equal([label.text for label in labels], ['Value 999'] * 8)
+    npt.assert_equal(len(change_tracker.flush()), 8)
+
+    future = queue.submit(root.add_child, Paragraph('Added'))
+    failed = queue.submit(root.remove_child, Paragraph('Missing'))
+    cancelled = queue.submit(labels[0].add_style, {'color': 'red'})
+    cancelled.cancel()
+    queue.drain()
+    npt.assert_equal(future.result(), None)
+    npt.assert_equal(isinstance(failed.exception(), ValueError), True)
+    npt.assert_equal(queue.errors, 1)
+    npt.assert_equal('color' in labels[0]._style, False)
+
+    worker = ThreadPoolExecutor(max_workers=1)
+    with npt.assert_raises(RuntimeError):
+        worker.submit(queue.drain).result()
+    worker.shutdown()
+
+
+def test_debug_mode(change_tracker):
+    label = Paragraph('Label')
+    diff.mount(label)
+    queue = MutationQueue(debug=True)
+    queue.drain()
+    npt.assert_equal(change_tracker.owner, threading.get_ident())
+
+    def mutate_directly():
+        Paragraph('Detached').text = 'Allowed'
+        label.text = 'Torn'
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with npt.assert_raises(RuntimeError):
+            executor.submit(mutate_directly).result()
+        executor.submit(queue.assign, label, text='Queued').result()
+    npt.assert_equal(label.text, 'Label')
+
+    queue.drain()
+    npt.assert_equal(label.text, 'Queued')
+    queue.release()
+    npt.assert_equal(change_tracker.owner, None)
+
+
+def test_scheduler_drain(change_tracker):
+    label = Paragraph('Label')
+    diff.mount(label)
+
+    sent = []
+    queue = MutationQueue(debug=True)
+    scheduler = UpdateScheduler(
+        rate=200, send=lambda ops, ack: (sent.append(ops), ack()),
+        mutation_queue=queue)
+
+    with scheduler:
+        for idx in range(100):
+            queue.assign(label, text=f'Value {idx}')
+        done = queue.submit(lambda: None)
+        done.result(5)
+    npt.assert_equal(queue.owner, None)
+    npt.assert_equal(label.text, 'Value 99')
+    npt.assert_equal(sent[-1][-1], [diff.SET_TEXT, label.id, 'Value 99'])
+
+
+def test_handlers_off_owner(change_tracker, event_bus, async_bridge,
+                            mutation_queue):
+    root = Paragraph('Root')
+    label = Paragraph('Label', parent=root)
+    diff.mount(root)
+    event_bus.max_workers = 2
+    threads = []
+    pressed = threading.Event()
+    release = threading.Event()
+
+    def on_press(event):
+        threads.append(threading.get_ident())
+        event.element.text = 'Pressed'
+        pressed.set()
+        release.wait(5)
+
+    async def on_hover(event):
+        await asyncio.sleep(0.01)
+        event.element.add_style({'color': 'red'})
+        await asyncio.sleep(0)
+        event.element.text = 'Hovered'
+
+    root.on('press', on_press)
+    root.on('hover', on_hover)
+    scheduler = UpdateScheduler(
+        rate=200, send=lambda ops, ack: ack(),
+        mutation_queue=mutation_queue)
+
+    with scheduler:
+        mutation_queue.submit(lambda: None).result(5)
+        owner = mutation_queue.owner
+        [future] = event_bus.dispatch(root.id, 'press')
+        npt.assert_equal(pressed.wait(5), True)
+        mutation_queue.assign(label, text='Queued')
+        mutation_queue.submit(lambda: None).result(1)
+        npt.assert_equal(label.text, 'Queued')
+        npt.assert_equal(future.done(), False)
+
+        release.set()
+        future.result(5)
+        npt.assert_equal(threads[0] != owner, True)
+        npt.assert_equal(root.text, 'Pressed')
+
+        for future in event_bus.dispatch(root.id, 'hover'):
+            future.result(5)
+        npt.assert_equal(root.text, 'Hovered')
+        npt.assert_equal(root._style['color'], 'red')
+
+    npt.assert_equal(event_bus.errors, 0)
+    npt.assert_equal(change_tracker.delegate, None)
+
+
+def test_scroll_virtual_on_owner(change_tracker, mutation_queue):
+    rows = VirtualList([f'Row {idx}' for idx in range(1000)],
+                       size=(100, 40))
+    diff.mount(rows)
+    scheduler = UpdateScheduler(
+        rate=200, send=lambda ops, ack: ack(),
+        mutation_queue=mutation_queue)
+
+    with scheduler:
+        mutation_queue.submit(lambda: None).result(5)
+        scroll_virtual(rows.id, 10 ** 6)
+        mutation_queue.submit(lambda: None).result(5)
+        npt.assert_equal(rows.visible_range[-1], 999)
+        npt.assert_equal(rows.rows[999].text, 'Row 999')
+
+    npt.assert_equal(mutation_queue.errors, 0)
@@ -0,0 +1,30 @@
+import gc
+
+import numpy.testing as npt
+from electripy.elements import Paragraph
+from electripy.registry import allocate_id, get_element, live_elements
+
+
+def test_allocate_id():
+    ids = {allocate_id() for _ in range(1000)}
+
+    npt.assert_equal(len(ids), 1000)
+    npt.assert_equal(all(element_id[0].isalpha() for element_id in ids), True)
+
+
+def test_element_registry():
+    paragraphs = [Paragraph('Row', class_name='row') for _ in range(100)]
+    ids = [para.id for para in paragraphs]
+
+    npt.assert_equal(len(set(ids)), 100)
+    npt.assert_equal(paragraphs[0].attributes['id'], ids[0])
+    npt.assert_equal(get_element(ids[42]) is paragraphs[42], True)
+
+    gc.collect()
+    n_live = live_elements()
+    del paragraphs
+    gc.collect()
+
+    npt.assert_equal(any(get_element(element_id) for element_id in ids),
+                     False)
+    npt.assert_equal(live_elements(), n_live - 100)
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import eel
+import numpy.testing as npt
+from electripy import diff
+from electripy.elements import Paragraph
+from electripy.scheduler import UpdateScheduler
+
+
+def test_scheduler_tick(change_tracker):
+    root = Paragraph('Root')
+    label = Paragraph('Label', parent=root)
+    diff.mount(root)
+
+    sent = []
+    scheduler = UpdateScheduler(max_in_flight=1,
+                                send=lambda ops, ack: sent.append(ops))
+
+    npt.assert_equal(scheduler.tick()[0][0], diff.INSERT)
+    npt.assert_equal(scheduler.tick(), [])
+
+    for idx in range(1000):
+        label.text = f'Value {idx}'
+        label.position = (idx, 0)
+    npt.assert_equal(scheduler.tick(), None)
+    npt.assert_equal(scheduler.skipped, 1)
+
+    scheduler.ack()
+    ops = scheduler.tick()
+    npt.assert_equal(ops, [
+        [diff.SET_ATTR, label.id, {'position': (999, 0)}],
+        [diff.SET_STYLE, label.id, {'left': '999px'}],
+        [diff.SET_TEXT, label.id, 'Value 999'],
+    ])
+
+    metrics = scheduler.metrics
+    npt.assert_equal(metrics['flushes'], 2)
+    npt.assert_equal(metrics['in_flight'], 1)
+    npt.assert_equal(metrics['updates'], 2998)
+    npt.assert_equal(metrics['coalesced'], 2997)
+    npt.assert_equal(metrics['dropped'], 2995)
+    npt.assert_equal(metrics['max_latency'] >= metrics['mean_latency'], True)
+
+
+def test_scheduler_thread(change_tracker):
+    root = Paragraph('Root')
+    labels = [Paragraph('Label', parent=root) for _ in range(10)]
+    diff.mount(root)
+
+    sent = []
+    scheduler = UpdateScheduler(
+        rate=100, send=lambda ops, ack: (sent.append(ops), ack()))
+
+    def produce():
+        for idx in range(20000):
+            labels[idx % 10].text = f'Value {idx}'
+
+    with scheduler:
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join()
+
+    final_text = {}
+    for ops in sent:
+        for op in ops:
+            if op[0] == diff.SET_TEXT:
+                final_text[op[1]] = op[2]
+
+    npt.assert_equal(final_text[labels[9].id], 'Value 19999')
+    npt.assert_equal(scheduler.flushes < 20000 / 10, True)
+    npt.assert_equal(scheduler.metrics['dropped'] > 0, True)
+    npt.assert_equal(scheduler.in_flight, 0)
+
+
+def test_scheduler_tick_between_record_and_write(change_tracker):
+    root = Paragraph('Root')
+    label = Paragraph('Old', parent=root)
+    diff.mount(root)
+    change_tracker.flush()
+
+    scheduler = UpdateScheduler(
+        rate=100, change_tracker=change_tracker,
+        send=lambda ops, ack: (change_tracker.sent.append(ops), ack()))
+    ticks = []
+    record_text = change_tracker.record_text
+
+    def record_then_tick(element):
+        record_text(element)
+        tick = threading.Thread(target=scheduler.tick, args=(True,))
+        tick.start()
+        tick.join(0.2)
+        ticks.append(tick)
+
+    change_tracker.record_text = record_then_tick
+    label.text = 'New'
+    ticks[0].join()
+
+    texts = [op[2] for ops in change_tracker.sent for op in ops
+             if op[0] == diff.SET_TEXT]
+    npt.assert_equal(texts[-1], 'New')
+    npt.assert_equal(change_tracker.flush(), [])
+
+
+def test_scheduler_failures(change_tracker, monkeypatch):
+    root = Paragraph('Root')
+    label = Paragraph('Label', parent=root)
+    diff.mount(root)
+
+    scheduler = UpdateScheduler(max_in_flight=1, ack_timeout=0.05,
+                                send=lambda ops, ack: None)
+    scheduler.tick()
+    label.text = 'Lost'
+    npt.assert_equal(scheduler.tick(), None)
+    time.sleep(0.06)
+    npt.assert_equal(scheduler.tick(), [[diff.SET_TEXT, label.id, 'Lost']])
+    npt.assert_equal((scheduler.expired, scheduler.in_flight), (1, 1))
+
+    monkeypatch.setattr(eel, 'apply_patches', lambda ops: (
+        lambda callback, error_callback: error_callback('boom', 'stack')),
+        raising=False)
+    scheduler = UpdateScheduler(max_in_flight=1)
+    label.text = 'Rejected'
+    scheduler.tick()
+    npt.assert_equal(scheduler.in_flight, 0)
+
+    sent = []
+    errors = []
+
+    def send(ops, ack):
+        if not errors:
+            raise RuntimeError('Not initialized.')
+        sent.append(ops)
+        ack()
+
+    scheduler = UpdateScheduler(rate=200, send=send, on_error=errors.append)
+    label.text = 'Retried'
+    with scheduler:
+        label.position = (1, 1)
+        for _ in range(500):
+            if sent:
+                break
+            time.sleep(0.01)
+
+    npt.assert_equal(scheduler.errors, 1)
+    npt.assert_equal(type(errors[0]), RuntimeError)
+    npt.assert_equal([diff.SET_TEXT, label.id, 'Retried'] in sent[0], True)
+    npt.assert_equal(scheduler.in_flight, 0)
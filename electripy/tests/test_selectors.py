@@ -0,0 +1,75 @@
+import numpy.testing as npt
+from electripy.elements import Paragraph
+from electripy.selectors import parse_selector
+
+
+class Heading(Paragraph):
+    def __init__(self, text, class_name=None):
+        super(Heading, self).__init__(text, class_name=class_name)
+        self.name = 'Heading'
+
+
+def build_tree():
+    root = Paragraph('root', class_name='page')
+    toolbar = Paragraph('toolbar', class_name='toolbar row')
+    menu = Paragraph('menu', class_name='menu')
+    root.add_child(toolbar, (0, 0))
+    root.add_child(menu, (0, 0))
+
+    items = []
+    for parent in (toolbar, menu):
+        for idx in range(3):
+            item = Paragraph(f'item {idx}', class_name='item')
+            parent.add_child(item, (0, 0))
+            items.append(item)
+
+    title = Heading('title', class_name='item title')
+    menu.add_child(title, (0, 0))
+    return root, toolbar, menu, items, title
+
+
+def test_find():
+    root, toolbar, menu, items, title = build_tree()
+
+    npt.assert_equal(root.find_by_id(items[4].id), items[4])
+    npt.assert_equal(toolbar.find_by_id(items[4].id), None)
+    npt.assert_equal(root.find_all(class_name='item'), [*items, title])
+    npt.assert_equal(root.find_all(Heading), [title])
+    npt.assert_equal(len(root.find_all(Paragraph)), 10)
+    npt.assert_equal(root.find_all('Heading', class_name='title'), [title])
+    npt.assert_equal(menu.find_all(class_name='item'), [*items[3:], title])
+    npt.assert_equal(items[0].index is root.index, True)
+
+    extra = Paragraph('extra', class_name='item')
+    toolbar.add_child(extra, (0, 0))
+    items[1].class_name = 'item active'
+    menu.remove_child(title)
+    root.remove_child(menu)
+
+    npt.assert_equal(root.find_all(class_name='item'),
+                     [*items[:3], extra])
+    npt.assert_equal(root.find_all(class_name='active'), [items[1]])
+    npt.assert_equal(root.find_by_id(items[4].id), None)
+    npt.assert_equal(len(root.index), 6)
+    npt.assert_equal(menu.find_by_id(items[4].id), items[4])
+    npt.assert_equal(menu.index is root.index, False)
+
+
+def test_select():
+    root, toolbar, menu, items, title = build_tree()
+
+    npt.assert_equal(root.select('.item'), [*items, title])
+    npt.assert_equal(root.select('.toolbar .item'), items[:3])
+    npt.assert_equal(root.select('.page > .item'), [])
+    npt.assert_equal(root.select('.page > .menu > Heading.item'), [title])
+    npt.assert_equal(root.select(f'#{menu.id}, .toolbar'), [menu, toolbar])
+    npt.assert_equal(root.select('.row.toolbar'), [toolbar])
+    npt.assert_equal(menu.select('.page Paragraph.item'), items[3:])
+    npt.assert_equal(menu.select_one('Heading'), title)
+    npt.assert_equal(toolbar.select_one('Heading'), None)
+
+    npt.assert_equal(parse_selector('a > b c')[0][1:],
+                     [('>', ('b', None, ())), (' ', ('c', None, ()))])
+    for selector in ('', '> a', 'a >', 'a > > b', 'a,', 'a!b'):
+        with npt.assert_raises(ValueError):
+            parse_selector(selector)
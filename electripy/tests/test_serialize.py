@@ -0,0 +1,65 @@
+import io
+import json
+
+import numpy.testing as npt
+from electripy.elements import Paragraph
+from electripy.serialize import (from_bytes, iter_json, to_bytes, to_dict,
+                                 to_json, write_json)
+
+
+def build_tree():
+    root = Paragraph('root', class_name='root')
+    for idx in range(20):
+        child = Paragraph(f'child {idx}', class_name='child')
+        root.add_child(child, (idx, -idx))
+        child.add_child(Paragraph('leaf'), (0.5, 0.5))
+    return root
+
+
+def test_to_dict():
+    root = build_tree()
+    payload = to_dict(root)
+
+    npt.assert_equal(payload['id'], root.id)
+    npt.assert_equal(payload['attributes']['style'], root.style)
+    npt.assert_equal(len(payload['children']), 20)
+    npt.assert_equal(payload['children'][3]['text'], 'child 3')
+    npt.assert_equal(payload['children'][3]['children'][0]['children'], [])
+    npt.assert_equal(root.to_dict(), payload)
+
+
+def test_to_json():
+    root = build_tree()
+    payload = json.loads(json.dumps(to_dict(root)))
+
+    npt.assert_equal(json.loads(to_json(root)), payload)
+    npt.assert_equal(root.to_json(),
+                     json.dumps(payload, separators=(',', ':')))
+
+    chunks = list(iter_json(root, chunk_size=256))
+    npt.assert_equal(len(chunks) > 1, True)
+    npt.assert_equal(''.join(chunks), to_json(root))
+
+    stream = io.StringIO()
+    write_json(root, stream)
+    npt.assert_equal(stream.getvalue(), to_json(root))
+
+    deep = node = Paragraph('deep')
+    for _ in range(5000):
+        child = Paragraph('')
+        node.add_child(child, (0, 0))
+        node = child
+    npt.assert_equal(to_json(deep).count('"children":['), 5001)
+
+
+def test_to_bytes():
+    root = build_tree()
+    payload = json.loads(json.dumps(to_dict(root)))
+    data = to_bytes(root)
+
+    npt.assert_equal(from_bytes(data), payload)
+    npt.assert_equal(len(data) < len(to_json(root).encode()) / 2, True)
+    npt.assert_equal(from_bytes(root.to_bytes()), payload)
+
+    with npt.assert_raises(ValueError):
+        from_bytes(b'{}')
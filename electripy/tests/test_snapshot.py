@@ -0,0 +1,74 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+from electripy.elements import (ConsoleParagraph, Image, Paragraph,
+                                StreamImage, VirtualList)
+from electripy.registry import get_element
+from electripy.serialize import to_dict
+from electripy.snapshot import load_snapshot, save_snapshot
+
+
+def without_ids(payload):
+    attributes = dict(payload['attributes'])
+    attributes.pop('id')
+    return {'name': payload['name'], 'attributes': attributes,
+            'text': payload.get('text'),
+            'children': [without_ids(child)
+                         for child in payload['children']]}
+
+
+def test_snapshot(image_dir, tmp_path, monkeypatch):
+    root = Paragraph('Dashboard', class_name='root')
+    icon = Image(str(image_dir / 'icon.png'), size=(40, 40), parent=root)
+    wide = Image(str(image_dir / 'wide.png'), size=(100, 50))
+    root.add_child(wide, (50, 0))
+    console = ConsoleParagraph('Started', max_lines=10, parent=root)
+    console.append('Running')
+    feed = StreamImage(size=(20, 10), parent=root)
+    feed.img_data = np.arange(600, dtype=np.uint8).reshape(10, 20, 3)
+    rows = VirtualList([f'Row {idx}' for idx in range(100)],
+                       size=(100, 40), parent=root)
+    rows.add_style({'color': 'red'})
+
+    save_snapshot(root, tmp_path / 'ui.snapshot')
+    monkeypatch.setattr(Image, '_setup', None)
+    restored = load_snapshot(tmp_path / 'ui.snapshot')
+
+    npt.assert_equal(without_ids(to_dict(restored)),
+                     without_ids(to_dict(root)))
+    npt.assert_equal(restored.id != root.id, True)
+    npt.assert_equal(get_element(restored.id) is restored, True)
+    npt.assert_equal(restored.parent, None)
+
+    _icon, _wide, _console, _feed, _rows = restored.children
+    npt.assert_equal(_icon.parent is restored, True)
+    npt.assert_equal(_icon.img_data.size, icon.img_data.size)
+    npt.assert_equal(np.asarray(_icon.img_data), np.asarray(icon.img_data))
+    npt.assert_equal(np.asarray(_wide.img_data), np.asarray(wide.img_data))
+    npt.assert_equal(_wide.position, (50, 0))
+
+    _console.append('Restored')
+    npt.assert_equal(_console.lines, ['Started', 'Running', 'Restored'])
+    npt.assert_equal(console.lines, ['Started', 'Running'])
+
+    npt.assert_equal(_feed.img_data, feed.img_data)
+    npt.assert_equal(_feed.img_data.flags.writeable, False)
+    npt.assert_equal(_feed.stream is not feed.stream, True)
+    npt.assert_equal(_feed.stream.queue.maxsize, feed.stream.queue.maxsize)
+
+    npt.assert_equal(_rows.rows[0].text, 'Row 0')
+    npt.assert_equal(_rows.rows[0].parent is _rows, True)
+    npt.assert_equal(_rows.children[0] is _rows.rows[0], True)
+    _rows.scroll_to_index(50)
+    npt.assert_equal(_rows.rows[50].text, 'Row 50')
+    npt.assert_equal(_rows.box, rows.box)
+
+
+def test_snapshot_errors(tmp_path):
+    rows = VirtualList(lambda idx: f'Row {idx}', length=10)
+    with pytest.raises(ValueError):
+        save_snapshot(rows, tmp_path / 'rows.snapshot')
+
+    (tmp_path / 'other').write_bytes(b'not a snapshot at all')
+    with pytest.raises(ValueError):
+        load_snapshot(tmp_path / 'other')
@@ -0,0 +1,118 @@
+import asyncio
+import gc
+import threading
+
+import numpy as np
+import numpy.testing as npt
+from electripy.elements import StreamImage
+from electripy.streaming import DROP_OLDEST, LATEST, FrameQueue, FrameStream
+
+
+def test_frame_queue():
+    latest = FrameQueue(maxsize=2, drop_policy=LATEST)
+    oldest = FrameQueue(maxsize=2, drop_policy=DROP_OLDEST)
+    for frame in range(5):
+        latest.push(frame)
+        oldest.push(frame)
+
+    npt.assert_equal(latest.pop(), 4)
+    npt.assert_equal(latest.pop(timeout=0), None)
+    npt.assert_equal(latest.dropped, 4)
+
+    npt.assert_equal([oldest.pop(), oldest.pop()], [3, 4])
+    npt.assert_equal(oldest.dropped, 3)
+    npt.assert_equal(oldest.pushed, 5)
+
+    with npt.assert_raises(ValueError):
+        FrameQueue(drop_policy='newest')
+
+
+def test_frame_stream():
+    release = threading.Event()
+    shown = []
+
+    def convert(frame):
+        release.wait()
+        return frame * 10
+
+    stream = FrameStream(convert, shown.append, maxsize=1)
+    for frame in range(4):
+        stream.push(frame)
+    release.set()
+    npt.assert_equal(stream.wait(timeout=5), True)
+
+    npt.assert_equal(shown[-1], 30)
+    npt.assert_equal(len(shown) + stream.queue.dropped, 4)
+
+    async def frames():
+        for frame in range(4, 7):
+            yield frame
+            await asyncio.sleep(0.01)
+
+    stream.feed_async_in_thread(frames()).join()
+    npt.assert_equal(stream.wait(timeout=5), True)
+    npt.assert_equal(shown[-1], 60)
+
+    stream.close()
+    npt.assert_equal(stream._worker.is_alive(), False)
+
+
+def test_frame_stream_errors():
+    shown = []
+    failed = []
+    stream = FrameStream(lambda frame: frame.reshape(2, 2), shown.append,
+                         maxsize=4,
+                         on_error=lambda frame, error: failed.append(error))
+    stream.push(np.zeros(10))
+    stream.push(np.ones(4))
+    npt.assert_equal(stream.wait(timeout=5), True)
+
+    npt.assert_equal(shown, [np.ones((2, 2))])
+    npt.assert_equal(stream.errors, 1)
+    npt.assert_equal(isinstance(failed[0], ValueError), True)
+    npt.assert_equal(stream.running, True)
+    stream.close()
+
+
+def test_frame_stream_idle():
+    stream = FrameStream(lambda frame: frame, lambda frame: None)
+    stream._start()
+    queue = stream.queue
+    _push = queue.push
+
+    def push(frame):
+        def finish_frame():
+            with queue._condition:
+                if not queue._frames:
+                    stream._idle.set()
+
+        finisher = threading.Thread(target=finish_frame)
+        finisher.start()
+        finisher.join(0.1)
+        npt.assert_equal(stream._idle.is_set(), False)
+        _push(frame)
+
+    stream.close()
+    queue.push = push
+    stream.push(np.zeros(4))
+    npt.assert_equal(stream.wait(timeout=0), False)
+
+
+def test_stream_image_threads():
+    threads = threading.active_count()
+    images = [StreamImage(size=(10, 10)) for _ in range(50)]
+    npt.assert_equal(threading.active_count(), threads)
+
+    workers = []
+    for image in images[:5]:
+        image.stream.on_frame = lambda pixels: None
+        image.push(np.zeros((10, 10, 3)))
+        npt.assert_equal(image.wait(timeout=5), True)
+        workers.append(image.stream._worker)
+    npt.assert_equal(threading.active_count(), threads + 5)
+
+    del images, image
+    gc.collect()
+    for worker in workers:
+        worker.join(timeout=5)
+    npt.assert_equal(threading.active_count(), threads)
@@ -0,0 +1,65 @@
+import numpy.testing as npt
+from electripy import diff
+from electripy.elements import Button, Image, Paragraph
+from electripy.registry import get_element
+from electripy.templates import Template
+
+
+def test_clone(image_dir, variant_cache):
+    card = Paragraph('card', class_name='card')
+    card.add_style({'color': 'red'})
+    Paragraph('title', parent=card)
+    img = Image(src=str(image_dir / 'wide.png'), size=(50, 50), parent=card)
+
+    clone = card.clone(text='clone')
+    clone_img = clone.children[1]
+
+    npt.assert_equal((clone.text, card.text), ('clone', 'card'))
+    npt.assert_equal(len(clone.children), 2)
+    npt.assert_equal(clone.children[0].parent, clone)
+    npt.assert_equal(clone.id != card.id, True)
+    npt.assert_equal(get_element(clone_img.id), clone_img)
+    npt.assert_equal(clone._style is card._style, True)
+    npt.assert_equal(clone_img.img_data is img.img_data, True)
+    npt.assert_equal(variant_cache.misses, 1)
+    npt.assert_equal(clone.parent, None)
+
+    clone.add_style({'color': 'blue'})
+    npt.assert_equal((clone.style.count('blue'), card.style.count('red')),
+                     (1, 1))
+    card.add_style({'color': 'green'})
+    npt.assert_equal(clone._parse_style()['color'], 'blue')
+
+    with npt.assert_raises(AttributeError):
+        card.clone(undeclared=True)
+
+
+def test_template(change_tracker):
+    presses = []
+    template = Template(Button('Action', class_name='action'))
+    toolbar = Paragraph('toolbar')
+    diff.mount(toolbar)
+    change_tracker.flush()
+
+    buttons = template.instantiate(
+        [{'button_text': f'Action {idx}',
+          'press_callback': lambda idx=idx: presses.append(idx)}
+         for idx in range(3)],
+        parent=toolbar, positions=[(idx * 100, 0) for idx in range(3)])
+    extra = template(parent=toolbar, button_text='Extra')
+
+    npt.assert_equal(template.instances, 4)
+    npt.assert_equal(toolbar.children, [*buttons, extra])
+    npt.assert_equal(buttons[2].paragraph.text, 'Action 2')
+    npt.assert_equal(buttons[2].paragraph.parent, buttons[2])
+    npt.assert_equal(template.prototype.button_text, 'Action')
+    npt.assert_equal(buttons[1]._parse_style()['left'], '100px')
+    buttons[1].on_press()
+    npt.assert_equal(presses, [1])
+
+    ops = change_tracker.flush()
+    npt.assert_equal([op[0] for op in ops], [diff.INSERT] * 4)
+    npt.assert_equal(ops[0][3]['children'][0]['text'], 'Extra')
+
+    with npt.assert_raises(ValueError):
+        Template(buttons[0])
@@ -0,0 +1,141 @@
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import bottle
+import numpy as np
+import numpy.testing as npt
+from electripy import transport
+from electripy.elements import Image
+from electripy.transport import (FRAME_ROUTE, FrameChannel, WebSocketSink,
+                                 as_pixel_array, read_message, region_buffers,
+                                 socket_pair, unpack_frame)
+from electripy.ui import utils
+
+
+def test_region_buffers():
+    pixels = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+
+    [full] = region_buffers(pixels)
+    npt.assert_equal(np.shares_memory(np.asarray(full), pixels), True)
+    npt.assert_equal(full.nbytes, pixels.nbytes)
+
+    rows = region_buffers(pixels, (1, 1, 2, 3))
+    npt.assert_equal(len(rows), 3)
+    npt.assert_equal(all(np.shares_memory(np.asarray(row), pixels)
+                         for row in rows), True)
+    npt.assert_equal(b''.join(rows), pixels[1:4, 1:3].tobytes())
+
+    with npt.assert_raises(ValueError):
+        region_buffers(pixels, (4, 0, 4, 4))
+
+    npt.assert_equal(as_pixel_array(np.zeros((2, 2), np.uint8)).shape,
+                     (2, 2, 1))
+    with npt.assert_raises(ValueError):
+        as_pixel_array(np.zeros((2, 2, 3), np.float32))
+
+
+def test_frame_channel():
+    sink, client = socket_pair()
+    channel = FrameChannel([sink])
+    pixels = np.random.randint(0, 255, (240, 320, 4), dtype=np.uint8)
+    reader = ThreadPoolExecutor(max_workers=1)
+
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', pixels)
+    frame = unpack_frame(message.result())
+    npt.assert_equal((frame['id'], frame['seq']), ('e1', 1))
+    npt.assert_equal((frame['width'], frame['height'], frame['channels']),
+                     (320, 240, 4))
+    npt.assert_equal(frame['rect'], (0, 0, 320, 240))
+    npt.assert_equal(bytes(frame['pixels']), pixels.tobytes())
+
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', memoryview(pixels), rect=(10, 20, 30, 40))
+    frame = unpack_frame(message.result())
+    npt.assert_equal(frame['seq'], 2)
+    npt.assert_equal(frame['rect'], (10, 20, 30, 40))
+    npt.assert_equal(bytes(frame['pixels']),
+                     pixels[20:60, 10:40].tobytes())
+
+    npt.assert_equal(channel.frames_sent, 2)
+    npt.assert_equal(channel.bytes_sent, pixels.nbytes + 30 * 40 * 4)
+
+
+def test_image_send_pixels(image_dir):
+    sink, client = socket_pair()
+    channel = FrameChannel([sink])
+    img = Image(src=str(image_dir / 'wide.png'), size=(50, 25))
+    reader = ThreadPoolExecutor(max_workers=1)
+
+    message = reader.submit(read_message, client)
+    img.send_pixels(channel=channel)
+    frame = unpack_frame(message.result())
+
+    npt.assert_equal(frame['id'], img.id)
+    npt.assert_equal((frame['width'], frame['height'], frame['channels']),
+                     (50, 25, 3))
+    npt.assert_equal(bytes(frame['pixels'][:3]), bytes([0, 255, 0]))
+
+
+def test_websocket_sink():
+    pixels = np.random.randint(0, 255, (40, 60, 3), dtype=np.uint8)
+    reader = ThreadPoolExecutor(max_workers=1)
+
+    writes = []
+    send_sock, client = socket.socketpair()
+
+    def raw_write(data):
+        writes.append(data)
+        send_sock.sendall(data)
+
+    ws = SimpleNamespace(closed=False, raw_write=raw_write)
+    channel = FrameChannel([WebSocketSink(ws)])
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', pixels, rect=(5, 5, 10, 10))
+    frame = unpack_frame(message.result())
+    npt.assert_equal(bytes(frame['pixels']), pixels[5:15, 5:15].tobytes())
+    npt.assert_equal(len(writes), 12)
+    npt.assert_equal(all(np.shares_memory(np.asarray(write), pixels)
+                         for write in writes[2:]), True)
+
+    send_sock, client = socket.socketpair()
+    ws = SimpleNamespace(closed=False, raw_write=None,
+                         handler=SimpleNamespace(socket=send_sock))
+    channel = FrameChannel([WebSocketSink(ws)])
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', pixels)
+    npt.assert_equal(bytes(unpack_frame(message.result())['pixels']),
+                     pixels.tobytes())
+
+
+def test_frame_channel_failing_sink():
+    sink, client = socket_pair()
+    closed = WebSocketSink(SimpleNamespace(closed=True))
+    channel = FrameChannel([closed, sink])
+    pixels = np.zeros((4, 4, 4), np.uint8)
+    reader = ThreadPoolExecutor(max_workers=1)
+
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', pixels)
+    npt.assert_equal(unpack_frame(message.result())['seq'], 1)
+    npt.assert_equal(channel.sinks, [sink])
+
+    channel.remove_sink(closed)
+    message = reader.submit(read_message, client)
+    channel.send_frame('e1', pixels)
+    npt.assert_equal(unpack_frame(message.result())['seq'], 2)
+
+
+def test_frame_route_on_init(monkeypatch):
+    started = []
+    monkeypatch.setattr(transport, '_frame_channel', None)
+    monkeypatch.setattr(utils.os.path, 'isfile', lambda path: True)
+    monkeypatch.setattr(utils, 'eel', SimpleNamespace(
+        init=lambda path: None, start=lambda *args, **kwargs: started.append(
+            [route.rule for route in bottle.default_app().routes]),
+        browsers=SimpleNamespace(set_path=lambda *args: None)))
+
+    utils.init_ui(8888, 3000)
+    npt.assert_equal(FRAME_ROUTE in started[0], True)
+    npt.assert_equal(transport._frame_channel is not None, True)
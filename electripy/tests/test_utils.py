@@ -1,6 +1,9 @@
+import io
+import sys
+
 import numpy.testing as npt
 from electripy.elements import Image, Paragraph
-from electripy.utils import log_element_recursive
+from electripy.utils import iter_tree, log_element_recursive
 
 
 def test_log_element():
@@ -20,3 +23,32 @@ def test_log_element():
     npt.assert_equal(
         f"<Paragraph class={img_caption.class_name} id={img_caption.attributes['id']}>\n" in out,
         True)
+
+
+def test_iter_tree():
+    root = Paragraph('root')
+    node = root
+    for idx in range(3 * sys.getrecursionlimit()):
+        child = Paragraph(str(idx))
+        node.add_child(child, (0, 0))
+        node = child
+
+    depths = [depth for _, depth in iter_tree(root)]
+    npt.assert_equal(depths, list(range(len(depths))))
+
+    wide = Paragraph('wide')
+    leaves = [Paragraph(str(idx)) for idx in range(3)]
+    for leaf in leaves:
+        wide.add_child(leaf, (0, 0))
+
+    npt.assert_equal([element for element, _ in wide.iter_tree()],
+                     [wide, *leaves])
+    npt.assert_equal([element for element, _ in wide.iter_tree('post')],
+                     [*leaves, wide])
+
+    stream = io.StringIO()
+    root.write_tree(stream)
+    lines = stream.getvalue().splitlines()
+    npt.assert_equal(len(lines), len(depths))
+    npt.assert_equal(lines[2].startswith('|===>===> <Paragraph '), True)
+    npt.assert_equal(repr(wide).count('\n'), 4)
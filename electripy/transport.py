@@ -0,0 +1,398 @@
+"""Module for streaming raw pixel data of elements to the UI.
+
+Frames are sent as binary websocket messages made of a fixed header, the
+id of the target element and the raw pixels of a rectangle of the image.
+The pixels are handed to the socket as views of the source buffer, so
+NumPy arrays and memoryviews are never copied on the way out.
+"""
+import socket
+import struct
+import threading
+
+import bottle
+import bottle_websocket
+import numpy as np
+
+FRAME_MAGIC = b'EPF1'
+FRAME_ROUTE = '/electripy/frames'
+
+_HEADER = struct.Struct('<4sIIIIIIIBB')
+_IOV_MAX = 1024
+
+
+def as_pixel_array(pixels):
+    """Get a ``(height, width, channels)`` uint8 view of pixel data.
+
+    Parameters
+    ----------
+    pixels : array_like
+        A NumPy array, a memoryview with a ``(height, width[, channels])``
+        shape, or a :class: `PIL.Image.Image`. Images are converted once,
+        arrays and memoryviews are not copied.
+
+    Returns
+    -------
+    :class: `numpy.ndarray`
+        The pixel array.
+    """
+    array = np.asarray(pixels)
+    if array.dtype != np.uint8:
+        raise ValueError(f'Pixel data must be uint8, got {array.dtype}.')
+
+    if array.ndim == 2:
+        array = array[:, :, np.newaxis]
+    if array.ndim != 3 or array.shape[2] not in (1, 3, 4):
+        raise ValueError(
+            'Pixel data must have a (height, width[, 1|3|4]) shape, '
+            f'got {array.shape}.')
+
+    return array
+
+
+def region_buffers(array, rect=None):
+    """Get views of the rows of a rectangle of a pixel array.
+
+    Parameters
+    ----------
+    array : :class: `numpy.ndarray`
+        The ``(height, width, channels)`` pixel array.
+    rect : tuple, optional
+        The ``(x, y, width, height)`` rectangle, the whole array by default.
+
+    Returns
+    -------
+    list
+        The memoryviews covering the rectangle, one for the whole region
+        when it spans complete rows of a contiguous array.
+    """
+    _height, _width = array.shape[:2]
+    x, y, width, height = rect or (0, 0, _width, _height)
+    if x < 0 or y < 0 or x + width > _width or y + height > _height:
+        raise ValueError(
+            f'Rectangle {rect} is outside of the {_width}x{_height} image.')
+
+    if x == 0 and width == _width and array.flags.c_contiguous:
+        return [memoryview(array[y:y + height]).cast('B')]
+
+    if array.strides[1:] != (array.shape[2], 1):
+        array = np.ascontiguousarray(array)
+    return [memoryview(array[row, x:x + width]).cast('B')
+            for row in range(y, y + height)]
+
+
+def pack_header(element_id, seq, shape, rect):
+    """Pack the header of a frame.
+
+    Parameters
+    ----------
+    element_id : str
+        The id of the target element.
+    seq : int
+        The sequence number of the frame.
+    shape : tuple
+        The ``(height, width, channels)`` shape of the whole image.
+    rect : tuple
+        The ``(x, y, width, height)`` rectangle carried by the frame.
+    """
+    _id = element_id.encode()
+    return _HEADER.pack(FRAME_MAGIC, seq, shape[1], shape[0], *rect,
+                        shape[2], len(_id)) + _id
+
+
+def unpack_frame(message):
+    """Unpack a frame message.
+
+    Parameters
+    ----------
+    message : bytes-like
+        The payload of the websocket message.
+
+    Returns
+    -------
+    dict
+        The ``id``, ``seq``, image ``width``/``height``/``channels``, the
+        ``rect`` and a memoryview of the ``pixels`` of the frame.
+    """
+    message = memoryview(message)
+    (magic, seq, width, height, x, y, rect_width, rect_height, channels,
+     id_length) = _HEADER.unpack_from(message)
+    if magic != FRAME_MAGIC:
+        raise ValueError('Not an electripy frame.')
+
+    _offset = _HEADER.size + id_length
+    return {
+        'id': bytes(message[_HEADER.size:_offset]).decode(),
+        'seq': seq,
+        'width': width,
+        'height': height,
+        'channels': channels,
+        'rect': (x, y, rect_width, rect_height),
+        'pixels': message[_offset:],
+    }
+
+
+def websocket_header(length, opcode=0x2):
+    """Get the header of an unmasked, final websocket frame.
+
+    Parameters
+    ----------
+    length : int
+        The length of the payload.
+    opcode : int, optional
+        The opcode of the frame, binary by default.
+    """
+    if length < 126:
+        return struct.pack('!BB', 0x80 | opcode, length)
+    if length < 1 << 16:
+        return struct.pack('!BBH', 0x80 | opcode, 126, length)
+    return struct.pack('!BBQ', 0x80 | opcode, 127, length)
+
+
+class SocketSink:
+    """Writes frames to a connected websocket through its raw socket.
+
+    The websocket header, frame header and pixel views are written with
+    scatter-gather ``sendmsg`` calls, without joining them into one buffer.
+    Platforms without ``sendmsg`` fall back to a single joined write.
+    """
+
+    def __init__(self, sock):
+        """Initialize the socket sink.
+
+        Parameters
+        ----------
+        sock : :class: `socket.socket`
+            The socket of an established websocket connection.
+        """
+        self.sock = sock
+        self._lock = threading.Lock()
+
+    def send(self, buffers):
+        """Send one websocket message made of several buffers.
+
+        Parameters
+        ----------
+        buffers : list
+            The bytes-like parts of the message.
+        """
+        buffers = [memoryview(buffer).cast('B') for buffer in buffers]
+        buffers.insert(0, memoryview(websocket_header(
+            sum(buffer.nbytes for buffer in buffers))))
+
+        with self._lock:
+            if not hasattr(self.sock, 'sendmsg'):
+                self.sock.sendall(b''.join(buffers))
+                return
+
+            idx = 0
+            while idx < len(buffers):
+                sent = self.sock.sendmsg(buffers[idx:idx + _IOV_MAX])
+                while sent:
+                    if sent >= buffers[idx].nbytes:
+                        sent -= buffers[idx].nbytes
+                        idx += 1
+                    else:
+                        buffers[idx] = buffers[idx][sent:]
+                        sent = 0
+
+
+class WebSocketSink:
+    """Writes frames to a gevent-websocket connection.
+
+    ``WebSocket.send`` copies its payload and joins it with the header, so
+    the sink frames messages itself and writes them to the connection
+    directly: through a :class: `SocketSink` on the socket of the
+    connection when it supports ``sendmsg``, otherwise as one write of
+    the header followed by one write per buffer. Neither path joins the
+    pixels into an intermediate buffer.
+    """
+
+    def __init__(self, ws):
+        """Initialize the websocket sink.
+
+        Parameters
+        ----------
+        ws : :class: `geventwebsocket.websocket.WebSocket`
+            The websocket connection.
+        """
+        self.ws = ws
+        self._lock = threading.Lock()
+
+        sock = getattr(getattr(ws, 'handler', None), 'socket', None)
+        self._socket_sink = SocketSink(sock) \
+            if hasattr(sock, 'sendmsg') else None
+
+    def send(self, buffers):
+        """Send one websocket message made of several buffers.
+
+        Parameters
+        ----------
+        buffers : list
+            The bytes-like parts of the message.
+
+        Raises
+        ------
+        ConnectionError
+            If the websocket is closed.
+        """
+        if self.ws.closed:
+            raise ConnectionError('Websocket closed.')
+        if self._socket_sink is not None:
+            self._socket_sink.send(buffers)
+            return
+
+        buffers = [memoryview(buffer).cast('B') for buffer in buffers]
+        header = websocket_header(sum(buffer.nbytes for buffer in buffers))
+        with self._lock:
+            self.ws.raw_write(header)
+            for buffer in buffers:
+                self.ws.raw_write(buffer)
+
+
+class FrameChannel:
+    """Binary channel streaming pixel data of elements to the UI.
+
+    Attributes
+    ----------
+    sinks : list
+        The connected sinks every frame is written to. A sink whose
+        ``send`` raises is dropped from the list.
+    frames_sent : int
+        The number of frames sent.
+    bytes_sent : int
+        The number of pixel bytes sent.
+    """
+
+    def __init__(self, sinks=None):
+        """Initialize the frame channel.
+
+        Parameters
+        ----------
+        sinks : list, optional
+            The sinks every frame is written to.
+        """
+        self.sinks = list(sinks or [])
+        self.frames_sent = 0
+        self.bytes_sent = 0
+
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def send_frame(self, element, pixels, rect=None):
+        """Send the pixels of an element, or of a rectangle of it.
+
+        Parameters
+        ----------
+        element : :class: `Element` or str
+            The target element or its id.
+        pixels : array_like
+            The pixel data of the whole image, see :func:`as_pixel_array`.
+        rect : tuple, optional
+            The ``(x, y, width, height)`` rectangle to update, the whole
+            image by default.
+
+        Returns
+        -------
+        int
+            The sequence number of the frame.
+        """
+        array = as_pixel_array(pixels)
+        rect = tuple(rect or (0, 0, array.shape[1], array.shape[0]))
+        buffers = region_buffers(array, rect)
+
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+
+        element_id = element if isinstance(element, str) else element.id
+        header = pack_header(element_id, seq, array.shape, rect)
+        for sink in list(self.sinks):
+            try:
+                sink.send([header, *buffers])
+            except Exception:
+                self.remove_sink(sink)
+
+        self.frames_sent += 1
+        self.bytes_sent += rect[2] * rect[3] * array.shape[2]
+        return seq
+
+    def remove_sink(self, sink):
+        """Remove a sink from the channel, if it is still connected.
+
+        Parameters
+        ----------
+        sink : object
+            The sink to remove.
+        """
+        with self._lock:
+            if sink in self.sinks:
+                self.sinks.remove(sink)
+
+
+_frame_channel = None
+
+
+def get_frame_channel():
+    """Get the frame channel of the UI.
+
+    The channel is served on the ``FRAME_ROUTE`` websocket route of the
+    eel server, every connecting client is added as a sink.
+    """
+    global _frame_channel
+    if _frame_channel is None:
+        _frame_channel = FrameChannel()
+        _register_route(_frame_channel)
+    return _frame_channel
+
+
+def _register_route(channel):
+    """Serve a frame channel on the websocket route of the eel server."""
+    @bottle.route(FRAME_ROUTE, apply=[bottle_websocket.websocket])
+    def _frames(ws):
+        sink = WebSocketSink(ws)
+        channel.sinks.append(sink)
+        try:
+            while ws.receive() is not None:
+                pass
+        finally:
+            channel.remove_sink(sink)
+
+
+def socket_pair():
+    """Get a connected socket sink and the socket reading its frames.
+
+    Useful as a local stand-in for a websocket client.
+    """
+    _send_sock, _recv_sock = socket.socketpair()
+    return SocketSink(_send_sock), _recv_sock
+
+
+def read_message(sock):
+    """Read one unmasked websocket message from a socket.
+
+    Parameters
+    ----------
+    sock : :class: `socket.socket`
+        The socket to read from.
+
+    Returns
+    -------
+    bytearray
+        The payload of the message.
+    """
+    def _read(length):
+        data = bytearray(length)
+        view = memoryview(data)
+        while view:
+            received = sock.recv_into(view)
+            if not received:
+                raise ConnectionError('Socket closed.')
+            view = view[received:]
+        return data
+
+    _, length = _read(2)
+    if length == 126:
+        length, = struct.unpack('!H', _read(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', _read(8))
+    return _read(length)
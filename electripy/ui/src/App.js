@@ -1,11 +1,18 @@
-import React from "react";
+import React, { useEffect } from "react";
 import "./App.css";
 
 import { eel } from "./eel.js";
+import { connectFrames } from "./frames.js";
+import { resync } from "./patches.js";
 
 const App = () => {
   eel.set_host("http://localhost:8888");
-  return <></>;
+  useEffect(() => {
+    resync();
+    const socket = connectFrames("ws://localhost:8888");
+    return () => socket.close();
+  }, []);
+  return <div id="electripy-root" />;
 };
 
 export default App;
@@ -0,0 +1,24 @@
+import { eel } from "./eel.js";
+
+const EVENTS = {
+  Button: { click: "press" },
+};
+
+let queue = [];
+
+const flush = () => {
+  const events = queue;
+  queue = [];
+  eel.dispatch_events(events);
+};
+
+export const queueEvent = (id, type, detail = null) => {
+  if (!queue.length) setTimeout(flush, 0);
+  queue.push([id, type, detail]);
+};
+
+export const listen = (node, name) => {
+  Object.entries(EVENTS[name] || {}).forEach(([domEvent, type]) =>
+    node.addEventListener(domEvent, () => queueEvent(node.id, type))
+  );
+};
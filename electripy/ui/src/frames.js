@@ -0,0 +1,75 @@
+import { findNode, replaceNode } from "./patches.js";
+
+const FRAME_MAGIC = "EPF1";
+const HEADER_SIZE = 34;
+
+const canvases = new Map();
+
+const getCanvas = (id, width, height) => {
+  let canvas = canvases.get(id);
+  if (!canvas || !canvas.isConnected) {
+    const node = findNode(id);
+    if (!node) return null;
+
+    if (node instanceof HTMLCanvasElement) {
+      canvas = node;
+    } else {
+      canvas = document.createElement("canvas");
+      Array.from(node.attributes).forEach(({ name, value }) =>
+        canvas.setAttribute(name, value)
+      );
+      replaceNode(id, canvas);
+    }
+    canvases.set(id, canvas);
+  }
+  if (canvas.width !== width || canvas.height !== height) {
+    canvas.width = width;
+    canvas.height = height;
+  }
+  return canvas;
+};
+
+const toRGBA = (pixels, channels, count) => {
+  if (channels === 4) return new Uint8ClampedArray(pixels);
+
+  const rgba = new Uint8ClampedArray(count * 4);
+  for (let src = 0, dst = 0; dst < rgba.length; src += channels, dst += 4) {
+    rgba[dst] = pixels[src];
+    rgba[dst + 1] = pixels[src + (channels === 3 ? 1 : 0)];
+    rgba[dst + 2] = pixels[src + (channels === 3 ? 2 : 0)];
+    rgba[dst + 3] = 255;
+  }
+  return rgba;
+};
+
+const drawFrame = (buffer) => {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== FRAME_MAGIC) return;
+
+  const [width, height, x, y, rectWidth, rectHeight] = [8, 12, 16, 20, 24, 28]
+    .map((offset) => view.getUint32(offset, true));
+  const channels = view.getUint8(32);
+  const idLength = view.getUint8(33);
+  const id = new TextDecoder().decode(
+    new Uint8Array(buffer, HEADER_SIZE, idLength)
+  );
+
+  const canvas = getCanvas(id, width, height);
+  if (!canvas) return;
+
+  const pixels = new Uint8Array(buffer, HEADER_SIZE + idLength);
+  const rgba = toRGBA(pixels, channels, rectWidth * rectHeight);
+  canvas
+    .getContext("2d")
+    .putImageData(new ImageData(rgba, rectWidth, rectHeight), x, y);
+};
+
+export const connectFrames = (host = "ws://localhost:8888") => {
+  const socket = new WebSocket(`${host}/electripy/frames`);
+  socket.binaryType = "arraybuffer";
+  socket.onmessage = ({ data }) => drawFrame(data);
+  return socket;
+};
+
+export default connectFrames;
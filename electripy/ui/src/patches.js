@@ -0,0 +1,179 @@
+import { eel } from "./eel.js";
+import { listen } from "./events.js";
+
+const TAGS = {
+  Button: "button",
+  Paragraph: "p",
+  ConsoleParagraph: "p",
+  Heading: "h1",
+  Image: "img",
+  StreamImage: "canvas",
+};
+
+const VIRTUAL = new Set(["VirtualList", "VirtualGrid"]);
+const CONSOLE = new Set(["ConsoleParagraph"]);
+
+const nodes = new Map();
+
+const contentOf = (node) => node.content || node;
+
+const getParent = (parentId) =>
+  parentId === null
+    ? document.getElementById("electripy-root")
+    : contentOf(nodes.get(parentId));
+
+const getNode = (parent, id) => {
+  const node = nodes.get(id);
+  return node && node.parentNode === parent ? node : null;
+};
+
+const setAttributes = (node, attributes) => {
+  Object.entries(attributes).forEach(([key, value]) => {
+    if (key === "position") return;
+    if (key === "data-content-height" && node.content)
+      node.content.style.height = `${value}px`;
+    if (key === "data-max-lines" && node.log) {
+      node.maxLines = Number(value);
+      trimLines(node);
+    }
+    if (value === null) node.removeAttribute(key);
+    else node.setAttribute(key, value);
+  });
+};
+
+const trimLines = (node) => {
+  while (node.log.childNodes.length > node.maxLines)
+    node.log.removeChild(node.log.firstChild);
+};
+
+const appendLines = (node, lines) => {
+  lines.forEach((line) =>
+    node.log.appendChild(document.createTextNode(`${line}\n`))
+  );
+  trimLines(node);
+};
+
+const createLog = (node) => {
+  node.log = document.createElement("span");
+  node.maxLines = Infinity;
+  node.appendChild(node.log);
+};
+
+const setText = (node, text) => {
+  if (node.log) {
+    node.log.textContent = "";
+    appendLines(node, text ? text.split("\n") : []);
+    return;
+  }
+  if (!node.textNode) {
+    node.textNode = document.createTextNode("");
+    node.insertBefore(node.textNode, node.firstChild);
+  }
+  node.textNode.nodeValue = text;
+};
+
+const onScroll = (event) => {
+  const node = event.currentTarget;
+  if (node.scrollPending) return;
+  node.scrollPending = true;
+  requestAnimationFrame(() => {
+    node.scrollPending = false;
+    eel.scroll_virtual(node.id, Math.round(node.scrollTop));
+  });
+};
+
+const createContent = (node) => {
+  node.content = document.createElement("div");
+  node.content.style.position = "relative";
+  node.appendChild(node.content);
+  node.addEventListener("scroll", onScroll, { passive: true });
+};
+
+const create = (payload) => {
+  const node = document.createElement(TAGS[payload.name] || "div");
+  if (VIRTUAL.has(payload.name)) createContent(node);
+  if (CONSOLE.has(payload.name)) createLog(node);
+  setAttributes(node, payload.attributes);
+  listen(node, payload.name);
+  if (payload.text !== undefined) setText(node, payload.text);
+  payload.children.forEach((child) =>
+    contentOf(node).appendChild(create(child))
+  );
+  nodes.set(payload.id, node);
+  return node;
+};
+
+const forget = (node) => {
+  nodes.delete(node.id);
+  Array.from(contentOf(node).children).forEach(forget);
+};
+
+const applyPatch = ([op, ...args]) => {
+  switch (op) {
+    case "set-attr":
+      if (nodes.has(args[0])) setAttributes(nodes.get(args[0]), args[1]);
+      break;
+    case "set-style":
+      if (nodes.has(args[0]))
+        Object.entries(args[1]).forEach(([key, value]) =>
+          nodes.get(args[0]).style.setProperty(key, value)
+        );
+      break;
+    case "set-text":
+      if (nodes.has(args[0])) setText(nodes.get(args[0]), args[1]);
+      break;
+    case "append-text":
+      if (nodes.has(args[0]) && nodes.get(args[0]).log)
+        appendLines(nodes.get(args[0]), args[1]);
+      break;
+    case "insert": {
+      const [parentId, beforeId, payload] = args;
+      const parent = getParent(parentId);
+      if (nodes.has(payload.id)) {
+        nodes.get(payload.id).remove();
+        forget(nodes.get(payload.id));
+      }
+      parent.insertBefore(create(payload), getNode(parent, beforeId));
+      break;
+    }
+    case "move": {
+      const [parentId, id, beforeId] = args;
+      const parent = getParent(parentId);
+      parent.insertBefore(getNode(parent, id), getNode(parent, beforeId));
+      break;
+    }
+    case "remove": {
+      const [parentId, id] = args;
+      const node = getNode(getParent(parentId), id);
+      if (node) {
+        node.remove();
+        forget(node);
+      }
+      break;
+    }
+    default:
+      console.warn(`Unknown patch operation ${op}`);
+  }
+};
+
+const apply_patches = (ops) => ops.forEach(applyPatch);
+
+export const resync = () =>
+  eel.resync_ui()((roots) => {
+    const root = document.getElementById("electripy-root");
+    Array.from(root.children).forEach(forget);
+    root.replaceChildren(...roots.map(create));
+  });
+
+export const findNode = (id) => nodes.get(id) || document.getElementById(id);
+
+export const replaceNode = (id, node) => {
+  const old = findNode(id);
+  if (old && old !== node) old.replaceWith(node);
+  if (nodes.has(id)) nodes.set(id, node);
+  return node;
+};
+
+eel.expose(apply_patches, "apply_patches");
+
+export default apply_patches;
@@ -1,9 +1,14 @@
+import asyncio
+import functools
 import os
 from subprocess import PIPE, Popen
 
 import eel
 import eel.browsers
 
+from electripy.aio import get_async_bridge
+from electripy.transport import get_frame_channel
+
 IN_DEVELOPMENT = True
 
 
@@ -63,7 +68,7 @@ def shutdown(path, socketlist):
     os._exit(1)
 
 
-def init_ui(eel_port, frontend_port):
+def init_ui(eel_port, frontend_port, main=None):
     """Initialize the UI.
 
     Parameters
@@ -72,10 +77,21 @@ def init_ui(eel_port, frontend_port):
         The port to use for the EEL server.
     frontend_port: int
         The port to use for the frontend server.
+    main: coroutine function, optional
+        The entry point of an asyncio application, run on the asyncio loop
+        of the UI while the EEL server blocks this thread.
+
+    The frame channel is served from the start, so the UI can connect to
+    it before any pixels are streamed.
     """
     if not all([eel_port, frontend_port]):
         raise ValueError('Both ports must be specified.')
 
+    get_frame_channel()
+
+    if main is not None:
+        get_async_bridge().submit(main())
+
     if IN_DEVELOPMENT:
         _electron_path = os.path.join(
             os.getcwd(), "node_modules/electron/dist/electron.exe")
@@ -117,3 +133,22 @@ def init_ui(eel_port, frontend_port):
                       'close_callback': shutdown,
                       'args': [_electron_path, '.'],
                   }, suppress_error=True, size=(1000, 600), mode="electron")
+
+
+async def init_ui_async(eel_port, frontend_port):
+    """Initialize the UI from a running asyncio application.
+
+    The EEL server runs on a worker thread, and coroutine handlers and
+    awaitable UI operations share the running loop of the application.
+
+    Parameters
+    ----------
+    eel_port: int
+        The port to use for the EEL server.
+    frontend_port: int
+        The port to use for the frontend server.
+    """
+    loop = asyncio.get_running_loop()
+    get_async_bridge().attach(loop)
+    await loop.run_in_executor(
+        None, functools.partial(init_ui, eel_port, frontend_port))
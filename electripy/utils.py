@@ -1,24 +1,111 @@
+import gc
+import io
+import sys
+from contextlib import contextmanager
+
 __all_ui__ = {
     'Button',
     'Paragraph',
+    'ConsoleParagraph',
     'Heading',
     'Image',
+    'StreamImage',
+    'VirtualList',
+    'VirtualGrid',
 }
 
+PRE_ORDER = 'pre'
+POST_ORDER = 'post'
+
+
+def iter_tree(element, order=PRE_ORDER, depth=0):
+    """Iterate over an element and its descendants without recursing.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    order : str, optional
+        Either ``pre`` to yield parents before their children, or ``post``
+        to yield them after.
+    depth : int, optional
+        The depth of the root.
+
+    Yields
+    ------
+    tuple
+        Every element of the subtree and its depth.
+    """
+    if order == PRE_ORDER:
+        stack = [(element, depth)]
+        while stack:
+            _element, _depth = stack.pop()
+            yield _element, _depth
+            if _element.children:
+                stack.extend((child, _depth + 1)
+                             for child in reversed(_element.children))
+    elif order == POST_ORDER:
+        stack = [(element, depth, iter(element.children))]
+        while stack:
+            _element, _depth, _children = stack[-1]
+            child = next(_children, None)
+            if child is None:
+                stack.pop()
+                yield _element, _depth
+            else:
+                stack.append((child, _depth + 1, iter(child.children)))
+    else:
+        raise ValueError(
+            f'{order} is not a valid order, use {PRE_ORDER} or {POST_ORDER}.')
+
+
+def write_element_tree(element, stream=None, depth=0):
+    """Write the tree of an element to a stream, one line per element.
+
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    stream : file-like, optional
+        The stream to write to, standard output by default.
+    depth : int, optional
+        The depth of the root.
+    """
+    stream = stream or sys.stdout
+    for _element, _depth in iter_tree(element, depth=depth):
+        stream.write(f"|{'===>' * _depth} <{_element.name} "
+                     f"class={_element.class_name} id={_element.id}>\n")
+
 
 def log_element_recursive(element, depth=0, out=""):
-    tree = element._get_element_tree()
+    """Get the tree of an element as a string, see :func:`write_element_tree`.
 
-    for item in tree.items():
-        name = item[0].name
-        children = item[1]
+    Parameters
+    ----------
+    element : :class: `Element`
+        The root of the subtree.
+    depth : int, optional
+        The depth of the root.
+    out : str, optional
+        The string the tree is appended to.
+    """
+    stream = io.StringIO(out)
+    stream.seek(len(out))
+    write_element_tree(element, stream, depth)
+    return stream.getvalue()
 
-        out += f"|{'===>' * depth} <{name} "
-        out += f"class={item[0].attributes['class']} "
-        out += f"id={item[0].attributes['id']}>\n"
 
-        if children:
-            for child in children:
-                out = log_element_recursive(child, depth + 1, out)
+@contextmanager
+def paused_gc():
+    """Pause the cyclic garbage collector for the duration of the block.
 
-    return out
+    Bulk operations allocating many objects otherwise trigger collections
+    that traverse every live element, which dominates their run time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()